@@ -12,6 +12,9 @@ from datetime import datetime
 import sys
 from pathlib import Path
 import queue  # 🚀 For async video processing
+from concurrent.futures import Future
+
+_T0 = time.perf_counter()  # ⏱ Mốc khởi động (đo thời gian tới frame đầu tiên)
 
 # --- CẤU HÌNH GIAO DIỆN & XỬ LÝ ---
 ctk.set_appearance_mode("Dark")
@@ -29,17 +32,41 @@ PROCESS_HEIGHT = 540
 # --- IMPORT MODULES TỪ SRC ---
 sys.path.insert(0, str(Path(__file__).parent))
 
-try:
-    from src.detection.pose_detector import PoseDetector
-    from src.recognition.pose_recognizer import PoseRecognizer
-    from src.evaluation.pose_evaluator import PoseEvaluator
-    from src.visualization.skeleton_drawer import SkeletonDrawer
-    from src.visualization.overlay_ui import OverlayUI
-    MODEL_LOADED = True
-except ImportError as e:
-    MODEL_LOADED = False
-    print(f"⚠️ LỖI IMPORT: {e}")
-    print("Vui lòng kiểm tra cấu trúc thư mục 'src/' và 'config/'.")
+# 🚀 src/ kéo theo torch + ultralytics (~1-2s): import trên thread nền
+# (import_modules) để cửa sổ hiện ngay. True khi import xong.
+MODEL_LOADED = False
+
+
+def import_modules():
+    """Import src/ modules into this module's globals (called from the loader thread)."""
+    global MODEL_LOADED, PoseDetector, Letterboxer, ROIPoseDetector, PoseKeypoints
+    global FrameReader, AdaptiveScheduler, ResultCache, cache_version
+    global KeypointStore, keypoint_version, DETECTED, TRACKED
+    global KeypointTracker, PoseStream, SessionStats, APP_CONFIG
+    global PoseRecognizer, PoseEvaluator, SkeletonDrawer, OverlayUI
+    try:
+        from src.detection.pose_detector import PoseDetector
+        from src.detection.letterbox import Letterboxer
+        from src.detection.roi_detector import ROIPoseDetector
+        from src.detection.pose_keypoints import PoseKeypoints
+        from src.pipeline.frame_reader import FrameReader
+        from src.pipeline.frame_scheduler import AdaptiveScheduler
+        from src.pipeline.result_cache import ResultCache, cache_version
+        from src.pipeline.keypoint_store import KeypointStore, keypoint_version, DETECTED, TRACKED
+        from src.tracking.keypoint_tracker import KeypointTracker
+        from src.streaming.pose_stream import PoseStream
+        from src.streaming.session_stats import SessionStats
+        from src.config.app_config import APP_CONFIG
+        from src.recognition.pose_recognizer import PoseRecognizer
+        from src.evaluation.pose_evaluator import PoseEvaluator
+        from src.visualization.skeleton_drawer import SkeletonDrawer
+        from src.visualization.overlay_ui import OverlayUI
+        MODEL_LOADED = True
+    except ImportError as e:
+        MODEL_LOADED = False
+        print(f"⚠️ LỖI IMPORT: {e}")
+        print("Vui lòng kiểm tra cấu trúc thư mục 'src/' và 'config/'.")
+    return MODEL_LOADED
 
 class YogaApp(ctk.CTk):
     def __init__(self):
@@ -73,13 +100,19 @@ class YogaApp(ctk.CTk):
         
         # --- KHỞI TẠO CÁC MODULE AI ---
         self.detector = None
+        self.result_cache = None  # 🚀 Ảnh đã phân tích (theo hash nội dung) → bỏ qua YOLO
         self.recognizer = None
         self.evaluator = None
         self.drawer = None
         self.overlay = None
         
-        # Thread loading model
-        self.after(100, self.init_models)
+        # ⏱ Mốc thời gian khởi động (giây từ lúc chạy app): window, import, models, warmup, ready, first_frame
+        self.startup_times = {}
+        # Import + tải models trên thread nền; UI kiểm tra future này thay vì chờ
+        self.models_ready = Future()
+        threading.Thread(target=self.init_models, daemon=True).start()
+        self.after_idle(lambda: self.mark_startup('window'))
+        self.after(100, self.poll_models_ready)
 
         # Layout Chính
         self.grid_columnconfigure(1, weight=1)
@@ -108,9 +141,17 @@ class YogaApp(ctk.CTk):
         
         # 🚀 ASYNC VIDEO PROCESSING: Producer-Consumer Architecture
         self.frame_queue = queue.Queue(maxsize=5)  # Buffer 5 frames
+        # Canvas letterbox dùng lại giữa các frame (queue + frame đang xử lý + frame đang hiển thị)
+        self.video_letterbox = None
         self.processing_thread = None
         self.frame_counter = 0
-        self.process_every_n_frames = 1  # Xử lý mỗi N frame (1=all, 2=every other)
+        self.scheduler = None  # 🚀 Tự chọn frame chạy AI theo latency đo được (giữ fps_target)
+        self.tracker = None    # 🚀 Optical flow bám keypoints giữa các lần chạy YOLO
+        self.roi_detector = None  # 🚀 YOLO trên crop quanh người (input nhỏ hơn)
+        self.stream = None     # Lọc keypoints + bầu nhãn theo thời gian (hết nhấp nháy)
+        self.session_stats = None  # Thống kê cả buổi tập (điểm, thời gian, lỗi theo tư thế)
+        self.keypoint_store = None  # 🚀 Keypoints đã lưu của video (mở lại → bỏ qua YOLO)
+        self.video_fps = 30
         
         # ⌨️ Keyboard shortcuts
         self.bind_all("<space>", lambda e: self.toggle_pause())
@@ -120,13 +161,76 @@ class YogaApp(ctk.CTk):
         # Load sample images ban đầu
         self.after(1000, self.load_sample_images_ui)
 
+    def mark_startup(self, stage):
+        """Ghi mốc khởi động (chỉ lần đầu); in báo cáo khi frame đầu tiên hiện ra."""
+        if stage in self.startup_times:
+            return
+        self.startup_times[stage] = time.perf_counter() - _T0
+        if stage == 'first_frame':
+            report = ", ".join(f"{name} {t:.2f}s" for name, t in self.startup_times.items())
+            print(f"⏱ Khởi động: {report}")
+
+    def poll_models_ready(self):
+        """UI thread: cập nhật trạng thái khi thread nền tải xong models."""
+        if not self.models_ready.done():
+            self.after(100, self.poll_models_ready)
+            return
+        if self.models_ready.exception() is None and self.detector is not None:
+            ready = self.startup_times.get('ready', 0.0)
+            self.lbl_feedback.configure(text=f"Hệ thống đã sẵn sàng! ({ready:.1f}s)", text_color="#00E676")
+        else:
+            self.lbl_feedback.configure(text="Lỗi tải Model AI", text_color="red")
+
+    def run_when_models_ready(self, callback):
+        """UI thread: gọi callback ngay nếu models đã sẵn sàng, không thì đợi (không block UI)."""
+        if self.models_ready.done():
+            callback()
+            return
+        self.lbl_feedback.configure(text="⏳ Đang tải models, sẽ bắt đầu ngay khi xong...")
+        self.after(100, lambda: self.run_when_models_ready(callback))
+
+    def wait_for_models(self):
+        """Worker thread: chờ models tải xong. Trả về True nếu dùng được."""
+        try:
+            self.models_ready.result()
+        except Exception:
+            return False
+        return MODEL_LOADED
+
     def init_models(self):
+        """Thread nền: import src/, tải models và warmup; kết quả báo qua self.models_ready."""
+        try:
+            start = time.perf_counter()
+            import_modules()
+            self.mark_startup('import')
+            self._load_models()
+            self.models_ready.set_result(True)
+        except (Exception, SystemExit) as e:  # PoseDetector gọi sys.exit khi lỗi model
+            self.models_ready.set_exception(RuntimeError(str(e)))
+        finally:
+            self.mark_startup('ready')
+            print(f"⏱ Models sẵn sàng sau {time.perf_counter() - start:.2f}s (thread nền)")
+
+    def report_first_frame_latency(self, detector_stats, classifier_stats):
+        """In latency cold/warm và kiểm tra frame đầu tiên (YOLO full frame + classifier) đạt mục tiêu."""
+        full_frame = detector_stats.get(f"{PROCESS_HEIGHT}x{PROCESS_WIDTH}")
+        if full_frame is None:
+            return
+        classifier = classifier_stats.get("1x34", {'cold_ms': 0.0, 'warm_ms': 0.0})
+        cold = full_frame['cold_ms'] + classifier['cold_ms']
+        warm = full_frame['warm_ms'] + classifier['warm_ms']
+        target = APP_CONFIG['first_frame_latency_ms']
+        icon = "✅" if warm <= target else "⚠️"
+        print(f"{icon} Frame đầu tiên: {warm:.0f} ms sau warmup (không warmup: {cold:.0f} ms, mục tiêu {target} ms)")
+
+    def _load_models(self):
         """Khởi tạo các class xử lý từ file src"""
         if MODEL_LOADED:
             try:
                 print("⏳ Đang tải models...")
                 yolo_path = "models/yolov8m-pose.pt"
                 clf_path = "models/pose_classification.pth"
+                backend = APP_CONFIG['classifier_backend']
                 
                 if not os.path.exists(yolo_path):
                     yolo_path = "yolov8m-pose.pt" 
@@ -137,18 +241,34 @@ class YogaApp(ctk.CTk):
                     confidence_threshold=0.5,
                     use_gpu=True  # 🚀 GPU Acceleration enabled
                 )
-                self.recognizer = PoseRecognizer(model_path=clf_path)
+                self.recognizer = PoseRecognizer(model_path=clf_path, backend=backend)
                 self.evaluator = PoseEvaluator()
                 self.drawer = SkeletonDrawer()
                 self.overlay = OverlayUI()
+                self.result_cache = ResultCache(
+                    APP_CONFIG['result_cache_dir'], cache_version(yolo_path, clf_path, backend),
+                    max_bytes=APP_CONFIG['result_cache_mb'] * 1024 * 1024
+                )
+                self.mark_startup('models')
+                
+                # Warmup: lần chạy đầu của YOLO/classifier chậm hơn nhiều (khởi tạo layer,
+                # cấp phát bộ nhớ) → trả giá ở đây thay vì ở frame đầu tiên của người dùng
+                shapes = [(PROCESS_HEIGHT, PROCESS_WIDTH)]
+                if APP_CONFIG['roi_crop']:
+                    # Crop dọc quanh người ở roi_imgsz (ROIPoseDetector)
+                    shapes.append((PROCESS_HEIGHT, PROCESS_HEIGHT // 2, APP_CONFIG['roi_imgsz']))
+                detector_stats = self.detector.warmup(shapes, runs=APP_CONFIG['warmup_runs'])
+                classifier_stats = self.recognizer.warmup(((1, 34),), runs=APP_CONFIG['warmup_runs'])
+                self.mark_startup('warmup')
+                self.report_first_frame_latency(detector_stats, classifier_stats)
                 
                 print("✅ Đã tải xong toàn bộ Models & Modules.")
-                self.lbl_feedback.configure(text="Hệ thống đã sẵn sàng!", text_color="#00E676")
             except Exception as e:
                 print(f"❌ Lỗi khởi tạo Model: {e}")
-                self.lbl_feedback.configure(text="Lỗi tải Model AI", text_color="red")
                 # Không hiển thị popup lỗi ngay lập tức để tránh block UI khi khởi động
                 print(f"Chi tiết lỗi: {e}")
+                self.detector = None
+                raise
 
     def create_sidebar(self):
         self.sidebar_frame = ctk.CTkFrame(self, width=300, corner_radius=0)
@@ -366,6 +486,8 @@ class YogaApp(ctk.CTk):
         self.progress_conf.set(0)
         self.lbl_conf_val.configure(text="0%")
         self.lbl_feedback.configure(text="Đang chờ dữ liệu...")
+        if self.session_stats is not None:
+            self.session_stats.reset()
 
     # --- VIDEO CONTROLS ---
     def toggle_pause(self):
@@ -407,33 +529,17 @@ class YogaApp(ctk.CTk):
     # -------------------------------------------------------------------------
     # HÀM RESIZE QUAN TRỌNG: Dùng chung cho cả xử lý AI và Hiển thị
     # -------------------------------------------------------------------------
-    def resize_image_to_fixed_size(self, image_cv, target_size=(PROCESS_WIDTH, PROCESS_HEIGHT)):
+    def resize_image_to_fixed_size(self, image_cv, target_size=(PROCESS_WIDTH, PROCESS_HEIGHT), letterboxer=None):
         """
         Resize ảnh về kích thước cố định (target_size) mà giữ nguyên tỷ lệ.
         Phần thừa sẽ được thêm padding màu đen (Letterboxing).
+
+        🚀 Resize INTER_LINEAR thẳng vào canvas có sẵn; truyền letterboxer (video)
+        để dùng lại canvas thay vì cấp phát mới mỗi frame.
         """
-        target_w, target_h = target_size
-        h, w = image_cv.shape[:2]
-        
-        # Tính tỷ lệ resize để fit vào target_size
-        scale = min(target_w/w, target_h/h)
-        new_w = int(w * scale)
-        new_h = int(h * scale)
-        
-        # Resize ảnh
-        resized = cv2.resize(image_cv, (new_w, new_h), interpolation=cv2.INTER_LANCZOS4)
-        
-        # Tạo canvas đen (target size)
-        canvas = np.zeros((target_h, target_w, 3), dtype=np.uint8)
-        
-        # Tính toán vị trí paste (center)
-        x_offset = (target_w - new_w) // 2
-        y_offset = (target_h - new_h) // 2
-        
-        # Paste ảnh vào canvas
-        canvas[y_offset:y_offset+new_h, x_offset:x_offset+new_w] = resized
-        
-        return canvas
+        if letterboxer is None:
+            letterboxer = Letterboxer(target_size, buffers=1)
+        return letterboxer(image_cv)
 
     def save_image_result(self):
         """Lưu ảnh kết quả vào thư mục results"""
@@ -459,6 +565,10 @@ class YogaApp(ctk.CTk):
     def process_video_worker(self):
         """Background thread: Read + Process frames → Queue (Producer)"""
         frame_count = 0
+        pose_name, score, feedback = "NO POSE", 0, "Không tìm thấy người"
+        store = self.keypoint_store  # Giữ tham chiếu: start_video mới có thể thay self.keypoint_store
+        finished = False
+        failed = False  # Frame lỗi → store có lỗ (UNWRITTEN), không được đánh dấu complete
         
         while self.video_running:
             # ✅ FIX: Check pause state
@@ -468,62 +578,120 @@ class YogaApp(ctk.CTk):
             
             if self.cap is None or not self.cap.isOpened():
                 break
-                
+            
+            start = time.perf_counter()
             ret, frame = self.cap.read()
             if not ret:
                 self.video_running = False
+                finished = True
                 break
             
             frame_count += 1
             
-            # Skip frames if needed
-            if frame_count % self.process_every_n_frames != 0:
-                continue
-            
             try:
                 # Resize
-                frame_resized = self.resize_image_to_fixed_size(frame, (PROCESS_WIDTH, PROCESS_HEIGHT))
+                frame_resized = self.resize_image_to_fixed_size(
+                    frame, (PROCESS_WIDTH, PROCESS_HEIGHT), self.video_letterbox
+                )
+                self.scheduler.record('decode', time.perf_counter() - start)
                 
                 # Process AI (YOLOv8, ML, Drawing) - All on GPU!
                 if MODEL_LOADED and self.detector:
-                    results = self.detector.predict(frame_resized)
-                    kp_norm = self.detector.get_keypoints_normalized(results)
-                    kp_abs = self.detector.get_keypoints_absolute(results)
+                    if store is not None and not store.writable:
+                        # Video đã xử lý trước đó: đọc keypoints từ mmap, không chạy YOLO
+                        keypoints = store.read(frame_count - 1)
+                    # YOLO chạy theo stride của scheduler, hoặc sớm hơn khi tracking kém đi
+                    elif self.scheduler.should_infer(frame_count, force=self.tracker.needs_detection()):
+                        start = time.perf_counter()
+                        if self.roi_detector is not None:
+                            keypoints = self.roi_detector.detect(frame_resized)
+                        else:
+                            keypoints = self.detector.get_pose_keypoints(self.detector.predict(frame_resized))
+                        self.tracker.init(frame_resized, keypoints)
+                        self.scheduler.record('inference', time.perf_counter() - start)
+                        if store is not None:
+                            store.write(frame_count - 1, keypoints, DETECTED)
+                    else:
+                        # Frame giữa: bám keypoints bằng optical flow (vài ms trên CPU)
+                        start = time.perf_counter()
+                        keypoints = self.tracker.track(frame_resized)
+                        self.scheduler.record('track', time.perf_counter() - start)
+                        if store is not None:
+                            store.write(frame_count - 1, keypoints, TRACKED)
                     
-                    if kp_norm and kp_abs:
+                    timestamp = frame_count / self.video_fps
+                    if keypoints is not None:
+                        # Lọc One-Euro trước khi nhận dạng → keypoints không rung khi giữ tư thế
+                        smoothed = PoseKeypoints(
+                            self.stream.smooth(0, timestamp, keypoints.data[0]), keypoints.orig_shape
+                        )
+                        kp_norm = smoothed.flat34().tolist()
+                        kp_abs = smoothed.tuples()
                         pose_name, confidence = self.recognizer.recognize(kp_norm)
-                        score, feedback = self.evaluator.evaluate(pose_name, kp_abs)
-                        frame_drawn = self.drawer.draw(frame_resized.copy(), kp_abs, score)
+                        score, feedback, issues = self.evaluator.evaluate(pose_name, kp_abs, return_issues=True)
+                    else:
+                        self.stream.lost(0)
+                        kp_abs = None
+                        pose_name, score, feedback, issues = "NO POSE", 0, "Không tìm thấy người", ()
+                    
+                    # Nhãn/điểm ổn định theo cửa sổ; chỉ log khi vào/giữ/thoát tư thế
+                    state = self.stream.update(0, timestamp, pose_name, score, feedback)
+                    for event in state['events']:
+                        print(f"🧘 [{timestamp:7.1f}s] {event['type']:<7} {event['pose']} ({event['duration']:.1f}s)")
+                    self.session_stats.update(
+                        state['pose'], state['score'], issues if pose_name == state['pose'] else ()
+                    )
+                    pose_name, score, feedback = state['pose'], state['score'], state['feedback']
+                    changed = state['changed']
+                    
+                    start = time.perf_counter()
+                    if kp_abs is not None:
+                        # Canvas letterbox là của riêng frame này → vẽ thẳng, không cần copy
+                        frame_drawn = self.drawer.draw(frame_resized, kp_abs, score)
                         frame_final = self.overlay.draw_scoreboard(frame_drawn, pose_name, score, feedback)
                     else:
-                        pose_name, score, feedback = "NO POSE", 0, "Không tìm thấy người"
                         frame_final = frame_resized
+                    self.scheduler.record('render', time.perf_counter() - start)
                 else:
                     pose_name, score, feedback = "Loading", 0, "Đang tải..."
                     frame_final = frame_resized
+                    changed = True
                 
-                # Put processed frame to queue (non-blocking)
-                try:
-                    self.frame_queue.put_nowait({
-                        'frame': frame_final,
-                        'pose': pose_name,
-                        'score': score,
-                        'feedback': feedback
-                    })
-                except queue.Full:
-                    # Queue full, skip this frame
-                    pass
+                # Chờ chỗ trống thay vì bỏ frame: frame đã xử lý luôn được hiển thị,
+                # tốc độ do scheduler điều chỉnh
+                self.put_frame({
+                    'frame': frame_final,
+                    'pose': pose_name,
+                    'score': score,
+                    'feedback': feedback,
+                    'changed': changed
+                })
                     
             except Exception as e:
                 print(f"Processing error: {e}")
+                failed = True
                 continue
         
+        if store is not None:
+            # Chỉ dùng lại được khi đã ghi hết video không lỗi (dừng giữa chừng → lần sau ghi lại)
+            store.close(complete=finished and not failed)
+        
         # Signal end
         try:
             self.frame_queue.put_nowait(None)
         except:
             pass
     
+    def put_frame(self, data):
+        """Blocking put vào frame_queue (thoát khi video dừng)."""
+        while self.video_running:
+            try:
+                self.frame_queue.put(data, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
     def display_video_worker(self):
         """UI thread: Get frame from queue → Display (Consumer)"""
         if not self.video_running or not self.is_video_mode:
@@ -537,7 +705,9 @@ class YogaApp(ctk.CTk):
                 # End of video
                 self.stop_video()
                 self.lbl_feedback.configure(text="Kết thúc Video.")
-                messagebox.showinfo("Xong", "Đã phân tích xong video.")
+                report = self.session_stats.format() if self.session_stats is not None else ""
+                print(report)
+                messagebox.showinfo("Xong", f"Đã phân tích xong video.\n\n{report}")
                 return
             
             # Display frame (FAST!)
@@ -557,7 +727,10 @@ class YogaApp(ctk.CTk):
             self.current_result_image = pil_result
             
             self.display_image_on_label(pil_result, self.lbl_img_result)
-            self.update_stats(pose_name, score, feedback)
+            self.mark_startup('first_frame')
+            if data['changed']:
+                # Chỉ cập nhật panel khi trạng thái đổi (không redraw widget mỗi frame)
+                self.update_stats(pose_name, score, feedback)
             
         except queue.Empty:
             # No frame ready, skip this cycle
@@ -578,11 +751,28 @@ class YogaApp(ctk.CTk):
             import time
             time.sleep(0.3)
             
-        self.cap = cv2.VideoCapture(file_path)
+        if not MODEL_LOADED:
+            messagebox.showerror("Lỗi", "Chưa tải được các module xử lý (src/)!")
+            return
+            
+        # 🚀 Decode trên thread riêng vào ring buffer → thread AI không chờ I/O
+        self.cap = FrameReader(file_path, buffers=8)
         if not self.cap.isOpened():
             messagebox.showerror("Lỗi", "Không thể mở file Video!")
             return
         
+        self.video_letterbox = Letterboxer(
+            (PROCESS_WIDTH, PROCESS_HEIGHT), buffers=self.frame_queue.maxsize + 3
+        )
+        self.scheduler = AdaptiveScheduler(target_fps=APP_CONFIG['fps_target'])
+        self.tracker = KeypointTracker()
+        self.video_fps = self.cap.get(cv2.CAP_PROP_FPS) or APP_CONFIG['fps_target']
+        self.stream = PoseStream(fps=self.video_fps)
+        self.session_stats = SessionStats(fps=self.video_fps)
+        if self.detector is not None and APP_CONFIG['roi_crop']:
+            self.roi_detector = ROIPoseDetector(self.detector, imgsz=APP_CONFIG['roi_imgsz'])
+        self.keypoint_store = self.open_keypoint_store(file_path)
+
         # Clear queue
         while not self.frame_queue.empty():
             try:
@@ -601,6 +791,30 @@ class YogaApp(ctk.CTk):
         # Start display worker (UI thread)
         self.display_video_worker()
 
+    def open_keypoint_store(self, file_path):
+        """Keypoints đã lưu của video (đọc), store mới để ghi, hoặc None."""
+        if self.detector is None:
+            return None
+        try:
+            # Keypoints của GUI đến từ ROI crop + optical flow, không phải YOLO full frame
+            # → mode riêng, CLI / batch / --rescore không bao giờ dùng nhầm store này
+            mode = 'roi+track' if APP_CONFIG['roi_crop'] else 'track'
+            version = keypoint_version(self.detector.model_path, (PROCESS_WIDTH, PROCESS_HEIGHT), mode)
+            directory = KeypointStore.locate(file_path, version)
+            store = KeypointStore.open(directory, mode=mode)
+            if store is not None:
+                print(f"⚡ Dùng keypoints đã lưu: {directory}")
+                return store
+            frames = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            if frames <= 0:
+                return None
+            return KeypointStore.create(directory, frames, frame_shape=(PROCESS_HEIGHT, PROCESS_WIDTH),
+                                        meta={'source': str(file_path), 'fps': self.video_fps,
+                                              'version': version, 'mode': mode})
+        except OSError as e:
+            print(f"⚠️ Không mở được keypoint store: {e}")
+            return None
+
     def stop_video(self):
         """Stop video processing"""
         self.video_running = False
@@ -637,7 +851,7 @@ class YogaApp(ctk.CTk):
             self.after(0, lambda: self.display_image_on_label(pil_image, self.lbl_img_input))
             self.after(0, lambda: self.lbl_img_result.configure(text="Đang phân tích AI...", image=None))
 
-            if not MODEL_LOADED: return
+            if not self.wait_for_models(): return
 
             # 3. Chuyển sang OpenCV
             frame = cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
@@ -646,39 +860,54 @@ class YogaApp(ctk.CTk):
             # Việc này đảm bảo bảng điểm và khung xương luôn có tỉ lệ đẹp
             frame_resized = self.resize_image_to_fixed_size(frame, (PROCESS_WIDTH, PROCESS_HEIGHT))
             
-            # 5. Đưa vào pipeline xử lý
-            self.process_and_display(frame_resized, is_video=False)
+            # 5. Đưa vào pipeline xử lý (ảnh đã gặp → lấy kết quả từ cache)
+            cache_key = self.result_cache.key_for_file(img_path) if self.result_cache is not None else None
+            self.process_and_display(frame_resized, is_video=False, cache_key=cache_key)
             
         except Exception as e:
             print(f"Lỗi xử lý ảnh: {e}")
             self.after(0, lambda: self.lbl_feedback.configure(text=f"Lỗi: {e}"))
 
-    def process_and_display(self, frame_cv, is_video=False):
+    def process_and_display(self, frame_cv, is_video=False, cache_key=None):
         """
         Hàm này nhận vào frame đã được resize chuẩn (PROCESS_WIDTH x PROCESS_HEIGHT)
+
+        cache_key: khóa ResultCache của ảnh (None = luôn chạy model)
         """
         if not MODEL_LOADED or self.detector is None:
             return
 
         try:
-            # 1. Detect
-            results = self.detector.predict(frame_cv)
-            kp_norm = self.detector.get_keypoints_normalized(results)
-            kp_abs = self.detector.get_keypoints_absolute(results)
+            cached = self.result_cache.get(cache_key) if cache_key else None
+            if cached is not None:
+                # Cache hit: không cần YOLO / classifier / evaluator, chỉ vẽ lại
+                keypoints, (pose_name, confidence, score, feedback) = cached
+            else:
+                # 1. Detect
+                results = self.detector.predict(frame_cv)
+                keypoints = self.detector.get_pose_keypoints(results)
+
+                if keypoints is not None:
+                    # 2. Recognize & Evaluate
+                    pose_name, confidence = self.recognizer.recognize(keypoints.flat34().tolist())
+                    score, feedback = self.evaluator.evaluate(pose_name, keypoints.tuples())
+                else:
+                    pose_name, confidence, score, feedback = "NO POSE", 0.0, 0, "Không tìm thấy người"
+                if cache_key:
+                    self.result_cache.put(cache_key, keypoints, (pose_name, confidence, score, feedback),
+                                          frame_cv.shape[:2])
 
-            if kp_norm is None or kp_abs is None:
+            if keypoints is None:
                 if is_video:
                     self.display_final_result(frame_cv, "NO POSE", 0, "Không tìm thấy người", is_video)
                 else:
                     self.after(0, lambda: self.lbl_img_result.configure(text="Không tìm thấy người"))
                 return
 
-            # 2. Recognize & Evaluate
-            pose_name, confidence = self.recognizer.recognize(kp_norm)
-            score, feedback = self.evaluator.evaluate(pose_name, kp_abs)
+            kp_abs = keypoints.tuples()
 
             # 3. Draw & Overlay (Vẽ trực tiếp lên frame chuẩn)
-            frame_drawn = self.drawer.draw(frame_cv.copy(), kp_abs, score)
+            frame_drawn = self.drawer.draw(frame_cv, kp_abs, score)
             frame_final = self.overlay.draw_scoreboard(frame_drawn, pose_name, score, feedback)
 
             # 4. Lưu lại kết quả
@@ -707,6 +936,7 @@ class YogaApp(ctk.CTk):
             # Ảnh thì dùng after để tránh xung đột thread
             self.after(0, lambda: self.display_image_on_label(pil_result, self.lbl_img_result))
             self.after(0, lambda: self.update_stats(pose_name, score, feedback))
+            self.after(0, lambda: self.mark_startup('first_frame'))
 
     def update_stats(self, pose, score, feedback):
         self.lbl_pose_name.configure(text=pose)
@@ -735,7 +965,7 @@ class YogaApp(ctk.CTk):
                 ]
             )
             if file_path:
-                self.start_video(file_path)
+                self.run_when_models_ready(lambda: self.start_video(file_path))
         else:
             # Linux/Mac cần dùng space thay vì semicolon
             file_path = filedialog.askopenfilename(
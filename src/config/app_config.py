@@ -10,8 +10,25 @@ APP_CONFIG = {
     'version': '1.0.0',
     'default_model': 'yolov8m-pose.pt',
     'ml_classifier_path': './models/pose_classification.pth',
+    'classifier_backend': 'torch',  # 'torch' or 'numpy' (no torch import)
     'confidence_threshold': 0.5,
     'fps_target': 30,
+    # Khung xử lý chuẩn (letterbox) - giống PROCESS_WIDTH/HEIGHT trong app_ui
+    'process_width': 960,
+    'process_height': 540,
+    # Video: YOLO chạy trên crop quanh box của frame trước (ROIPoseDetector)
+    'roi_crop': True,
+    'roi_imgsz': 320,
+    # Cache kết quả ảnh theo hash nội dung (ResultCache), giới hạn dung lượng LRU
+    'result_cache_dir': '.cache/results',
+    'result_cache_mb': 256,
+    # Keypoints của video (KeypointStore, mmap float16) - xem lại không cần YOLO
+    'keypoint_store_dir': '.cache/keypoints',
+    'keypoint_store_persons': 4,
+    # Warmup models lúc tải (PoseDetector/MLPoseClassifier.warmup): số lần chạy mỗi kích thước
+    # và mục tiêu latency (ms) của frame đầu tiên (YOLO full frame + classifier) sau warmup
+    'warmup_runs': 3,
+    'first_frame_latency_ms': 100,
 }
 
 # Pose Classes
@@ -3,6 +3,9 @@ Detection module - YOLOv8 Pose Detection wrapper.
 """
 
 from .pose_detector import PoseDetector
+from .roi_detector import ROIPoseDetector
+from .pose_keypoints import PoseKeypoints
+from .letterbox import Letterboxer
 from .keypoint_constants import COCOKeypoints, KEYPOINTS, KEYPOINT_NAMES
 
-__all__ = ['PoseDetector', 'COCOKeypoints', 'KEYPOINTS', 'KEYPOINT_NAMES']
+__all__ = ['PoseDetector', 'ROIPoseDetector', 'PoseKeypoints', 'Letterboxer', 'COCOKeypoints', 'KEYPOINTS', 'KEYPOINT_NAMES']
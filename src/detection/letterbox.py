@@ -0,0 +1,129 @@
+"""
+Letterbox - Aspect-preserving resize into a reused, preallocated canvas.
+
+Thay cho resize (LANCZOS) + np.zeros + copy mỗi frame: ảnh được resize
+thẳng vào vùng giữa của canvas có sẵn, chỉ tô lại phần viền, và lưu
+scale/offset để đưa keypoints về tọa độ ảnh gốc.
+"""
+
+import cv2
+import numpy as np
+from typing import Optional, Tuple
+
+
+class Letterboxer:
+    """
+    Reusable letterbox preprocessing stage.
+
+    Canvases come from a small ring buffer, so a returned frame stays valid
+    until `buffers` more frames have been letterboxed. Size the pool to the
+    number of frames that can be in flight at once (queues + workers).
+
+    Example:
+        >>> letterbox = Letterboxer((960, 540), buffers=8)
+        >>> frame = letterbox(image)                  # (540, 960, 3), no allocation
+        >>> points = letterbox.to_source(keypoints)   # back to original image pixels
+    """
+
+    def __init__(self,
+                 target_size: Tuple[int, int] = (960, 540),
+                 interpolation: int = cv2.INTER_LINEAR,
+                 buffers: int = 2,
+                 pad_value: int = 0):
+        """
+        Initialize letterboxer.
+
+        Args:
+            target_size: (width, height) of the output canvas
+            interpolation: OpenCV interpolation (default: INTER_LINEAR)
+            buffers: Number of canvases in the ring buffer
+            pad_value: Padding color (gray level)
+        """
+        self.target_size = target_size
+        self.interpolation = interpolation
+        self.pad_value = pad_value
+
+        target_w, target_h = target_size
+        self._pool = [np.full((target_h, target_w, 3), pad_value, dtype=np.uint8)
+                      for _ in range(max(1, buffers))]
+        self._next = 0
+
+        # Geometry of the last frame (scale, (x_offset, y_offset), (new_w, new_h))
+        self.scale = 1.0
+        self.offset = (0, 0)
+        self.content_size = target_size
+        self.source_shape = None
+
+    def _geometry(self, source_shape):
+        """Compute (and cache) scale/offset for a source shape."""
+        if source_shape != self.source_shape:
+            target_w, target_h = self.target_size
+            h, w = source_shape
+            self.scale = min(target_w / w, target_h / h)
+            new_w, new_h = int(w * self.scale), int(h * self.scale)
+            self.content_size = (new_w, new_h)
+            self.offset = ((target_w - new_w) // 2, (target_h - new_h) // 2)
+            self.source_shape = source_shape
+        return self.offset, self.content_size
+
+    def __call__(self, image: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Letterbox a BGR image.
+
+        Args:
+            image: BGR image (any size)
+            out: Optional destination canvas (height, width, 3); default: next pooled buffer
+
+        Returns:
+            Letterboxed BGR image of target_size
+        """
+        if out is None:
+            out = self._pool[self._next]
+            self._next = (self._next + 1) % len(self._pool)
+
+        (x, y), (new_w, new_h) = self._geometry(image.shape[:2])
+        target_w, target_h = self.target_size
+
+        # Chỉ tô lại phần viền (canvas có thể đã bị vẽ đè ở frame trước)
+        out[:y] = self.pad_value
+        out[y + new_h:] = self.pad_value
+        out[y:y + new_h, :x] = self.pad_value
+        out[y:y + new_h, x + new_w:] = self.pad_value
+
+        # Resize thẳng vào vùng giữa canvas (không tạo ảnh trung gian)
+        roi = out[y:y + new_h, x:x + new_w]
+        if (new_w, new_h) == (image.shape[1], image.shape[0]):
+            roi[...] = image
+        else:
+            cv2.resize(image, (new_w, new_h), dst=roi, interpolation=self.interpolation)
+        return out
+
+    def to_source(self, points) -> np.ndarray:
+        """
+        Map letterboxed pixel coordinates back to the last source image.
+
+        Args:
+            points: Array (..., 2) or (..., 3); extra columns (conf) are kept
+
+        Returns:
+            Float array of the same shape in source-image pixels
+        """
+        points = np.array(points, dtype=np.float64)
+        points[..., 0] = (points[..., 0] - self.offset[0]) / self.scale
+        points[..., 1] = (points[..., 1] - self.offset[1]) / self.scale
+        return points
+
+    def to_canvas(self, points) -> np.ndarray:
+        """
+        Map source-image pixel coordinates onto the letterboxed canvas.
+
+        Args:
+            points: Array (..., 2) or (..., 3); extra columns (conf) are kept
+
+        Returns:
+            Float array of the same shape in canvas pixels
+        """
+        points = np.array(points, dtype=np.float64)
+        points[..., 0] = points[..., 0] * self.scale + self.offset[0]
+        points[..., 1] = points[..., 1] * self.scale + self.offset[1]
+        return points
@@ -5,14 +5,16 @@ Detects person in image and extracts 17 COCO keypoints.
 """
 
 import sys
+import time
 import cv2
 import numpy as np
-from typing import Optional, List, Tuple
+from typing import Optional, List, Sequence, Tuple
 
 from ultralytics import YOLO
 from ultralytics.engine.results import Results
 
 from .keypoint_constants import KEYPOINTS
+from .pose_keypoints import PoseKeypoints
 
 
 class PoseDetector:
@@ -40,6 +42,7 @@ class PoseDetector:
         self.confidence_threshold = confidence_threshold
         self.keypoints_const = KEYPOINTS
         self.use_gpu = use_gpu
+        self.warmup_stats = {}  # {"HxW[@imgsz]": {'cold_ms', 'warm_ms'}} - xem warmup()
         self._load_model()
     
     def _load_model(self):
@@ -80,11 +83,22 @@ class PoseDetector:
         Returns:
             List of 34 values: [x1, y1, x2, y2, ..., x17, y17]
         """
-        features = []
-        for idx in range(17):
-            x, y = keypoint_array[idx][0], keypoint_array[idx][1]
-            features.extend([x, y])
-        return features  # 34 values total
+        return np.asarray(keypoint_array)[:17, :2].reshape(-1).tolist()  # 34 values total
+    
+    def get_pose_keypoints(self, result: Results) -> Optional[PoseKeypoints]:
+        """
+        Get keypoints of all persons as one NumPy-backed container.
+        
+        Copies keypoints from device to host once; normalized, absolute and
+        confidence views are all derived from that single array.
+        
+        Args:
+            result: YOLOv8 Results object
+        
+        Returns:
+            PoseKeypoints, or None if no person detected
+        """
+        return PoseKeypoints.from_result(result)
     
     def get_keypoints_normalized(self, result: Results) -> Optional[List[float]]:
         """
@@ -96,17 +110,12 @@ class PoseDetector:
         Returns:
             List of 34 normalized values, or None if no person detected
         """
-        if result.keypoints is None:
-            return None
-        
-        # Get normalized keypoints (xyn format: 0-1 range)
-        keypoints = result.keypoints.xyn.cpu().numpy()
-        
-        if len(keypoints) == 0:
+        keypoints = self.get_pose_keypoints(result)
+        if keypoints is None:
             return None
         
         # Return first person detected
-        return self.extract_keypoints(keypoints[0])
+        return keypoints.flat34(0).tolist()
     
     def get_keypoints_absolute(self, result: Results) -> Optional[List[Tuple[int, int]]]:
         """
@@ -118,21 +127,52 @@ class PoseDetector:
         Returns:
             List of 17 (x, y) tuples in pixel coordinates, or None if no person detected
         """
-        if result.keypoints is None:
+        keypoints = self.get_pose_keypoints(result)
+        if keypoints is None:
             return None
         
-        # Get absolute keypoints (xy format: pixel coordinates)
-        keypoints = result.keypoints.xy.cpu().numpy()
+        # Return first person detected
+        return keypoints.tuples(0)
+    
+    def get_keypoints_multi(self, result: Results,
+                            normalized: bool = False) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Get keypoints of every person detected in a YOLOv8 result.
         
-        if len(keypoints) == 0:
+        Args:
+            result: YOLOv8 Results object
+            normalized: If True, x/y are normalized (0-1). If False, pixel coordinates
+        
+        Returns:
+            Tuple of (keypoints, boxes, confidences), or None if no person detected
+            - keypoints: Array (P, 17, 3) with [x, y, keypoint_confidence]
+            - boxes: Array (P, 4) person boxes [x1, y1, x2, y2] in pixel coordinates
+            - confidences: Array (P,) person detection confidences
+        """
+        keypoints = self.get_pose_keypoints(result)
+        if keypoints is None or keypoints.boxes is None:
             return None
         
-        # Convert to list of tuples
-        keypoints_list = []
-        for kp in keypoints[0]:
-            keypoints_list.append((int(kp[0]), int(kp[1])))
+        xy = keypoints.xyn if normalized else keypoints.xy
+        data = np.concatenate([xy, keypoints.conf[..., None]], axis=-1)
         
-        return keypoints_list
+        return data, keypoints.boxes, keypoints.scores
+    
+    def detect_multi(self, image: np.ndarray,
+                     return_absolute: bool = False) -> Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """
+        Detect all persons in image from a single forward pass.
+        
+        Args:
+            image: Input image (BGR format)
+            return_absolute: If True, return absolute pixel coords. If False, return normalized (0-1)
+        
+        Returns:
+            Tuple of (keypoints (P, 17, 3), boxes (P, 4), confidences (P,)),
+            or None if no person detected
+        """
+        result = self.predict(image)
+        return self.get_keypoints_multi(result, normalized=not return_absolute)
     
     def detect(self, image: np.ndarray, return_absolute: bool = False) -> Optional[List]:
         """
@@ -156,25 +196,117 @@ class PoseDetector:
         else:
             return self.get_keypoints_normalized(result)
     
-    def predict(self, image: np.ndarray) -> Results:
+    def predict(self, image: np.ndarray, imgsz: Optional[int] = None) -> Results:
         """
         Run YOLOv8 prediction on image.
         
         Args:
             image: Input image (BGR format)
+            imgsz: Network input size (default: the model's own, 640)
         
         Returns:
             YOLOv8 Results object
         """
+        extra = {'imgsz': imgsz} if imgsz else {}
         # Pass device to YOLOv8 for GPU acceleration
         results = self.model.predict(
             image, 
             save=False, 
             verbose=False,
-            device=self.device  # Use GPU if available
+            device=self.device,  # Use GPU if available
+            **extra
         )
         return results[0]
     
+    def detect_batch(self, images: List[np.ndarray], return_absolute: bool = False,
+                     batch_size: Optional[int] = None) -> List[Optional[List]]:
+        """
+        Detect person and extract keypoints for several frames at once.
+        
+        Args:
+            images: List of input images (BGR format), e.g. letterboxed video frames
+            return_absolute: If True, return absolute pixel coords. If False, return normalized (0-1)
+            batch_size: Max frames per YOLOv8 call (default: all frames in one call)
+        
+        Returns:
+            List with one entry per input frame, same format as detect()
+        """
+        results = self.predict_batch(images, batch_size=batch_size)
+        
+        if return_absolute:
+            return [self.get_keypoints_absolute(result) for result in results]
+        else:
+            return [self.get_keypoints_normalized(result) for result in results]
+    
+    def predict_batch(self, images: List[np.ndarray], batch_size: Optional[int] = None) -> List[Results]:
+        """
+        Run YOLOv8 prediction on several images in one call.
+        
+        Preprocessing and framework dispatch are paid once per batch instead of
+        once per frame, which matters most on CPU-only machines.
+        
+        Args:
+            images: List of input images (BGR format)
+            batch_size: Max frames per YOLOv8 call (default: all frames in one call)
+        
+        Returns:
+            List of YOLOv8 Results objects, one per input image (same order)
+        """
+        images = list(images)
+        if len(images) == 0:
+            return []
+        
+        batch_size = batch_size or len(images)
+        
+        results = []
+        for start in range(0, len(images), batch_size):
+            # YOLOv8 treats a list of arrays as a single batch
+            chunk = images[start:start + batch_size]
+            results.extend(self.model.predict(
+                chunk,
+                save=False,
+                verbose=False,
+                device=self.device
+            ))
+        return results
+    
+    def warmup(self, shapes: Sequence[Tuple[int, ...]] = ((540, 960),), runs: int = 3) -> dict:
+        """
+        Run synthetic frames through the model so real frames start at steady-state speed.
+        
+        The first predict() of each input size pays for layer fusion, kernel
+        selection and memory allocation; warming up at the sizes used at runtime
+        moves that cost to load time.
+        
+        Args:
+            shapes: (height, width) or (height, width, imgsz) per input to warm up,
+                e.g. [(PROCESS_HEIGHT, PROCESS_WIDTH), (540, 270, 320)] for ROI crops
+            runs: Calls per shape (1 cold + runs-1 warm)
+        
+        Returns:
+            dict {"HxW[@imgsz]": {'cold_ms': first call, 'warm_ms': best later call}},
+            also kept in self.warmup_stats
+        """
+        rng = np.random.default_rng(0)
+        for shape in shapes:
+            height, width = shape[:2]
+            imgsz = shape[2] if len(shape) > 2 else None
+            image = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+            
+            latencies = []
+            for _ in range(max(1, runs)):
+                start = time.perf_counter()
+                self.predict(image, imgsz=imgsz)
+                latencies.append((time.perf_counter() - start) * 1000)
+            
+            key = f"{height}x{width}" + (f"@{imgsz}" if imgsz else "")
+            self.warmup_stats[key] = {
+                'cold_ms': round(latencies[0], 1),
+                'warm_ms': round(min(latencies[1:] or latencies), 1),
+            }
+            print(f"🔥 Warmup YOLOv8 {key}: cold {latencies[0]:.0f} ms → warm {self.warmup_stats[key]['warm_ms']:.0f} ms")
+        return self.warmup_stats
+    
     def __call__(self, image: np.ndarray) -> Results:
         """Shortcut for predict()."""
         return self.predict(image)
@@ -0,0 +1,133 @@
+"""
+Pose Keypoints - NumPy container for YOLOv8 pose output.
+
+Holds every person's keypoints of one frame in a single (P, 17, 3) array
+copied from the device once, and exposes the formats used downstream
+(normalized flat-34, body-24, pixel tuples) as cheap views.
+"""
+
+import numpy as np
+from typing import Optional, List, Tuple
+
+from ultralytics.engine.results import Results
+
+
+class PoseKeypoints:
+    """
+    Keypoints of all persons in one frame.
+
+    Attributes:
+        data: Array (P, 17, 3) with [x, y, confidence] in pixel coordinates
+        orig_shape: (height, width) of the image the keypoints refer to
+        boxes: Array (P, 4) person boxes [x1, y1, x2, y2], or None
+        scores: Array (P,) person detection confidences, or None
+
+    Example:
+        >>> kps = PoseKeypoints.from_result(detector.predict(frame))
+        >>> kp_norm = kps.flat34()   # (34,) normalized, for the classifier
+        >>> kp_abs = kps.tuples()    # 17 (x, y) ints, for evaluator/drawer
+    """
+
+    def __init__(self, data: np.ndarray, orig_shape: Tuple[int, int],
+                 boxes: Optional[np.ndarray] = None, scores: Optional[np.ndarray] = None):
+        """
+        Initialize container.
+
+        Args:
+            data: Array (P, 17, 2) or (P, 17, 3) of pixel keypoints
+            orig_shape: (height, width) of the source image
+            boxes: Optional array (P, 4) of person boxes
+            scores: Optional array (P,) of person confidences
+        """
+        data = np.asarray(data, dtype=np.float32)
+        if data.ndim == 2:
+            data = data[None]
+        if data.shape[-1] == 2:
+            # No visibility output: treat every joint as confident
+            data = np.concatenate([data, np.ones(data.shape[:2] + (1,), dtype=np.float32)], axis=-1)
+
+        self.data = data
+        self.orig_shape = (int(orig_shape[0]), int(orig_shape[1]))
+        self.boxes = boxes
+        self.scores = scores
+        self._xyn = None
+
+    @classmethod
+    def from_result(cls, result: Results) -> Optional['PoseKeypoints']:
+        """
+        Build container from a YOLOv8 result (one device-to-host copy).
+
+        Args:
+            result: YOLOv8 Results object
+
+        Returns:
+            PoseKeypoints, or None if no person detected
+        """
+        if result.keypoints is None:
+            return None
+
+        data = result.keypoints.data.cpu().numpy()
+        if len(data) == 0:
+            return None
+
+        boxes, scores = None, None
+        if result.boxes is not None and len(result.boxes) == len(data):
+            box_data = result.boxes.data.cpu().numpy()  # [x1, y1, x2, y2, (id), conf, cls]
+            boxes = box_data[:, :4]
+            scores = box_data[:, -2]
+
+        return cls(data, result.orig_shape, boxes=boxes, scores=scores)
+
+    def __len__(self) -> int:
+        """Number of persons."""
+        return len(self.data)
+
+    @property
+    def xy(self) -> np.ndarray:
+        """Pixel coordinates (P, 17, 2) - view into data."""
+        return self.data[..., :2]
+
+    @property
+    def conf(self) -> np.ndarray:
+        """Per-joint confidence (P, 17) - view into data."""
+        return self.data[..., 2]
+
+    @property
+    def xyn(self) -> np.ndarray:
+        """Normalized coordinates (P, 17, 2) in 0-1 range (computed once)."""
+        if self._xyn is None:
+            h, w = self.orig_shape
+            self._xyn = self.xy / np.array([w, h], dtype=np.float32)
+        return self._xyn
+
+    def flat34(self, person: int = 0, normalized: bool = True) -> np.ndarray:
+        """
+        Keypoints of one person as flat array.
+
+        Args:
+            person: Person index
+            normalized: If True, use 0-1 coordinates. If False, pixel coordinates
+
+        Returns:
+            Array of 34 values: [x1, y1, x2, y2, ..., x17, y17]
+        """
+        points = self.xyn[person] if normalized else self.xy[person]
+        return points.reshape(-1)
+
+    def body24(self, person: int = 0, normalized: bool = True) -> np.ndarray:
+        """
+        Body keypoints of one person (head points 0-4 removed).
+
+        Returns:
+            Array of 24 values: [x6, y6, ..., x17, y17]
+        """
+        return self.flat34(person, normalized)[10:]
+
+    def tuples(self, person: int = 0) -> List[Tuple[int, int]]:
+        """
+        Pixel keypoints of one person as integer tuples.
+
+        Returns:
+            List of 17 (x, y) tuples
+        """
+        return list(map(tuple, self.xy[person].astype(np.int64).tolist()))
@@ -0,0 +1,141 @@
+"""
+ROI Pose Detector - Run YOLOv8 on a crop around the previous person box.
+
+Học viên đứng gần như cố định trong khung hình, nên chỉ cần đưa vùng quanh
+box của frame trước (có đệm) vào YOLO ở kích thước nhỏ hơn, rồi đổi
+keypoints về toạ độ frame đầy đủ. Khi crop mất người, quay lại detect cả frame.
+"""
+
+import math
+import numpy as np
+from typing import Optional, Tuple
+
+from .pose_detector import PoseDetector
+from .pose_keypoints import PoseKeypoints
+
+
+class ROIPoseDetector:
+    """
+    Pose detection on a padded crop around the last person box.
+
+    Falls back to a full-frame pass when there is no previous box, when the
+    crop yields no confident person, when the person touches the crop border
+    (moving out of the ROI), and every refresh_interval frames so new people
+    entering the scene are not missed.
+
+    Example:
+        >>> detector = ROIPoseDetector(PoseDetector('yolov8m-pose.pt'), imgsz=320)
+        >>> keypoints = detector.detect(frame)   # PoseKeypoints in frame pixels
+        >>> print(detector.last_mode)            # 'roi' or 'full'
+    """
+
+    def __init__(self,
+                 detector: PoseDetector,
+                 padding: float = 0.25,
+                 imgsz: int = 320,
+                 min_score: Optional[float] = None,
+                 border_margin: int = 4,
+                 refresh_interval: int = 30):
+        """
+        Initialize ROI detector.
+
+        Args:
+            detector: Loaded PoseDetector (its model is reused)
+            padding: Extra margin around the box, as a fraction of box width/height
+            imgsz: YOLO input size for crops (multiple of 32, smaller = faster)
+            min_score: Min person confidence in the crop (default: detector threshold)
+            border_margin: Box this close (pixels) to a crop edge counts as leaving the ROI
+            refresh_interval: Force a full-frame pass after this many crop passes (0 = never)
+        """
+        self.detector = detector
+        self.padding = padding
+        self.imgsz = imgsz
+        self.min_score = detector.confidence_threshold if min_score is None else min_score
+        self.border_margin = border_margin
+        self.refresh_interval = refresh_interval
+        self.reset()
+
+    def reset(self):
+        """Forget the previous box (next call detects on the full frame)."""
+        self._box = None
+        self._roi_count = 0
+        self.last_mode = None
+        self.last_roi = None
+
+    def _crop_region(self, shape: Tuple[int, int]) -> Tuple[int, int, int, int]:
+        """Padded previous box clipped to the frame: (x1, y1, x2, y2)."""
+        h, w = shape[:2]
+        x1, y1, x2, y2 = self._box
+        pad_x = (x2 - x1) * self.padding
+        pad_y = (y2 - y1) * self.padding
+        return (max(0, int(x1 - pad_x)), max(0, int(y1 - pad_y)),
+                min(w, int(math.ceil(x2 + pad_x))), min(h, int(math.ceil(y2 + pad_y))))
+
+    def _crop_imgsz(self, region: Tuple[int, int, int, int]) -> int:
+        """Crop input size: imgsz, but never upscale a small crop (multiple of 32)."""
+        long_side = max(region[2] - region[0], region[3] - region[1])
+        return int(min(self.imgsz, max(32, math.ceil(long_side / 32) * 32)))
+
+    def _detect_full(self, frame: np.ndarray) -> Optional[PoseKeypoints]:
+        """Full-frame pass (default YOLO input size)."""
+        self.last_mode = 'full'
+        self.last_roi = None
+        self._roi_count = 0
+        return self.detector.get_pose_keypoints(self.detector.predict(frame))
+
+    def _detect_roi(self, frame: np.ndarray) -> Optional[PoseKeypoints]:
+        """Crop pass; None when the crop lost the person."""
+        x1, y1, x2, y2 = region = self._crop_region(frame.shape)
+        if x2 - x1 < 32 or y2 - y1 < 32:
+            return None
+
+        result = self.detector.predict(frame[y1:y2, x1:x2], imgsz=self._crop_imgsz(region))
+        keypoints = self.detector.get_pose_keypoints(result)
+        if keypoints is None or keypoints.boxes is None:
+            return None
+        if keypoints.scores is not None and keypoints.scores[0] < self.min_score:
+            return None
+
+        # Người chạm mép crop (mà mép đó không phải mép frame) → đang ra khỏi ROI
+        bx1, by1, bx2, by2 = keypoints.boxes[0]
+        h, w = frame.shape[:2]
+        m = self.border_margin
+        if ((x1 > 0 and bx1 <= m) or (y1 > 0 and by1 <= m)
+                or (x2 < w and bx2 >= x2 - x1 - m) or (y2 < h and by2 >= y2 - y1 - m)):
+            return None
+
+        # Đổi về toạ độ frame; điểm không detect được (0, 0) giữ nguyên
+        data = keypoints.data.copy()
+        found = (data[..., :2] != 0).any(axis=-1)
+        data[..., 0][found] += x1
+        data[..., 1][found] += y1
+        boxes = keypoints.boxes + np.array([x1, y1, x1, y1], dtype=keypoints.boxes.dtype)
+
+        self.last_mode = 'roi'
+        self.last_roi = region
+        self._roi_count += 1
+        return PoseKeypoints(data, frame.shape[:2], boxes=boxes, scores=keypoints.scores)
+
+    def detect(self, frame: np.ndarray) -> Optional[PoseKeypoints]:
+        """
+        Detect poses, on the ROI when possible.
+
+        Args:
+            frame: Input image (BGR format)
+
+        Returns:
+            PoseKeypoints in frame pixel coordinates, or None if no person detected
+        """
+        keypoints = None
+        refresh = self.refresh_interval and self._roi_count >= self.refresh_interval
+        if self._box is not None and not refresh:
+            keypoints = self._detect_roi(frame)
+        if keypoints is None:
+            keypoints = self._detect_full(frame)
+
+        self._box = keypoints.boxes[0].copy() if keypoints is not None and keypoints.boxes is not None else None
+        return keypoints
+
+    def __call__(self, frame: np.ndarray) -> Optional[PoseKeypoints]:
+        """Shortcut for detect()."""
+        return self.detect(frame)
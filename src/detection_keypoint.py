@@ -40,11 +40,7 @@ class DetectKeypoint:
         self.model = YOLO(self.yolov8_model)
 
     def extract_keypoint(self, keypoint: np.ndarray) -> List[float]:
-        features = []
-        for idx in range(17):
-            x, y = keypoint[idx][0], keypoint[idx][1]
-            features.extend([x, y])
-        return features  # 34 values
+        return np.asarray(keypoint)[:17, :2].reshape(-1).tolist()  # 34 values
 
     def get_xy_keypoint(self, result: Results) -> Optional[List[float]]:
         if result.keypoints is None:
@@ -2,403 +2,227 @@
 Pose Evaluator - Improved scoring for yoga poses.
 
 Đánh giá dựa trên nhiều tiêu chí cho độ chính xác cao hơn.
+Tiêu chí được khai báo dạng dữ liệu trong pose_rules.py và được biên dịch
+thành các phép toán vector hóa, nên có thể chấm cả batch (N, 17, 2) một lần.
 """
 
 import sys
+import numpy as np
 from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from geometry.geometry_utils import GeometryUtils
+from geometry.pose_geometry import PoseGeometry
+from .pose_rules import FEATURES, POSE_RULES, FEEDBACK_TIERS, UNKNOWN_FEEDBACK
+
+
+_FEATURE_OPS = {
+    'mean': lambda a, b: (a + b) / 2,
+    'max': np.maximum,
+    'min': np.minimum,
+    'sub': np.subtract,
+    'absdiff': lambda a, b: np.abs(a - b),
+}
+
+_COMPARE_OPS = {
+    '>=': np.greater_equal,
+    '>': np.greater,
+    '<=': np.less_equal,
+    '<': np.less,
+}
 
 
 class PoseEvaluator:
     """
     Evaluates yoga poses with multi-criteria geometric rules.
-    
+
     Returns score (0-100) and feedback message in Vietnamese.
+
+    Example:
+        >>> evaluator = PoseEvaluator()
+        >>> score, feedback = evaluator.evaluate("Plank", keypoints)          # (17, 2)
+        >>> scores, feedbacks = evaluator.evaluate_batch(names, batch)        # (N, 17, 2)
     """
-    
-    def __init__(self):
-        self.geo = GeometryUtils()
-    
-    def evaluate(self, pose_name, keypoints):
+
+    def __init__(self, rules: dict = None, features: dict = None):
+        """
+        Initialize evaluator.
+
+        Args:
+            rules: Pose rule table (default: POSE_RULES)
+            features: Derived feature table (default: FEATURES)
+        """
+        self.geometry = PoseGeometry()
+        self.features = features or FEATURES
+        self.rules = rules or POSE_RULES
+        self._compiled = {name: self._compile(name, rule) for name, rule in self.rules.items()}
+
+    def _compile(self, pose_name, rule):
+        """Validate a pose rule and turn its bands into arrays."""
+        known = set(self.geometry.angle_names) | set(self.geometry.distance_names) | set(self.features)
+        criteria = []
+
+        for criterion in rule['criteria']:
+            for conditions, _, _ in criterion['bands']:
+                for feature, op, _ in conditions:
+                    if feature not in known:
+                        raise ValueError(f"{pose_name}: unknown feature '{feature}'")
+                    if op not in _COMPARE_OPS:
+                        raise ValueError(f"{pose_name}: unknown comparison '{op}'")
+
+            default_score, default_issue = criterion['default']
+            criteria.append({
+                'weight': criterion['weight'],
+                'bands': criterion['bands'],
+                'scores': np.array([b[1] for b in criterion['bands']] + [default_score], dtype=np.float64),
+                'issues': [b[2] for b in criterion['bands']] + [default_issue],
+            })
+
+        return {
+            'perfect': rule['perfect'],
+            'criteria': criteria,
+            'total_weight': sum(c['weight'] for c in criteria),
+        }
+
+    def compute_features(self, keypoints):
+        """
+        Compute geometry + derived features for a batch.
+
+        Args:
+            keypoints: Array (N, 17, 2) or (N, 17, 3)
+
+        Returns:
+            dict {feature_name: array (N,)}
+        """
+        points = np.asarray(keypoints, dtype=np.float64)[..., :2]
+        values = self.geometry.compute(points)
+
+        for name, (op, *args) in self.features.items():
+            if op == 'y':
+                values[name] = points[:, list(args), 1].sum(axis=-1) / len(args)
+            elif op == 'scale':
+                values[name] = values[args[0]] * args[1]
+            else:
+                values[name] = _FEATURE_OPS[op](values[args[0]], values[args[1]])
+        return values
+
+    def evaluate(self, pose_name, keypoints, return_issues=False):
         """
         Evaluate a detected pose.
-        
+
         Args:
             pose_name: Name of the pose ("Plank", "Tree", etc.)
             keypoints: List of 17 COCO keypoints [(x, y, conf), ...]
-        
+            return_issues: Also return the failed criteria
+
         Returns:
-            tuple: (score, feedback_message)
+            tuple: (score, feedback_message), or (score, feedback_message, issues)
                 score: 0-100 integer
                 feedback_message: String describing the evaluation (Vietnamese)
+                issues: Tuple of issue names reported by the criteria
         """
-        # Map pose names to evaluation methods
-        evaluators = {
-            'Plank': self._evaluate_plank,
-            'Tree': self._evaluate_tree,
-            'Warrior2': self._evaluate_warrior,
-            'Goddess': self._evaluate_goddess,
-            'Downdog': self._evaluate_downdog,
-        }
-        
-        evaluator = evaluators.get(pose_name)
-        if evaluator:
-            return evaluator(keypoints)
-        else:
+        if pose_name not in self._compiled:
             # Unknown pose - không nhận dạng được
-            return 0, "Không xác định được tư thế chuẩn"
-    
-    def _evaluate_plank(self, kp):
-        """
-        Plank: Đánh giá 2 tiêu chí
-        1. Thân thẳng (60%)
-        2. Tay chống thẳng (40%)
-        """
-        scores = []
-        issues = []
-        
-        # 1. TIÊU CHÍ 1: Thân thẳng (60%)
-        body_angle = self.geo.calculate_angle(kp[5], kp[11], kp[13])
-        
-        # Plank CHUẨN: 160-175° (hông hơi cao hơn thẳng tuyệt đối)
-        if 160 <= body_angle <= 175:
-            scores.append(100)
-        elif 175 < body_angle <= 180:  # Quá thẳng (như nằm sấp)
-            scores.append(85)
-            issues.append("hông cần cao hơn chút")
-        elif 150 <= body_angle < 160:
-            scores.append(85)
-            issues.append("hông hơi cao")
-        else:
-            scores.append(70)
-            issues.append("hông quá cao")
-        
-        # 2. TIÊU CHÍ 2: Tay chống (40%)
-        # Support BOTH: Straight-arm plank AND elbow plank
-        left_arm = self.geo.calculate_angle(kp[5], kp[7], kp[9])
-        right_arm = self.geo.calculate_angle(kp[6], kp[8], kp[10])
-        avg_arm = (left_arm + right_arm) / 2
-        
-        # Check if elbows OR wrists are supporting
-        avg_elbow_y = (kp[7][1] + kp[8][1]) / 2
-        avg_wrist_y = (kp[9][1] + kp[10][1]) / 2
-        avg_shoulder_y = (kp[5][1] + kp[6][1]) / 2
-        
-        # Elbow plank: elbows near ground (close to wrist level)
-        # Straight-arm plank: wrists near ground, elbows raised
-        is_elbow_plank = abs(avg_elbow_y - avg_wrist_y) < 30  # Elbow & wrist same level
-        is_straight_arm = avg_elbow_y < avg_wrist_y - 30  # Elbow raised
-        
-        # Check if actually supporting (not lying flat)
-        is_supporting = (avg_elbow_y > avg_shoulder_y + 50) or (avg_wrist_y > avg_shoulder_y + 50)
-        
-        if (avg_arm >= 160 or is_elbow_plank) and is_supporting:  # Good form + supporting
-            scores.append(100)
-        elif (avg_arm >= 145 or is_elbow_plank) and is_supporting:
-            scores.append(85)
-            issues.append("tay hơi cong")
-        elif is_supporting:
-            scores.append(75)
-            issues.append("duỗi tay thẳng hơn")
-        else:  # Not supporting = lying flat
-            scores.append(30)
-            issues.append("cần nâng người lên bằng tay")
-        
-        # Tính điểm: 60% thân + 40% tay
-        final_score = int(scores[0] * 0.6 + scores[1] * 0.4)
-        
-        if final_score >= 90:
-            feedback = "Tuyệt vời! Tư thế Plank hoàn hảo ✅"
-        elif final_score >= 75:
-            feedback = f"Tốt! Cần điều chỉnh: {', '.join(issues)} ⚠️"
-        elif final_score >= 60:
-            feedback = f"Cần cải thiện: {', '.join(issues)} ⚠️"
-        else:
-            feedback = f"Chưa đúng tư thế. Kiểm tra: {', '.join(issues)} ❌"
-        
-        return final_score, feedback
-    
-    def _evaluate_tree(self, kp):
-        """
-        Tree: Đánh giá 3 tiêu chí
-        1. Chân đứng thẳng (33%)
-        2. Chân kia gập vào (33%)
-        3. Tay chắp lên (33%)
-        """
-        scores = []
-        issues = []
-        
-        # 1. Chân đứng thẳng
-        angle_left = self.geo.calculate_angle(kp[11], kp[13], kp[15])
-        angle_right = self.geo.calculate_angle(kp[12], kp[14], kp[16])
-        standing_angle = max(angle_left, angle_right)
-        bent_angle = min(angle_left, angle_right)
-        
-        if standing_angle >= 155:  # Relaxed from 165° due to ankle detection variance
-            scores.append(100)
-        elif standing_angle >= 145:
-            scores.append(85)
-            issues.append("chân đứng hơi cong")
-        else:
-            scores.append(70)
-            issues.append("chân đứng cong quá")
-        
-        # 2. Chân kia gập vào
-        if bent_angle < 120:
-            scores.append(100)
-        elif bent_angle < 140:
-            scores.append(70)
-            issues.append("chân gập chưa đủ")
-        else:
-            scores.append(30)
-            issues.append("chân kia chưa gập vào")
-        
-        # 3. Tay chắp/giơ cao - CHECK BOTH elbow angle AND wrist distance
-        elbow_angle_l = self.geo.calculate_angle(kp[5], kp[7], kp[9])
-        elbow_angle_r = self.geo.calculate_angle(kp[6], kp[8], kp[10])
-        avg_elbow = (elbow_angle_l + elbow_angle_r) / 2
-        
-        # Check wrist distance (hands should be together/clasped)
-        wrist_left = kp[9]
-        wrist_right = kp[10]
-        wrist_distance = ((wrist_left[0] - wrist_right[0])**2 + 
-                         (wrist_left[1] - wrist_right[1])**2)**0.5
-        
-        # Shoulder width for reference
-        shoulder_width = ((kp[5][0] - kp[6][0])**2 + 
-                         (kp[5][1] - kp[6][1])**2)**0.5
-        
-        # Wrists should be close (within 50% of shoulder width)
-        wrists_together = wrist_distance < (shoulder_width * 0.5)
-        
-        if avg_elbow < 100 and wrists_together:  # Tay gập + chắp
-            scores.append(100)
-        elif avg_elbow < 130 and wrists_together:  # Tay hơi cao + chắp
-            scores.append(80)
-            issues.append("tay chưa giơ cao đủ")
-        elif avg_elbow < 100:  # Tay gập nhưng KHÔNG chắp
-            scores.append(50)
-            issues.append("tay cần chắp lại")
-        else:  # Tay không gập hoặc không chắp
-            scores.append(30)
-            issues.append("tay cần chắp/giơ cao")
-        
-        final_score = int(sum(scores) / len(scores))
-        
-        if final_score >= 90:
-            feedback = "Hoàn hảo! Tư thế Tree chuẩn ✅"
-        elif final_score >= 75:
-            feedback = f"Tốt! Cần điều chỉnh: {', '.join(issues)} ⚠️"
-        elif final_score >= 60:
-            feedback = f"Cần cải thiện: {', '.join(issues)} ⚠️"
-        else:
-            feedback = f"Chưa đúng tư thế. Kiểm tra: {', '.join(issues)} ❌"
-        
-        return final_score, feedback
-    
-    def _evaluate_warrior(self, kp):
-        """
-        Warrior II: Đánh giá 3 tiêu chí
-        1. Chân trước gập (40%)
-        2. Chân sau thẳng (30%)
-        3. Tay dang ngang (30%)
-        """
-        scores = []
-        issues = []
-        
-        angle_left = self.geo.calculate_angle(kp[11], kp[13], kp[15])
-        angle_right = self.geo.calculate_angle(kp[12], kp[14], kp[16])
-        front_angle = min(angle_left, angle_right)
-        back_angle = max(angle_left, angle_right)
-        
-        # 1. Chân trước gập (40%)
-        if 80 <= front_angle <= 125:
-            scores.append(100)
-        elif 70 <= front_angle <= 135:
-            scores.append(85)
-            issues.append("góc chân trước điều chỉnh nhẹ")
-        elif 60 <= front_angle <= 145:
-            scores.append(70)
-            issues.append("chân trước cần gập hơn")
-        else:
-            scores.append(50)
-            issues.append("chân trước chưa đúng")
-        
-        # 2. Chân sau thẳng (30%)
-        if back_angle >= 155:
-            scores.append(100)
-        elif back_angle >= 145:
-            scores.append(80)
-            issues.append("chân sau hơi cong")
-        else:
-            scores.append(60)
-            issues.append("duỗi chân sau thẳng")
-        
-        # 3. Tay dang ngang (30%)
-        left_shoulder_arm = self.geo.calculate_angle(kp[6], kp[5], kp[7])
-        right_shoulder_arm = self.geo.calculate_angle(kp[5], kp[6], kp[8])
-        avg_arm_angle = (left_shoulder_arm + right_shoulder_arm) / 2
-        
-        if avg_arm_angle >= 150:
-            scores.append(100)
-        elif avg_arm_angle >= 130:
-            scores.append(75)
-            issues.append("tay chưa dang thẳng ngang")
-        else:
-            scores.append(50)
-            issues.append("cần dang tay ra 2 bên")
-        
-        # Tính điểm: 40% + 30% + 30%
-        final_score = int(scores[0] * 0.4 + scores[1] * 0.3 + scores[2] * 0.3)
-        
-        if final_score >= 90:
-            feedback = "Tuyệt vời! Tư thế Warrior2 hoàn hảo ✅"
-        elif final_score >= 75:
-            feedback = f"Tốt! Cần điều chỉnh: {', '.join(issues)} ⚠️"
-        elif final_score >= 60:
-            feedback = f"Cần cải thiện: {', '.join(issues)} ⚠️"
-        else:
-            feedback = f"Chưa đúng tư thế. Kiểm tra: {', '.join(issues)} ❌"
-        
-        return final_score, feedback
-    
-    def _evaluate_goddess(self, kp):
+            return (0, UNKNOWN_FEEDBACK, ()) if return_issues else (0, UNKNOWN_FEEDBACK)
+
+        evaluated = self.evaluate_batch([pose_name], np.asarray(keypoints)[None], return_issues)
+        return (int(evaluated[0][0]),) + tuple(column[0] for column in evaluated[1:])
+
+    def evaluate_batch(self, pose_names, keypoints, return_issues=False):
         """
-        Goddess: Đánh giá 2 tiêu chí
-        1. Chân squat (70%)
-        2. Tay giơ vuông góc (30%)
+        Evaluate N frames (or persons) in one vectorized pass.
+
+        Args:
+            pose_names: List/array of N pose names, or a single name for all frames
+            keypoints: Array (N, 17, 2) or (N, 17, 3) of pixel keypoints
+            return_issues: Also return the failed criteria of each frame
+
+        Returns:
+            tuple: (scores, feedbacks), or (scores, feedbacks, issues)
+                scores: int array (N,) of 0-100 scores
+                feedbacks: List of N feedback messages
+                issues: List of N tuples of issue names
         """
-        scores = []
-        issues = []
-        
-        # 1. Chân squat (70%)
-        angle_left = self.geo.calculate_angle(kp[11], kp[13], kp[15])
-        angle_right = self.geo.calculate_angle(kp[12], kp[14], kp[16])
-        avg_angle = (angle_left + angle_right) / 2
-        
-        if 70 <= avg_angle <= 140:
-            scores.append(100)
-        elif 60 <= avg_angle <= 150:
-            scores.append(85)
-            issues.append("độ squat điều chỉnh nhẹ")
-        elif 50 <= avg_angle <= 160:
-            scores.append(70)
-            issues.append("squat sâu hơn")
-        else:
-            scores.append(50)
-            issues.append("gối cần ở 90°")
-        
-        
-        # 2. Tay giơ vuông góc (30%) - CHECK Y POSITION!
-        # Kiểm tra cổ tay có CAO HƠN vai không (tay giơ lên)
-        shoulder_y_left = kp[5][1]
-        shoulder_y_right = kp[6][1]
-        wrist_y_left = kp[9][1]
-        wrist_y_right = kp[10][1]
-        
-        avg_shoulder_y = (shoulder_y_left + shoulder_y_right) / 2
-        avg_wrist_y = (wrist_y_left + wrist_y_right) / 2
-        
-        # Y axis: smaller = higher. Wrist should be ABOVE shoulder
-        wrist_lift = avg_shoulder_y - avg_wrist_y  # Positive = wrist above shoulder
-        
-        # Also check elbow straightness (arms should be straight when raised)
-        left_elbow_angle = self.geo.calculate_angle(kp[5], kp[7], kp[9])
-        right_elbow_angle = self.geo.calculate_angle(kp[6], kp[8], kp[10])
-        avg_elbow = (left_elbow_angle + right_elbow_angle) / 2
-        
-        if wrist_lift > 20 and avg_elbow >= 140:  # Tay giơ cao + thẳng (ngang vai trở lên)
-            scores.append(100)
-        elif wrist_lift > 10 and avg_elbow >= 120:  # Tay giơ gần ngang vai
-            scores.append(85)
-            issues.append("tay chưa giơ đủ cao")
-        elif wrist_lift > 0:  # Tay hơi cao hơn vai
-            scores.append(60)
-            issues.append("cần giơ tay cao hơn")
-        else:  # Tay KHÔNG cao hơn vai = không giơ!
-            scores.append(0)  # 0 điểm!
-            issues.append("tay phải giơ lên vuông góc")
-        
-        # Tính điểm: 70% chân + 30% tay
-        final_score = int(scores[0] * 0.7 + scores[1] * 0.3)
-        
-        if final_score >= 90:
-            feedback = "Hoàn hảo! Tư thế Goddess chuẩn ✅"
-        elif final_score >= 75:
-            feedback = f"Tốt! Cần điều chỉnh: {', '.join(issues)} ⚠️"
-        elif final_score >= 60:
-            feedback = f"Cần cải thiện: {', '.join(issues)} ⚠️"
-        else:
-            feedback = f"Chưa đúng tư thế. Kiểm tra: {', '.join(issues)} ❌"
-        
-        return final_score, feedback
-    
-    def _evaluate_downdog(self, kp):
+        points = np.asarray(keypoints, dtype=np.float64)
+        if points.ndim != 3 or points.shape[1] != 17:
+            raise ValueError(f"Expected keypoints of shape (N, 17, 2|3), got {points.shape}")
+
+        n = len(points)
+        if isinstance(pose_names, str):
+            pose_names = [pose_names] * n
+        pose_names = np.asarray(pose_names, dtype=object)
+        if len(pose_names) != n:
+            raise ValueError(f"Got {len(pose_names)} pose names for {n} frames")
+
+        scores = np.zeros(n, dtype=np.int64)
+        feedbacks = [UNKNOWN_FEEDBACK] * n
+        issues = [()] * n
+
+        for pose_name, compiled in self._compiled.items():
+            rows = np.flatnonzero(pose_names == pose_name)
+            if len(rows) == 0:
+                continue
+
+            pose_scores, pose_feedbacks, pose_issues = self._score(compiled, points[rows])
+            scores[rows] = pose_scores
+            for row, feedback, issue in zip(rows.tolist(), pose_feedbacks, pose_issues):
+                feedbacks[row] = feedback
+                issues[row] = issue
+
+        if return_issues:
+            return scores, feedbacks, issues
+        return scores, feedbacks
+
+    def evaluate_multi(self, pose_names, keypoints):
         """
-        Downdog: Đánh giá 3 tiêu chí
-        1. Chân thẳng (40%)
-        2. Tay thẳng (30%)
-        3. Hông gập chữ V (30%)
+        Evaluate several persons detected in the same frame.
+
+        Args:
+            pose_names: List of P pose names (one per person)
+            keypoints: Array (P, 17, 2) or (P, 17, 3) of pixel keypoints
+
+        Returns:
+            list: P tuples of (score, feedback_message)
         """
-        scores = []
-        issues = []
-        
-        # 1. Chân thẳng (40%)
-        angle_left_leg = self.geo.calculate_angle(kp[11], kp[13], kp[15])
-        angle_right_leg = self.geo.calculate_angle(kp[12], kp[14], kp[16])
-        avg_leg = (angle_left_leg + angle_right_leg) / 2
-        
-        if avg_leg >= 165:
-            scores.append(100)
-        elif avg_leg >= 155:
-            scores.append(85)
-            issues.append("chân hơi cong")
-        elif avg_leg >= 145:
-            scores.append(70)
-            issues.append("duỗi chân thẳng hơn")
-        else:
-            scores.append(50)
-            issues.append("chân cần thẳng")
-        
-        # 2. Tay thẳng (30%)
-        left_arm = self.geo.calculate_angle(kp[5], kp[7], kp[9])
-        right_arm = self.geo.calculate_angle(kp[6], kp[8], kp[10])
-        avg_arm = (left_arm + right_arm) / 2
-        
-        if avg_arm >= 160:
-            scores.append(100)
-        elif avg_arm >= 145:
-            scores.append(80)
-            issues.append("tay hơi cong")
-        else:
-            scores.append(60)
-            issues.append("duỗi tay thẳng")
-        
-        # 3. Hông gập (chữ V) (30%)
-        hip_angle = self.geo.calculate_angle(kp[5], kp[11], kp[13])
-        
-        if 70 <= hip_angle <= 110:
-            scores.append(100)
-        elif 60 <= hip_angle <= 120:
-            scores.append(80)
-            issues.append("hông điều chỉnh nhẹ")
-        else:
-            scores.append(60)
-            issues.append("nâng hông lên cao hơn")
-        
-        # Tính điểm: 40% + 30% + 30%
-        final_score = int(scores[0] * 0.4 + scores[1] * 0.3 + scores[2] * 0.3)
-        
-        if final_score >= 90:
-            feedback = "Tuyệt vời! Tư thế Downdog hoàn hảo ✅"
-        elif final_score >= 75:
-            feedback = f"Tốt! Cần điều chỉnh: {', '.join(issues)} ⚠️"
-        elif final_score >= 60:
-            feedback = f"Cần cải thiện: {', '.join(issues)} ⚠️"
-        else:
-            feedback = f"Chưa đúng tư thế. Kiểm tra: {', '.join(issues)} ❌"
-        
-        return final_score, feedback
+        if len(keypoints) == 0:
+            return []
+
+        scores, feedbacks = self.evaluate_batch(pose_names, keypoints)
+        return list(zip(scores.tolist(), feedbacks))
+
+    def _score(self, compiled, points):
+        """Score a batch that all shares the same pose rule."""
+        values = self.compute_features(points)
+        n = len(points)
+
+        weighted = np.zeros(n)
+        issue_columns = []
+
+        for criterion in compiled['criteria']:
+            # Dải đầu tiên thỏa mãn thắng (giống if/elif); dòng cuối = default
+            matches = np.ones((len(criterion['bands']) + 1, n), dtype=bool)
+            for b, (conditions, _, _) in enumerate(criterion['bands']):
+                for feature, op, threshold in conditions:
+                    matches[b] &= _COMPARE_OPS[op](values[feature], threshold)
+            band = matches.argmax(axis=0)
+
+            weighted = weighted + criterion['scores'][band] * criterion['weight']
+            issue_columns.append([criterion['issues'][i] for i in band.tolist()])
+
+        final_scores = (weighted / compiled['total_weight']).astype(np.int64)
+
+        feedbacks, frame_issues = [], []
+        for score, issues in zip(final_scores.tolist(), zip(*issue_columns)):
+            feedbacks.append(self._feedback(compiled['perfect'], score, issues))
+            frame_issues.append(tuple(i for i in issues if i))
+
+        return final_scores, feedbacks, frame_issues
 
+    @staticmethod
+    def _feedback(perfect, score, issues):
+        """Build feedback message from score tier and issue list."""
+        for min_score, template in FEEDBACK_TIERS:
+            if score >= min_score:
+                if template is None:
+                    return perfect
+                return template.format(issues=', '.join(i for i in issues if i))
+        return perfect
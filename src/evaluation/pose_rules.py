@@ -0,0 +1,205 @@
+"""
+Pose Rules - Tiêu chí chấm điểm dạng dữ liệu.
+
+Mỗi tư thế gồm nhiều tiêu chí; mỗi tiêu chí có trọng số, danh sách
+các dải ngưỡng (xét theo thứ tự, dải đầu tiên thỏa mãn được chọn - giống
+if/elif) và điểm/lỗi mặc định. PoseEvaluator biên dịch bảng này thành
+các phép toán NumPy để chấm cả batch frame một lần.
+
+Thêm tư thế mới = thêm một entry vào POSE_RULES (không cần viết method).
+"""
+
+
+# Đặc trưng dẫn xuất: name -> (op, *operands)
+# Operand là tên đặc trưng của PoseGeometry (góc/khoảng cách), tên đặc trưng
+# đã định nghĩa phía trên, hoặc chỉ số keypoint (op 'y').
+#   mean/max/min/sub/absdiff: phép toán trên 2 đặc trưng
+#   scale: đặc trưng × hằng số
+#   y: trung bình tọa độ y của các keypoint
+FEATURES = {
+    'arm_angle': ('mean', 'left_elbow', 'right_elbow'),           # Vai - Khuỷu - Cổ tay
+    'leg_angle': ('mean', 'left_knee', 'right_knee'),             # Hông - Gối - Mắt cá
+    'straight_leg': ('max', 'left_knee', 'right_knee'),
+    'bent_leg': ('min', 'left_knee', 'right_knee'),
+    'arm_spread': ('mean', 'left_shoulder', 'right_shoulder'),    # Vai kia - Vai - Khuỷu
+
+    # Y axis: nhỏ hơn = cao hơn
+    'shoulder_y': ('y', 5, 6),
+    'elbow_y': ('y', 7, 8),
+    'wrist_y': ('y', 9, 10),
+    'wrist_lift': ('sub', 'shoulder_y', 'wrist_y'),               # Dương = cổ tay trên vai
+    'elbow_wrist_gap': ('absdiff', 'elbow_y', 'wrist_y'),         # Nhỏ = elbow plank
+    'elbow_drop': ('sub', 'elbow_y', 'shoulder_y'),
+    'wrist_drop': ('sub', 'wrist_y', 'shoulder_y'),
+    'support_drop': ('max', 'elbow_drop', 'wrist_drop'),          # > 50 = đang chống tay
+
+    # Cổ tay gần nhau (< 50% vai) ⇔ wrist_gap < 0
+    'half_shoulder_width': ('scale', 'shoulders', 0.5),
+    'wrist_gap': ('sub', 'wrists', 'half_shoulder_width'),
+}
+
+
+# Nhận xét theo mức điểm: (điểm tối thiểu, mẫu câu). None = dùng câu 'perfect' của tư thế
+FEEDBACK_TIERS = [
+    (90, None),
+    (75, "Tốt! Cần điều chỉnh: {issues} ⚠️"),
+    (60, "Cần cải thiện: {issues} ⚠️"),
+    (0, "Chưa đúng tư thế. Kiểm tra: {issues} ❌"),
+]
+
+UNKNOWN_FEEDBACK = "Không xác định được tư thế chuẩn"
+
+
+# Band: ([(feature, op, value), ...], score, issue) - các điều kiện AND với nhau
+POSE_RULES = {
+    'Plank': {
+        'perfect': "Tuyệt vời! Tư thế Plank hoàn hảo ✅",
+        'criteria': [
+            {
+                # 1. Thân thẳng (60%) - Plank CHUẨN: 160-175° (hông hơi cao hơn thẳng tuyệt đối)
+                'weight': 0.6,
+                'bands': [
+                    ([('left_hip', '>=', 160), ('left_hip', '<=', 175)], 100, None),
+                    ([('left_hip', '>', 175), ('left_hip', '<=', 180)], 85, "hông cần cao hơn chút"),
+                    ([('left_hip', '>=', 150), ('left_hip', '<', 160)], 85, "hông hơi cao"),
+                ],
+                'default': (70, "hông quá cao"),
+            },
+            {
+                # 2. Tay chống (40%) - straight-arm plank HOẶC elbow plank, phải đang chống
+                'weight': 0.4,
+                'bands': [
+                    ([('arm_angle', '>=', 160), ('support_drop', '>', 50)], 100, None),
+                    ([('elbow_wrist_gap', '<', 30), ('support_drop', '>', 50)], 100, None),
+                    ([('arm_angle', '>=', 145), ('support_drop', '>', 50)], 85, "tay hơi cong"),
+                    ([('support_drop', '>', 50)], 75, "duỗi tay thẳng hơn"),
+                ],
+                'default': (30, "cần nâng người lên bằng tay"),  # Nằm sấp
+            },
+        ],
+    },
+    'Tree': {
+        'perfect': "Hoàn hảo! Tư thế Tree chuẩn ✅",
+        'criteria': [
+            {
+                # 1. Chân đứng thẳng (relaxed từ 165° do ankle detection variance)
+                'weight': 1,
+                'bands': [
+                    ([('straight_leg', '>=', 155)], 100, None),
+                    ([('straight_leg', '>=', 145)], 85, "chân đứng hơi cong"),
+                ],
+                'default': (70, "chân đứng cong quá"),
+            },
+            {
+                # 2. Chân kia gập vào
+                'weight': 1,
+                'bands': [
+                    ([('bent_leg', '<', 120)], 100, None),
+                    ([('bent_leg', '<', 140)], 70, "chân gập chưa đủ"),
+                ],
+                'default': (30, "chân kia chưa gập vào"),
+            },
+            {
+                # 3. Tay chắp/giơ cao - góc khuỷu VÀ khoảng cách 2 cổ tay
+                'weight': 1,
+                'bands': [
+                    ([('arm_angle', '<', 100), ('wrist_gap', '<', 0)], 100, None),
+                    ([('arm_angle', '<', 130), ('wrist_gap', '<', 0)], 80, "tay chưa giơ cao đủ"),
+                    ([('arm_angle', '<', 100)], 50, "tay cần chắp lại"),
+                ],
+                'default': (30, "tay cần chắp/giơ cao"),
+            },
+        ],
+    },
+    'Warrior2': {
+        'perfect': "Tuyệt vời! Tư thế Warrior2 hoàn hảo ✅",
+        'criteria': [
+            {
+                # 1. Chân trước gập (40%)
+                'weight': 0.4,
+                'bands': [
+                    ([('bent_leg', '>=', 80), ('bent_leg', '<=', 125)], 100, None),
+                    ([('bent_leg', '>=', 70), ('bent_leg', '<=', 135)], 85, "góc chân trước điều chỉnh nhẹ"),
+                    ([('bent_leg', '>=', 60), ('bent_leg', '<=', 145)], 70, "chân trước cần gập hơn"),
+                ],
+                'default': (50, "chân trước chưa đúng"),
+            },
+            {
+                # 2. Chân sau thẳng (30%)
+                'weight': 0.3,
+                'bands': [
+                    ([('straight_leg', '>=', 155)], 100, None),
+                    ([('straight_leg', '>=', 145)], 80, "chân sau hơi cong"),
+                ],
+                'default': (60, "duỗi chân sau thẳng"),
+            },
+            {
+                # 3. Tay dang ngang (30%)
+                'weight': 0.3,
+                'bands': [
+                    ([('arm_spread', '>=', 150)], 100, None),
+                    ([('arm_spread', '>=', 130)], 75, "tay chưa dang thẳng ngang"),
+                ],
+                'default': (50, "cần dang tay ra 2 bên"),
+            },
+        ],
+    },
+    'Goddess': {
+        'perfect': "Hoàn hảo! Tư thế Goddess chuẩn ✅",
+        'criteria': [
+            {
+                # 1. Chân squat (70%)
+                'weight': 0.7,
+                'bands': [
+                    ([('leg_angle', '>=', 70), ('leg_angle', '<=', 140)], 100, None),
+                    ([('leg_angle', '>=', 60), ('leg_angle', '<=', 150)], 85, "độ squat điều chỉnh nhẹ"),
+                    ([('leg_angle', '>=', 50), ('leg_angle', '<=', 160)], 70, "squat sâu hơn"),
+                ],
+                'default': (50, "gối cần ở 90°"),
+            },
+            {
+                # 2. Tay giơ vuông góc (30%) - CHECK Y POSITION (cổ tay CAO HƠN vai) + tay thẳng
+                'weight': 0.3,
+                'bands': [
+                    ([('wrist_lift', '>', 20), ('arm_angle', '>=', 140)], 100, None),
+                    ([('wrist_lift', '>', 10), ('arm_angle', '>=', 120)], 85, "tay chưa giơ đủ cao"),
+                    ([('wrist_lift', '>', 0)], 60, "cần giơ tay cao hơn"),
+                ],
+                'default': (0, "tay phải giơ lên vuông góc"),  # Tay KHÔNG cao hơn vai
+            },
+        ],
+    },
+    'Downdog': {
+        'perfect': "Tuyệt vời! Tư thế Downdog hoàn hảo ✅",
+        'criteria': [
+            {
+                # 1. Chân thẳng (40%)
+                'weight': 0.4,
+                'bands': [
+                    ([('leg_angle', '>=', 165)], 100, None),
+                    ([('leg_angle', '>=', 155)], 85, "chân hơi cong"),
+                    ([('leg_angle', '>=', 145)], 70, "duỗi chân thẳng hơn"),
+                ],
+                'default': (50, "chân cần thẳng"),
+            },
+            {
+                # 2. Tay thẳng (30%)
+                'weight': 0.3,
+                'bands': [
+                    ([('arm_angle', '>=', 160)], 100, None),
+                    ([('arm_angle', '>=', 145)], 80, "tay hơi cong"),
+                ],
+                'default': (60, "duỗi tay thẳng"),
+            },
+            {
+                # 3. Hông gập chữ V (30%)
+                'weight': 0.3,
+                'bands': [
+                    ([('left_hip', '>=', 70), ('left_hip', '<=', 110)], 100, None),
+                    ([('left_hip', '>=', 60), ('left_hip', '<=', 120)], 80, "hông điều chỉnh nhẹ"),
+                ],
+                'default': (60, "nâng hông lên cao hơn"),
+            },
+        ],
+    },
+}
@@ -3,5 +3,6 @@ Geometry module - Minimal geometric calculations for pose evaluation.
 """
 
 from .geometry_utils import GeometryUtils
+from .pose_geometry import PoseGeometry, ANGLE_TRIPLETS, DISTANCE_PAIRS
 
-__all__ = ['GeometryUtils']
+__all__ = ['GeometryUtils', 'PoseGeometry', 'ANGLE_TRIPLETS', 'DISTANCE_PAIRS']
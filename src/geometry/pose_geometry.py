@@ -0,0 +1,134 @@
+"""
+Pose Geometry - Vectorized angle & distance engine.
+
+Tính toàn bộ góc khớp và khoảng cách của một (hoặc N) bộ keypoints
+trong một lần tính NumPy, dựa trên bảng bộ ba khớp cố định.
+"""
+
+import numpy as np
+
+
+# Điểm ảo (trung điểm) được nối thêm sau 17 keypoints COCO
+MIDPOINTS = {
+    'mid_shoulder': (5, 6),   # index 17
+    'mid_hip': (11, 12),      # index 18
+    'mid_knee': (13, 14),     # index 19
+}
+MID_SHOULDER, MID_HIP, MID_KNEE = 17, 18, 19
+
+# Bộ ba khớp (a, b, c) - góc tại đỉnh b
+ANGLE_TRIPLETS = {
+    'left_elbow': (5, 7, 9),          # Vai - Khuỷu - Cổ tay
+    'right_elbow': (6, 8, 10),
+    'left_shoulder': (6, 5, 7),       # Vai phải - Vai trái - Khuỷu (tay dang ngang)
+    'right_shoulder': (5, 6, 8),
+    'left_hip': (5, 11, 13),          # Vai - Hông - Gối
+    'right_hip': (6, 12, 14),
+    'left_knee': (11, 13, 15),        # Hông - Gối - Mắt cá
+    'right_knee': (12, 14, 16),
+    'center_hip': (MID_SHOULDER, MID_HIP, MID_KNEE),  # Góc hông dùng trung điểm 2 bên
+}
+
+# Cặp khớp (a, b) - khoảng cách Euclidean
+DISTANCE_PAIRS = {
+    'wrists': (9, 10),
+    'shoulders': (5, 6),
+    'hips': (11, 12),
+    'ankles': (15, 16),
+}
+
+
+class PoseGeometry:
+    """
+    Vectorized geometry over keypoint arrays.
+
+    Accepts keypoints of shape (17, 2|3) or (N, 17, 2|3) and returns all
+    configured angles/distances at once (shape () or (N,) per entry).
+
+    Example:
+        >>> geometry = PoseGeometry()
+        >>> features = geometry.compute(keypoints)        # (17, 2)
+        >>> features['left_knee']                         # degrees
+        >>> angles = geometry.angles(batch)               # (N, 9)
+    """
+
+    def __init__(self, triplets: dict = None, pairs: dict = None, eps: float = 1e-6):
+        """
+        Args:
+            triplets: {name: (a, b, c)} joint triplets (default: ANGLE_TRIPLETS)
+            pairs: {name: (a, b)} joint pairs (default: DISTANCE_PAIRS)
+            eps: Added to the norm product, same as GeometryUtils.calculate_angle.
+                 Use 0 to get NaN for degenerate (zero-length) limbs
+        """
+        triplets = triplets or ANGLE_TRIPLETS
+        pairs = pairs or DISTANCE_PAIRS
+        self.eps = eps
+
+        self.angle_names = list(triplets)
+        self.distance_names = list(pairs)
+        self._triplets = np.array(list(triplets.values()), dtype=np.intp)  # (T, 3)
+        self._pairs = np.array(list(pairs.values()), dtype=np.intp)        # (D, 2)
+        self._midpoints = np.array(list(MIDPOINTS.values()), dtype=np.intp)
+
+    def extend(self, keypoints) -> np.ndarray:
+        """
+        Chuẩn hóa input và nối thêm các trung điểm.
+
+        Returns:
+            Array (..., 20, 2) float64
+        """
+        points = np.asarray(keypoints, dtype=np.float64)[..., :2]
+        mids = points[..., self._midpoints, :].sum(axis=-2) / 2
+        return np.concatenate([points, mids], axis=-2)
+
+    def angles(self, keypoints, eps: float = None) -> np.ndarray:
+        """
+        Tính tất cả góc trong bảng triplets.
+
+        Args:
+            keypoints: Array (17, 2|3) or (N, 17, 2|3)
+            eps: Override default eps
+
+        Returns:
+            Array (..., T) of angles in degrees (0-180)
+        """
+        eps = self.eps if eps is None else eps
+        points = self.extend(keypoints)
+
+        a = points[..., self._triplets[:, 0], :]
+        b = points[..., self._triplets[:, 1], :]
+        c = points[..., self._triplets[:, 2], :]
+        v1 = a - b
+        v2 = c - b
+
+        dot = (v1 * v2).sum(axis=-1)
+        norms = np.sqrt((v1 * v1).sum(axis=-1)) * np.sqrt((v2 * v2).sum(axis=-1))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            cos_angle = np.clip(dot / (norms + eps), -1.0, 1.0)
+        return np.degrees(np.arccos(cos_angle))
+
+    def distances(self, keypoints) -> np.ndarray:
+        """
+        Tính tất cả khoảng cách trong bảng pairs.
+
+        Returns:
+            Array (..., D) of Euclidean distances
+        """
+        points = self.extend(keypoints)
+        delta = points[..., self._pairs[:, 0], :] - points[..., self._pairs[:, 1], :]
+        return np.sqrt((delta * delta).sum(axis=-1))
+
+    def compute(self, keypoints, eps: float = None) -> dict:
+        """
+        Tính góc + khoảng cách, trả về theo tên.
+
+        Returns:
+            dict {name: array of shape () or (N,)}
+        """
+        angles = self.angles(keypoints, eps)
+        distances = self.distances(keypoints)
+
+        features = {name: angles[..., i] for i, name in enumerate(self.angle_names)}
+        features.update({name: distances[..., i] for i, name in enumerate(self.distance_names)})
+        return features
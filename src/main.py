@@ -11,18 +11,20 @@ Simple Pipeline:
    - Score pose (Geometric Analysis)
    - Visualize results
 5. Save output
+
+Runs headless (no display needed), e.g. for batch jobs on servers.
 """
 
 import cv2
+import sys
 import argparse
-import numpy as np
 from pathlib import Path
 
-# TODO: Import modules after refactoring
-# from detection import PoseDetector
-# from recognition import MLPoseClassifier
-# from evaluation import PoseEvaluator
-# from visualization import SkeletonDrawer, OverlayUI
+from config.app_config import APP_CONFIG
+from pipeline import VideoPipeline, ResultsWriter, BatchRunner, ResultCache, analyze_image, cache_version
+from pipeline.batch_runner import IMAGE_EXTENSIONS, VIDEO_EXTENSIONS, collect_inputs
+from pipeline.rescore import rescore_videos
+from streaming.session_stats import format_summary
 
 
 def parse_arguments():
@@ -30,96 +32,351 @@ def parse_arguments():
     parser = argparse.ArgumentParser(
         description='Yoga Pose Recognition & Evaluation System'
     )
-    
+
     parser.add_argument(
         '--input',
         type=str,
         required=True,
-        help='Path to input image or video file'
+        help='Path to input image/video file, or a directory / glob for batch mode'
     )
-    
+
     parser.add_argument(
         '--output',
         type=str,
-        help='Path to save output (optional)'
+        help='Path to save output (optional; batch mode: output directory)'
     )
-    
+
     parser.add_argument(
         '--model',
         type=str,
         default='yolov8m-pose.pt',
         help='YOLOv8 pose model (default: yolov8m-pose.pt)'
     )
-    
+
+    parser.add_argument(
+        '--classifier',
+        type=str,
+        default=APP_CONFIG['ml_classifier_path'],
+        help=f"Pose classifier weights (default: {APP_CONFIG['ml_classifier_path']})"
+    )
+
+    parser.add_argument(
+        '--backend',
+        choices=['torch', 'numpy'],
+        default=APP_CONFIG['classifier_backend'],
+        help='Classifier backend (default: %(default)s)'
+    )
+
+    parser.add_argument(
+        '--results',
+        type=str,
+        help='Save per-frame results as .csv or .json (default for video: next to --output; '
+             'batch mode: "csv" or "json" format per file)'
+    )
+
+    parser.add_argument(
+        '--no-viz',
+        action='store_true',
+        help='Do not draw skeleton/scoreboard on the output'
+    )
+
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=4,
+        help='Max video frames per YOLOv8 call (default: 4)'
+    )
+
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=None,
+        help='Batch mode: worker processes (default: CPU count)'
+    )
+
+    parser.add_argument(
+        '--no-resume',
+        action='store_true',
+        help='Batch mode: ignore manifest.jsonl and reprocess every file'
+    )
+
+    parser.add_argument(
+        '--cache-dir',
+        type=str,
+        default=APP_CONFIG['result_cache_dir'],
+        help='Image result cache (content hash → keypoints/score) (default: %(default)s)'
+    )
+
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Always run the models (do not read/write the result cache or keypoint store)'
+    )
+
+    parser.add_argument(
+        '--keypoint-dir',
+        type=str,
+        default=APP_CONFIG['keypoint_store_dir'],
+        help='Per-video keypoint store; re-running a video skips YOLOv8 (default: %(default)s)'
+    )
+
+    parser.add_argument(
+        '--rescore',
+        action='store_true',
+        help='Re-run recognition + scoring on stored keypoints only (no YOLOv8); '
+             'with --output <video> also re-render the skeleton/scoreboard'
+    )
+
     return parser.parse_args()
 
 
-def process_image(image_path, detector, classifier, evaluator):
+def load_models(args, detector=True):
+    """
+    Load detector, recognizer and evaluator (+ drawers unless --no-viz).
+
+    Args:
+        args: Parsed arguments
+        detector: False = skip YOLOv8 (rescore from stored keypoints)
+
+    Returns:
+        tuple: (detector or None, recognizer, evaluator, drawer, overlay)
+    """
+    from detection import PoseDetector
+    from recognition import PoseRecognizer
+    from evaluation import PoseEvaluator
+    from visualization import SkeletonDrawer, OverlayUI
+
+    if detector:
+        detector = PoseDetector(args.model, confidence_threshold=APP_CONFIG['confidence_threshold'])
+        # Frame đầu tiên không phải trả chi phí khởi tạo của YOLOv8
+        detector.warmup([(APP_CONFIG['process_height'], APP_CONFIG['process_width'])],
+                        runs=APP_CONFIG['warmup_runs'])
+    else:
+        detector = None
+    recognizer = PoseRecognizer(args.classifier, backend=args.backend)
+    recognizer.warmup([(1, 34), (args.batch_size, 34)], runs=APP_CONFIG['warmup_runs'])
+    evaluator = PoseEvaluator()
+
+    if args.no_viz:
+        return detector, recognizer, evaluator, None, None
+    return detector, recognizer, evaluator, SkeletonDrawer(), OverlayUI()
+
+
+def open_cache(args):
+    """Image result cache for this model/config, or None with --no-cache."""
+    if args.no_cache:
+        return None
+    version = cache_version(args.model, args.classifier, args.backend)
+    return ResultCache(args.cache_dir, version, max_bytes=APP_CONFIG['result_cache_mb'] * 1024 * 1024)
+
+
+def process_image(image_path, detector, classifier, evaluator, drawer=None, overlay=None, cache=None):
     """
     Process a single image.
-    
+
     Args:
         image_path: Path to image file
         detector: YOLOv8 pose detector
-        classifier: ML pose classifier
+        classifier: Pose recognizer (PoseRecognizer)
         evaluator: Pose evaluator for scoring
-    
+        drawer: Optional SkeletonDrawer (None = no skeleton)
+        overlay: Optional OverlayUI (None = no scoreboard)
+        cache: Optional ResultCache (hit = no model call)
+
     Returns:
         processed_image: Image with visualization
         pose_name: Detected pose name
+        confidence: Classifier confidence 0-1
         score: Score 0-100
         feedback: Feedback message
     """
-    # TODO: Implement
-    pass
+    image = cv2.imread(str(image_path))
+    if image is None:
+        raise IOError(f"Cannot read image: {image_path}")
+
+    frame, _, (pose_name, confidence, score, feedback) = analyze_image(
+        image, detector, classifier, evaluator, drawer, overlay,
+        cache=cache, cache_key=cache.key_for_file(image_path) if cache is not None else None
+    )
+    return frame, pose_name, confidence, score, feedback
 
 
-def process_video(video_path, detector, classifier, evaluator, output_path=None):
+def process_video(video_path, detector, classifier, evaluator, output_path=None,
+                  results_path=None, drawer=None, overlay=None, batch_size=4, keypoint_dir=None):
     """
     Process a video file.
-    
+
     Args:
         video_path: Path to video file
         detector: YOLOv8 pose detector
-        classifier: ML pose classifier
+        classifier: Pose recognizer (PoseRecognizer)
         evaluator: Pose evaluator for scoring
         output_path: Optional path to save output video
-    
+        results_path: Optional path to save per-frame results (.csv / .json)
+        drawer: Optional SkeletonDrawer
+        overlay: Optional OverlayUI
+        batch_size: Max frames per YOLOv8 call
+        keypoint_dir: Optional KeypointStore directory (read if complete, else write)
+
     Returns:
-        None
+        dict: Summary (frames, detected, elapsed, fps, session, keypoints)
     """
-    # TODO: Implement
-    pass
+    pipeline = VideoPipeline(detector, classifier, evaluator, drawer, overlay,
+                             batch_size=batch_size, keypoint_dir=keypoint_dir)
+    return pipeline.run(video_path, output_path, results_path)
+
+
+def process_batch(args):
+    """
+    Process a directory / glob of files with a worker pool.
+
+    Returns:
+        int: Exit code (0 = all files done)
+    """
+    results_format = 'csv' if args.results == 'csv' else 'json'
+    runner = BatchRunner(
+        args.output or 'results/batch',
+        model_path=args.model,
+        classifier_path=args.classifier,
+        backend=args.backend,
+        workers=args.workers,
+        visualize=not args.no_viz,
+        results_format=results_format,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        keypoint_dir=None if args.no_cache else args.keypoint_dir,
+        batch_size=args.batch_size,
+    )
+
+    try:
+        summary = runner.run(args.input, resume=not args.no_resume)
+    except FileNotFoundError as e:
+        print(f"Error: {e}")
+        return 1
+
+    print(f"   Done: {summary['done']}, failed: {summary['failed']}, skipped: {summary['skipped']}")
+    print(f"   Time: {summary['elapsed']:.1f}s")
+    print(f"   Manifest: {runner.manifest_path}")
+    return 1 if summary['failed'] else 0
+
+
+def rescore(args):
+    """
+    Re-score videos from their keypoint stores (recognizer + evaluator only).
+
+    Một video + --output: vẽ lại video (decode, không YOLOv8). Còn lại: chỉ
+    chấm điểm lại, ghi <output>/<tên file>.json|csv + .summary.json cho từng
+    video (giữ cả đuôi: a.mp4 → a.mp4.json, giống chế độ batch).
+
+    Returns:
+        int: Exit code (0 = every video had a complete store)
+    """
+    input_path = Path(args.input)
+    if input_path.is_dir() or any(c in args.input for c in '*?['):
+        videos = [p for p in collect_inputs(args.input) if p.suffix.lower() in VIDEO_EXTENSIONS]
+    else:
+        videos = [input_path] if input_path.suffix.lower() in VIDEO_EXTENSIONS else []
+    if not videos:
+        print(f"Error: No videos found for: {args.input}")
+        return 1
+
+    _, recognizer, evaluator, drawer, overlay = load_models(args, detector=False)
+
+    if len(videos) == 1 and args.output and not input_path.is_dir():
+        results_path = args.results or str(Path(args.output).with_suffix('.json'))
+        pipeline = VideoPipeline(None, recognizer, evaluator, drawer, overlay,
+                                 batch_size=args.batch_size, keypoint_dir=args.keypoint_dir,
+                                 model_path=args.model)
+        try:
+            summary = pipeline.run(str(input_path), args.output, results_path)
+        except FileNotFoundError as e:
+            print(f"Error: {e}")
+            return 1
+        print(f"   Re-rendered: {args.output} ({summary['fps']:.1f} FPS)")
+        print(f"   Summary: {ResultsWriter.write_summary(results_path, summary['session'])}")
+        print(format_summary(summary['session']))
+        return 0
+
+    print(f"♻️  Rescoring {len(videos)} videos from stored keypoints")
+    summary = rescore_videos(
+        videos, recognizer, evaluator, args.model,
+        output_dir=args.output or 'results/rescore',
+        keypoint_dir=args.keypoint_dir,
+        results_format='csv' if args.results == 'csv' else 'json',
+    )
+    print(f"   Done: {summary['done']}, missing keypoints: {len(summary['missing'])}")
+    print(f"   Frames: {summary['frames']} in {summary['elapsed']:.1f}s")
+    return 1 if summary['missing'] else 0
 
 
 def main():
     """Main function."""
     args = parse_arguments()
-    
-    # Check input type
+
+    if args.rescore:
+        return rescore(args)
+
+    # Directory hoặc glob → batch mode
     input_path = Path(args.input)
+    if input_path.is_dir() or any(c in args.input for c in '*?['):
+        return process_batch(args)
+
+    # Check input type
     if not input_path.exists():
         print(f"Error: Input file not found: {args.input}")
-        return
-    
+        return 1
+
     # Determine if input is image or video
-    image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.webp'}
-    video_extensions = {'.mp4', '.avi', '.mov', '.mkv'}
-    
     ext = input_path.suffix.lower()
-    
-    if ext in image_extensions:
+    if ext not in IMAGE_EXTENSIONS and ext not in VIDEO_EXTENSIONS:
+        print(f"Error: Unsupported file format: {ext}")
+        return 1
+
+    detector, recognizer, evaluator, drawer, overlay = load_models(args)
+
+    if ext in IMAGE_EXTENSIONS:
         print(f"Processing image: {input_path}")
-        # TODO: process_image()
-    elif ext in video_extensions:
-        print(f"Processing video: {input_path}")
-        # TODO: process_video()
+        frame, pose_name, confidence, score, feedback = process_image(
+            input_path, detector, recognizer, evaluator, drawer, overlay, cache=open_cache(args)
+        )
+        print(f"   Pose: {pose_name}")
+        print(f"   Score: {score}/100")
+        print(f"   Feedback: {feedback}")
+
+        if args.output:
+            Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+            cv2.imwrite(args.output, frame)
+            print(f"   Saved: {args.output}")
+        if args.results:
+            with ResultsWriter(args.results) as writer:
+                writer.write({'frame': 0, 'time': 0.0, 'pose': pose_name,
+                              'confidence': round(float(confidence), 4), 'score': score, 'feedback': feedback})
     else:
-        print(f"Error: Unsupported file format: {ext}")
-        return
-    
+        print(f"Processing video: {input_path}")
+        results_path = args.results
+        if results_path is None and args.output:
+            results_path = str(Path(args.output).with_suffix('.json'))
+
+        summary = process_video(
+            input_path, detector, recognizer, evaluator,
+            output_path=args.output, results_path=results_path,
+            drawer=drawer, overlay=overlay, batch_size=args.batch_size,
+            keypoint_dir=None if args.no_cache else args.keypoint_dir
+        )
+        print(f"   Frames: {summary['frames']} ({summary['detected']} with person)")
+        if summary['keypoints'] == 'store':
+            print("   Keypoints: keypoint store (YOLOv8 skipped)")
+        print(f"   Speed: {summary['fps']:.1f} FPS ({summary['elapsed']:.1f}s)")
+        if args.output:
+            print(f"   Saved: {args.output}")
+        if results_path:
+            print(f"   Results: {results_path}")
+            summary_path = ResultsWriter.write_summary(results_path, summary['session'])
+            print(f"   Summary: {summary_path}")
+        print(format_summary(summary['session']))
+
     print("Processing complete!")
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
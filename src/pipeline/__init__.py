@@ -0,0 +1,17 @@
+"""
+Pipeline module - Headless (no GUI) image/video processing.
+"""
+
+from .video_pipeline import VideoPipeline, letterbox
+from .image_pipeline import analyze_image
+from .frame_reader import FrameReader
+from .frame_scheduler import AdaptiveScheduler
+from .results_writer import ResultsWriter
+from .result_cache import ResultCache, cache_version
+from .keypoint_store import KeypointStore, keypoint_version
+from .batch_runner import BatchRunner, collect_inputs
+from .rescore import rescore_store, rescore_videos
+
+__all__ = ['VideoPipeline', 'ResultsWriter', 'BatchRunner', 'FrameReader', 'AdaptiveScheduler',
+           'ResultCache', 'cache_version', 'KeypointStore', 'keypoint_version', 'letterbox',
+           'analyze_image', 'collect_inputs', 'rescore_store', 'rescore_videos']
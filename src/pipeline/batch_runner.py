@@ -0,0 +1,323 @@
+"""
+Batch Runner - Process a whole directory / glob of images and videos.
+
+Files are sharded across a process pool; each worker loads the models
+once (initializer) and reuses them for every file it receives. Finished
+files are appended to a JSONL manifest as soon as they complete, so an
+interrupted run resumes where it stopped instead of starting over.
+"""
+
+import os
+import cv2
+import sys
+import json
+import glob
+import time
+import multiprocessing
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Optional, Tuple
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.app_config import APP_CONFIG
+from pipeline.image_pipeline import analyze_image
+from pipeline.results_writer import ResultsWriter
+from pipeline.result_cache import ResultCache, cache_version
+from pipeline.video_pipeline import VideoPipeline
+
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp', '.webp'}
+VIDEO_EXTENSIONS = {'.mp4', '.avi', '.mov', '.mkv'}
+
+MANIFEST_NAME = 'manifest.jsonl'
+
+# Models của worker hiện tại (mỗi process load đúng 1 lần)
+_WORKER = {}
+
+
+def collect_inputs(pattern: str) -> List[Path]:
+    """
+    Expand a directory (recursive) or glob pattern into image/video files.
+
+    Args:
+        pattern: Directory path or glob (e.g. "videos/**/*.mp4")
+
+    Returns:
+        Sorted list of supported files
+    """
+    path = Path(pattern)
+    if path.is_dir():
+        candidates = path.rglob('*')
+    else:
+        candidates = (Path(p) for p in glob.glob(pattern, recursive=True))
+
+    supported = IMAGE_EXTENSIONS | VIDEO_EXTENSIONS
+    return sorted(p for p in candidates if p.is_file() and p.suffix.lower() in supported)
+
+
+def load_manifest(manifest_path: Path) -> dict:
+    """
+    Read a manifest written by a previous run.
+
+    Returns:
+        dict {input_path: last record} (dòng sau ghi đè dòng trước)
+    """
+    records = {}
+    if not manifest_path.exists():
+        return records
+
+    with open(manifest_path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Dòng cuối bị cắt ngang khi crash
+            records[record['input']] = record
+    return records
+
+
+def _init_worker(model_path: str, classifier_path: str, backend: str,
+                 visualize: bool, threads: int, cache_dir: Optional[str] = None,
+                 keypoint_dir: Optional[str] = None, batch_size: int = 4):
+    """Process-pool initializer: load all models once per worker."""
+    # Tránh N worker × toàn bộ core tranh nhau CPU
+    cv2.setNumThreads(threads)
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+
+    from detection import PoseDetector
+    from recognition import PoseRecognizer
+    from evaluation import PoseEvaluator
+
+    _WORKER['detector'] = PoseDetector(model_path, confidence_threshold=APP_CONFIG['confidence_threshold'])
+    _WORKER['recognizer'] = PoseRecognizer(classifier_path, backend=backend)
+    _WORKER['evaluator'] = PoseEvaluator()
+    _WORKER['drawer'] = _WORKER['overlay'] = None
+    _WORKER['cache'] = None
+    _WORKER['keypoint_dir'] = keypoint_dir
+    _WORKER['batch_size'] = batch_size
+    if cache_dir:
+        _WORKER['cache'] = ResultCache(cache_dir, cache_version(model_path, classifier_path, backend),
+                                       max_bytes=APP_CONFIG['result_cache_mb'] * 1024 * 1024)
+
+    if visualize:
+        from visualization import SkeletonDrawer, OverlayUI
+        _WORKER['drawer'] = SkeletonDrawer()
+        _WORKER['overlay'] = OverlayUI()
+
+
+def output_paths(input_path: str, output_stem: str, results_format: str) -> Tuple[str, str]:
+    """
+    Results file and annotated media file of one input.
+
+    The full source name is kept (suffix appended, not replaced) so that
+    a.jpg / a.png or session.v1.mp4 / session.v2.mp4 never share an output.
+
+    Args:
+        input_path: Image or video file
+        output_stem: Mirrored path of the input under output_dir (with its suffix)
+        results_format: 'json' or 'csv'
+
+    Returns:
+        (results_path, media_path)
+    """
+    suffix = Path(input_path).suffix.lower()
+    media_path = output_stem
+    if suffix not in IMAGE_EXTENSIONS and suffix != '.mp4':
+        media_path = f"{output_stem}.mp4"  # Video luôn ghi ra mp4v
+    return f"{output_stem}.{results_format}", media_path
+
+
+def _process_file(input_path: str, output_stem: str, results_format: str) -> dict:
+    """
+    Process one file inside a worker.
+
+    Args:
+        input_path: Image or video file
+        output_stem: Mirrored input path under output_dir (see output_paths())
+        results_format: 'json' or 'csv'
+
+    Returns:
+        Manifest record for this file
+    """
+    source = Path(input_path)
+    Path(output_stem).parent.mkdir(parents=True, exist_ok=True)
+    results_path, media_path = output_paths(input_path, output_stem, results_format)
+    visualize = _WORKER['drawer'] is not None
+    start = time.time()
+
+    record = {'input': input_path, 'status': 'done', 'results': results_path}
+
+    if source.suffix.lower() in IMAGE_EXTENSIONS:
+        image = cv2.imread(input_path)
+        if image is None:
+            raise IOError(f"Cannot read image: {input_path}")
+
+        cache = _WORKER['cache']
+        frame, keypoints, (pose_name, confidence, score, feedback) = analyze_image(
+            image, _WORKER['detector'], _WORKER['recognizer'], _WORKER['evaluator'],
+            _WORKER['drawer'], _WORKER['overlay'],
+            cache=cache, cache_key=cache.key_for_file(input_path) if cache is not None else None
+        )
+        with ResultsWriter(results_path) as writer:
+            writer.write({
+                'frame': 0,
+                'time': 0.0,
+                'pose': pose_name,
+                'confidence': round(float(confidence), 4),
+                'score': score,
+                'feedback': feedback,
+                'keypoints': keypoints.data[0].round(2).tolist() if keypoints is not None else None,
+            })
+        if visualize:
+            record['output'] = media_path
+            cv2.imwrite(record['output'], frame)
+        record.update(pose=pose_name, score=score)
+    else:
+        output_path = media_path if visualize else None
+        pipeline = VideoPipeline(_WORKER['detector'], _WORKER['recognizer'], _WORKER['evaluator'],
+                                 _WORKER['drawer'], _WORKER['overlay'], keypoint_dir=_WORKER['keypoint_dir'],
+                                 batch_size=_WORKER['batch_size'])
+        summary = pipeline.run(input_path, output_path, results_path)
+        if output_path:
+            record['output'] = output_path
+        record['summary'] = str(ResultsWriter.write_summary(results_path, summary['session']))
+        record.update(frames=summary['frames'], detected=summary['detected'], keypoints=summary['keypoints'])
+
+    record['elapsed'] = round(time.time() - start, 3)
+    return record
+
+
+class BatchRunner:
+    """
+    Directory / glob batch processor with a worker pool and resume manifest.
+
+    Example:
+        >>> runner = BatchRunner('results/nightly', workers=4)
+        >>> summary = runner.run('videos/2024-05-01/')
+        >>> print(f"{summary['done']} done, {summary['failed']} failed")
+    """
+
+    def __init__(self,
+                 output_dir: str,
+                 model_path: str = APP_CONFIG['default_model'],
+                 classifier_path: str = APP_CONFIG['ml_classifier_path'],
+                 backend: str = APP_CONFIG['classifier_backend'],
+                 workers: Optional[int] = None,
+                 visualize: bool = True,
+                 results_format: str = 'json',
+                 cache_dir: Optional[str] = None,
+                 keypoint_dir: Optional[str] = None,
+                 batch_size: int = 4):
+        """
+        Initialize batch runner.
+
+        Args:
+            output_dir: Where outputs and manifest.jsonl are written
+            model_path: YOLOv8 pose model
+            classifier_path: Pose classifier weights
+            backend: Classifier backend ('torch' or 'numpy')
+            workers: Number of worker processes (default: CPU count, 1 = in-process)
+            visualize: Save annotated images/videos (False = results only)
+            results_format: 'json' or 'csv'
+            cache_dir: Image result cache directory (None = no cache); unchanged
+                images are not re-analyzed even with resume=False
+            keypoint_dir: Video keypoint store directory (None = off); re-running
+                a video reuses its keypoints instead of YOLOv8
+            batch_size: Max frames per YOLOv8 call for videos
+        """
+        self.output_dir = Path(output_dir)
+        self.manifest_path = self.output_dir / MANIFEST_NAME
+        self.model_path = model_path
+        self.classifier_path = classifier_path
+        self.backend = backend
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.visualize = visualize
+        self.results_format = results_format
+        self.cache_dir = cache_dir
+        self.keypoint_dir = keypoint_dir
+        self.batch_size = batch_size
+
+    def _output_stem(self, path: Path, root: Path) -> str:
+        """Mirror the input tree under output_dir, keeping the full file name (tránh trùng tên)."""
+        return str(self.output_dir / path.resolve().relative_to(root))
+
+    def pending(self, files: List[Path]) -> List[Path]:
+        """Files not yet marked 'done' in the manifest."""
+        finished = {k for k, r in load_manifest(self.manifest_path).items() if r.get('status') == 'done'}
+        return [p for p in files if str(p.resolve()) not in finished]
+
+    def run(self, pattern: str, resume: bool = True) -> dict:
+        """
+        Process every image/video matched by pattern.
+
+        Args:
+            pattern: Directory or glob pattern
+            resume: Skip files already done in manifest.jsonl (False = start over)
+
+        Returns:
+            dict summary: total, skipped, done, failed, elapsed
+        """
+        files = collect_inputs(pattern)
+        if not files:
+            raise FileNotFoundError(f"No images/videos found for: {pattern}")
+
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        if not resume and self.manifest_path.exists():
+            self.manifest_path.unlink()
+
+        todo = self.pending(files)
+        root = Path(os.path.commonpath([str(p.resolve().parent) for p in files]))
+        summary = {'total': len(files), 'skipped': len(files) - len(todo), 'done': 0, 'failed': 0}
+        print(f"📂 {len(files)} files, {len(todo)} to process ({summary['skipped']} already done)")
+
+        init_args = (self.model_path, self.classifier_path, self.backend, self.visualize,
+                     max(1, (os.cpu_count() or 1) // self.workers), self.cache_dir, self.keypoint_dir,
+                     self.batch_size)
+        jobs = [(str(p.resolve()), self._output_stem(p, root), self.results_format) for p in todo]
+
+        start = time.time()
+        with open(self.manifest_path, 'a', encoding='utf-8') as manifest:
+            for record in self._execute(jobs, init_args):
+                summary['done' if record['status'] == 'done' else 'failed'] += 1
+                manifest.write(json.dumps(record, ensure_ascii=False) + '\n')
+                manifest.flush()
+
+                finished = summary['done'] + summary['failed']
+                icon = '✅' if record['status'] == 'done' else '❌'
+                print(f"   {icon} [{finished}/{len(todo)}] {record['input']}")
+
+        summary['elapsed'] = time.time() - start
+        return summary
+
+    def _execute(self, jobs, init_args):
+        """Yield manifest records as files finish (in completion order)."""
+        if self.workers == 1 or len(jobs) <= 1:
+            # Chạy luôn trong process hiện tại (debug / 1 GPU)
+            if jobs:
+                _init_worker(*init_args)
+            for job in jobs:
+                yield self._safe_call(job)
+            return
+
+        # 'spawn' an toàn với CUDA/torch hơn 'fork'
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                 initializer=_init_worker, initargs=init_args) as pool:
+            futures = {pool.submit(_process_file, *job): job for job in jobs}
+            for future in as_completed(futures):
+                try:
+                    yield future.result()
+                except Exception as e:
+                    yield {'input': futures[future][0], 'status': 'error', 'error': str(e)}
+
+    @staticmethod
+    def _safe_call(job) -> dict:
+        """Run one job in-process, turning exceptions into an error record."""
+        try:
+            return _process_file(*job)
+        except Exception as e:
+            return {'input': job[0], 'status': 'error', 'error': str(e)}
@@ -0,0 +1,152 @@
+"""
+Frame Reader - Threaded video decode into a prefetch ring buffer.
+
+Một thread riêng giải mã trước vào N mảng frame cấp phát sẵn (ring buffer),
+nên thread suy luận không phải chờ I/O. Khi consumer chậm, ring đầy và
+decoder dừng lại (backpressure) thay vì đọc tràn bộ nhớ.
+"""
+
+import cv2
+import queue
+import threading
+import numpy as np
+from typing import Optional, Tuple, Union
+
+
+# Sentinel báo hết stream
+_END = object()
+
+
+class FrameReader:
+    """
+    Drop-in replacement for cv2.VideoCapture with background prefetch.
+
+    A frame returned by read() stays valid until the next read() (its slot
+    goes back to the decoder then), so copy/letterbox it before reading on
+    if it must live longer.
+
+    Example:
+        >>> reader = FrameReader('videos/yoga.mp4', buffers=8)
+        >>> while True:
+        ...     ok, frame = reader.read()
+        ...     if not ok:
+        ...         break
+        >>> reader.release()
+    """
+
+    def __init__(self, source: Union[str, cv2.VideoCapture], buffers: int = 8):
+        """
+        Open a video and start decoding ahead.
+
+        Args:
+            source: Video path or an opened cv2.VideoCapture
+            buffers: Ring buffer size (frames decoded ahead)
+        """
+        self.cap = source if isinstance(source, cv2.VideoCapture) else cv2.VideoCapture(str(source))
+        self._buffers = [None] * max(2, buffers)
+        self._free = queue.Queue()
+        self._ready = queue.Queue()
+        for slot in range(len(self._buffers)):
+            self._free.put(slot)
+
+        self._held = None      # Slot consumer đang giữ (trả lại ở lần read sau)
+        self._ended = False
+        self._stop = threading.Event()
+        self._thread = None
+        self._closed = False   # Video đã được decoder thread đóng
+
+        if self.cap.isOpened():
+            # Cấp phát sẵn theo kích thước video (nếu backend báo được)
+            w = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            h = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            if w > 0 and h > 0:
+                self._buffers = [np.empty((h, w, 3), dtype=np.uint8) for _ in self._buffers]
+
+            self._thread = threading.Thread(target=self._decode, daemon=True)
+            self._thread.start()
+
+    def _decode(self):
+        """Decoder thread: fill free slots in order, then signal end of stream."""
+        try:
+            while not self._stop.is_set():
+                try:
+                    slot = self._free.get(timeout=0.1)
+                except queue.Empty:
+                    continue  # Ring đầy → chờ consumer (backpressure)
+
+                buffer = self._buffers[slot]
+                ret, frame = self.cap.read(image=buffer) if buffer is not None else self.cap.read()
+                if not ret:
+                    break
+                if frame is not buffer:
+                    # Lần đầu (chưa biết size) hoặc video đổi size: giữ mảng mới làm slot
+                    self._buffers[slot] = frame
+                self._ready.put(slot)
+            self._ready.put(_END)
+        except Exception as e:
+            self._ready.put(e)
+        finally:
+            if self._stop.is_set():
+                # release() được gọi khi đang cap.read(): thread này đóng video
+                # sau khi read trả về, không bao giờ đóng song song với read
+                self.cap.release()
+                self._closed = True
+
+    def read(self, timeout: Optional[float] = None) -> Tuple[bool, Optional[np.ndarray]]:
+        """
+        Next decoded frame (same contract as cv2.VideoCapture.read()).
+
+        Args:
+            timeout: Max seconds to wait (None = until a frame or end of stream)
+
+        Returns:
+            tuple: (ok, frame); (False, None) at end of stream, after release()
+            or on timeout
+        """
+        self._recycle()
+        if self._ended or self._thread is None:
+            return False, None
+
+        try:
+            item = self._ready.get(timeout=timeout)
+        except queue.Empty:
+            return False, None
+
+        if item is _END:
+            self._ended = True
+            return False, None
+        if isinstance(item, Exception):
+            self._ended = True
+            raise item
+
+        self._held = item
+        return True, self._buffers[item]
+
+    def _recycle(self):
+        """Give the slot of the previous read() back to the decoder."""
+        if self._held is not None:
+            self._free.put(self._held)
+            self._held = None
+
+    def isOpened(self) -> bool:
+        """True while the video is open and frames may still arrive."""
+        return self.cap.isOpened() and not self._ended
+
+    def get(self, prop_id: int) -> float:
+        """Forward cv2.CAP_PROP_* queries (e.g. FPS, FRAME_COUNT)."""
+        return self.cap.get(prop_id)
+
+    def release(self):
+        """
+        Stop the decoder thread and close the video.
+
+        If the decoder is still stuck in cap.read() after the join timeout,
+        the video is closed by the decoder thread itself once that read returns.
+        """
+        self._stop.set()
+        self._ended = True
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            if self._thread.is_alive() or self._closed:
+                return
+        self.cap.release()
@@ -0,0 +1,87 @@
+"""
+Frame Scheduler - Adaptive frame skipping from measured latency.
+
+Đo thời gian từng stage (EMA) và chọn frame nào chạy AI để vẫn giữ được
+fps_target. Frame bị bỏ qua vẫn được hiển thị với keypoints bám theo bằng
+tracking.KeypointTracker, nên không có công suy luận nào bị vứt bỏ.
+"""
+
+import math
+from typing import Dict
+
+
+class AdaptiveScheduler:
+    """
+    Pick which frames to run inference on so the output keeps up with target_fps.
+
+    With stride n, n frames cost one inference plus n times the per-frame
+    work (decode, letterbox, drawing), so the smallest n with
+    inference / n + per_frame <= 1 / target_fps is used.
+
+    Example:
+        >>> scheduler = AdaptiveScheduler(target_fps=30)
+        >>> if scheduler.should_infer(index):
+        ...     start = time.perf_counter(); run_model(frame)
+        ...     scheduler.record('inference', time.perf_counter() - start)
+    """
+
+    def __init__(self, target_fps: float = 30, smoothing: float = 0.2, max_stride: int = 6):
+        """
+        Args:
+            target_fps: Output frame rate to sustain
+            smoothing: EMA factor for latency measurements (0-1, higher = faster reaction)
+            max_stride: Never skip more than max_stride - 1 frames in a row
+        """
+        self.budget = 1.0 / target_fps
+        self.smoothing = smoothing
+        self.max_stride = max_stride
+        self.latency: Dict[str, float] = {}
+        self.stride = 1
+        self._last_inferred = None
+
+    def record(self, stage: str, seconds: float):
+        """
+        Add one latency measurement for a stage.
+
+        Args:
+            stage: 'inference' or any per-frame stage name ('decode', 'render', ...)
+            seconds: Measured duration
+        """
+        previous = self.latency.get(stage)
+        if previous is None:
+            self.latency[stage] = seconds
+        else:
+            self.latency[stage] = previous + self.smoothing * (seconds - previous)
+        self.stride = self._compute_stride()
+
+    def _compute_stride(self) -> int:
+        """Smallest stride that fits the frame budget."""
+        inference = self.latency.get('inference', 0.0)
+        per_frame = sum(v for k, v in self.latency.items() if k != 'inference')
+        spare = self.budget - per_frame
+        if spare <= 0:
+            return self.max_stride
+        return int(min(self.max_stride, max(1, math.ceil(inference / spare))))
+
+    def should_infer(self, index: int, force: bool = False) -> bool:
+        """
+        Decide whether frame `index` gets a model pass (call once per frame, in order).
+
+        Args:
+            index: Frame number
+            force: Infer regardless of stride (e.g. the tracker lost the person)
+
+        Returns:
+            True to run inference, False to track/reuse previous keypoints
+        """
+        if force or self._last_inferred is None or index - self._last_inferred >= self.stride:
+            self._last_inferred = index
+            return True
+        return False
+
+    def reset(self):
+        """Forget measurements (new video)."""
+        self.latency.clear()
+        self.stride = 1
+        self._last_inferred = None
+
@@ -0,0 +1,73 @@
+"""
+Image Pipeline - Analyze a single still image (no GUI).
+
+Shared by the CLI (src/main.py) and the batch runner.
+"""
+
+import sys
+import numpy as np
+from pathlib import Path
+from typing import Optional, Tuple
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.app_config import APP_CONFIG
+from pipeline.video_pipeline import letterbox, NO_POSE
+
+
+def analyze_image(image: np.ndarray,
+                  detector,
+                  recognizer,
+                  evaluator,
+                  drawer=None,
+                  overlay=None,
+                  process_size: Optional[Tuple[int, int]] = None,
+                  cache=None,
+                  cache_key: Optional[str] = None):
+    """
+    Detect → recognize → evaluate → draw on one BGR image.
+
+    Args:
+        image: BGR image (any size)
+        detector: PoseDetector
+        recognizer: PoseRecognizer
+        evaluator: PoseEvaluator
+        drawer: Optional SkeletonDrawer (None = no skeleton)
+        overlay: Optional OverlayUI (None = no scoreboard)
+        process_size: (width, height) khung xử lý (default: APP_CONFIG)
+        cache: Optional ResultCache; on a hit the models are skipped entirely
+        cache_key: Key of this image in cache (e.g. cache.key_for_file(path))
+
+    Returns:
+        tuple: (frame, keypoints, (pose_name, confidence, score, feedback))
+            frame: Letterboxed image with visualization
+            keypoints: PoseKeypoints or None if no person
+    """
+    size = process_size or (APP_CONFIG['process_width'], APP_CONFIG['process_height'])
+
+    # Resize về khung chuẩn trước khi xử lý (giống GUI) để ngưỡng pixel nhất quán
+    frame = letterbox(image, size)
+
+    cached = cache.get(cache_key) if cache is not None and cache_key else None
+    if cached is not None:
+        keypoints, (pose_name, confidence, score, feedback) = cached
+    else:
+        keypoints = detector.get_pose_keypoints(detector.predict(frame))
+        if keypoints is None:
+            pose_name, confidence, score, feedback = NO_POSE
+        else:
+            pose_name, confidence = recognizer.recognize(keypoints.flat34().tolist())
+            score, feedback = evaluator.evaluate(pose_name, keypoints.tuples())
+        if cache is not None and cache_key:
+            cache.put(cache_key, keypoints, (pose_name, confidence, score, feedback), frame.shape[:2])
+
+    if keypoints is None:
+        return frame, None, NO_POSE
+
+    kp_abs = keypoints.tuples()
+
+    if drawer is not None:
+        frame = drawer.draw(frame, kp_abs, score)
+    if overlay is not None:
+        frame = overlay.draw_scoreboard(frame, pose_name, score, feedback)
+
+    return frame, keypoints, (pose_name, confidence, score, feedback)
@@ -0,0 +1,254 @@
+"""
+Keypoint Store - Per-video memory-mapped keypoint sidecar.
+
+Lần chạy đầu ghi keypoints của mọi frame vào một mảng float16
+(frames, persons, 17, 3) trên đĩa (np.memmap) cùng header chỉ số frame;
+xem lại video, chấm điểm lại hay vẽ lại với style khác chỉ cần đọc mmap,
+không phải chạy lại YOLO.
+
+Layout của một store (một thư mục):
+    keypoints.npy   float16 (frames, persons, 17, 3), pixel trong khung xử lý
+    frames.npy      int8 (frames,): -1 = chưa ghi, 0 = không có người,
+                    1 = detect, 2 = tracking (optical flow)
+    meta.json       nguồn video, kích thước khung, fps, version, complete
+"""
+
+import sys
+import json
+import hashlib
+import numpy as np
+from pathlib import Path
+from typing import Optional, Tuple, Union
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.app_config import APP_CONFIG
+from detection.pose_keypoints import PoseKeypoints
+from pipeline.result_cache import file_identity
+
+
+# Giá trị trong frames.npy
+UNWRITTEN = -1
+NO_PERSON = 0
+DETECTED = 1
+TRACKED = 2
+
+_PROBE = 1 << 20
+
+
+def keypoint_version(model_path: str, process_size: Optional[Tuple[int, int]] = None,
+                     mode: str = 'full') -> str:
+    """
+    Fingerprint of what determines the keypoints (detector + analysis frame + producer).
+
+    Recognizer/evaluator changes do not invalidate a store - that is the point.
+
+    Args:
+        model_path: YOLOv8 pose model
+        process_size: (width, height) analysis frame (default: APP_CONFIG)
+        mode: How keypoints were produced: 'full' = YOLO on every full frame
+            (VideoPipeline, rescore); the GUI uses e.g. 'roi+track' (ROI crops +
+            optical flow). Stores of different modes are never shared.
+    """
+    size = process_size or (APP_CONFIG['process_width'], APP_CONFIG['process_height'])
+    payload = json.dumps([file_identity(model_path), list(size), APP_CONFIG['confidence_threshold'], mode])
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def video_fingerprint(video_path: Union[str, Path]) -> str:
+    """
+    Cheap content id of a video: size + first and last MB.
+
+    Hash cả file nhiều GB thì quá chậm; đầu/cuối file + kích thước đủ để phân
+    biệt video khác nhau và không phụ thuộc tên/đường dẫn.
+    """
+    path = Path(video_path)
+    size = path.stat().st_size
+    digest = hashlib.sha256(str(size).encode())
+    with open(path, 'rb') as f:
+        digest.update(f.read(_PROBE))
+        if size > _PROBE:
+            f.seek(max(_PROBE, size - _PROBE))
+            digest.update(f.read(_PROBE))
+    return digest.hexdigest()[:24]
+
+
+class KeypointStore:
+    """
+    Memory-mapped (frames, persons, 17, 3) float16 keypoints of one video.
+
+    Example:
+        >>> directory = KeypointStore.locate('videos/yoga.mp4', keypoint_version(model))
+        >>> store = KeypointStore.open(directory)           # None if missing/incomplete
+        >>> if store is None:
+        ...     store = KeypointStore.create(directory, frames=900, meta={'fps': 30})
+        ...     store.write(0, keypoints)                   # during the first pass
+        ...     store.close(complete=True)
+        >>> keypoints = KeypointStore.open(directory).read(0)   # replay: no detector
+    """
+
+    def __init__(self, directory: Path, keypoints: np.ndarray, flags: np.ndarray, meta: dict,
+                 writable: bool):
+        """Use create() / open()."""
+        self.directory = directory
+        self.keypoints = keypoints
+        self.flags = flags
+        self.meta = meta
+        self.writable = writable
+        self.overflow = False   # Video dài hơn frame count báo về → store không đầy đủ
+        self.shape = tuple(meta['frame_shape'])
+
+    @staticmethod
+    def locate(video_path: Union[str, Path], version: str, root: Optional[str] = None) -> Path:
+        """
+        Store directory for a video + detector version.
+
+        Args:
+            video_path: Source video
+            version: keypoint_version() of the detector
+            root: Parent directory (default: APP_CONFIG['keypoint_store_dir'])
+        """
+        root = Path(root or APP_CONFIG['keypoint_store_dir'])
+        return root / f"{video_fingerprint(video_path)}-{version}"
+
+    @classmethod
+    def create(cls, directory: Union[str, Path], frames: int, persons: Optional[int] = None,
+               frame_shape: Optional[Tuple[int, int]] = None, meta: Optional[dict] = None) -> 'KeypointStore':
+        """
+        Allocate an empty store (overwrites an existing one).
+
+        Args:
+            directory: Store directory
+            frames: Capacity in frames (e.g. CAP_PROP_FRAME_COUNT)
+            persons: Max persons per frame (default: APP_CONFIG)
+            frame_shape: (height, width) of the analysis frame (default: APP_CONFIG)
+            meta: Extra JSON fields (source, fps, ...)
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        persons = persons or APP_CONFIG['keypoint_store_persons']
+        frame_shape = frame_shape or (APP_CONFIG['process_height'], APP_CONFIG['process_width'])
+
+        meta = dict(meta or {}, frames=int(frames), persons=int(persons),
+                    frame_shape=list(frame_shape), complete=False)
+        # Đánh dấu chưa xong trước khi cấp phát: crash giữa chừng → không ai đọc nhầm
+        cls._write_meta(directory, meta)
+
+        keypoints = np.lib.format.open_memmap(directory / 'keypoints.npy', mode='w+', dtype=np.float16,
+                                              shape=(max(1, frames), persons, 17, 3))
+        flags = np.lib.format.open_memmap(directory / 'frames.npy', mode='w+', dtype=np.int8,
+                                          shape=(max(1, frames),))
+        flags[:] = UNWRITTEN
+        return cls(directory, keypoints, flags, meta, writable=True)
+
+    @classmethod
+    def open(cls, directory: Union[str, Path], require_complete: bool = True,
+             mode: Optional[str] = None) -> Optional['KeypointStore']:
+        """
+        Open an existing store read-only (memory-mapped, nothing loaded up front).
+
+        Args:
+            directory: Store directory
+            require_complete: Return None unless the first pass finished
+            mode: Required producer mode (see keypoint_version); None = any
+
+        Returns:
+            KeypointStore, or None if missing / incomplete / other mode / unreadable
+        """
+        directory = Path(directory)
+        try:
+            with open(directory / 'meta.json', encoding='utf-8') as f:
+                meta = json.load(f)
+            if require_complete and not meta.get('complete'):
+                return None
+            if mode is not None and meta.get('mode') != mode:
+                return None
+            keypoints = np.load(directory / 'keypoints.npy', mmap_mode='r')
+            flags = np.load(directory / 'frames.npy', mmap_mode='r')
+        except (FileNotFoundError, OSError, ValueError, KeyError):
+            return None
+        return cls(directory, keypoints, flags, meta, writable=False)
+
+    @staticmethod
+    def _write_meta(directory: Path, meta: dict):
+        tmp = directory / 'meta.json.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+        tmp.replace(directory / 'meta.json')
+
+    def __len__(self) -> int:
+        """Frame capacity."""
+        return len(self.flags)
+
+    @property
+    def frames_written(self) -> int:
+        return int((np.asarray(self.flags) != UNWRITTEN).sum())
+
+    def write(self, index: int, keypoints: Optional[PoseKeypoints], flag: int = DETECTED) -> bool:
+        """
+        Store the keypoints of one frame.
+
+        Args:
+            index: 0-based frame index
+            keypoints: PoseKeypoints in analysis-frame pixels, or None (no person)
+            flag: DETECTED or TRACKED
+
+        Returns:
+            False if index is beyond the capacity (frame count was underreported)
+        """
+        if index >= len(self.flags):
+            self.overflow = True
+            return False
+
+        row = self.keypoints[index]
+        row[:] = 0
+        if keypoints is None or len(keypoints) == 0:
+            self.flags[index] = NO_PERSON
+            return True
+
+        count = min(len(keypoints), row.shape[0])
+        row[:count] = keypoints.data[:count]
+        self.flags[index] = flag
+        return True
+
+    def read(self, index: int) -> Optional[PoseKeypoints]:
+        """
+        Keypoints of one frame (persons that were present only).
+
+        Args:
+            index: 0-based frame index
+
+        Returns:
+            PoseKeypoints (float32 copy), or None if no person / not written
+        """
+        if index >= len(self.flags) or self.flags[index] <= NO_PERSON:
+            return None
+        data = np.asarray(self.keypoints[index], dtype=np.float32)
+        present = data.any(axis=(1, 2))
+        if not present.any():
+            return None
+        return PoseKeypoints(data[present], self.shape)
+
+    def read_range(self, start: int = 0, stop: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Raw slice for vectorized re-scoring.
+
+        Returns:
+            (keypoints float16 (n, persons, 17, 3) view, flags int8 (n,) view)
+        """
+        return self.keypoints[start:stop], self.flags[start:stop]
+
+    def close(self, complete: bool = True):
+        """
+        Flush to disk; mark the store usable if the whole video was written.
+
+        Args:
+            complete: True when the pass reached the end of the video
+        """
+        if not self.writable:
+            return
+        self.keypoints.flush()
+        self.flags.flush()
+        self.meta['complete'] = bool(complete) and not self.overflow
+        self.meta['frames_written'] = self.frames_written
+        self._write_meta(self.directory, self.meta)
+        self.writable = False
@@ -0,0 +1,153 @@
+"""
+Rescore - Re-run recognition + scoring over stored keypoints (no detector).
+
+Keypoints của video đã lưu trong KeypointStore nên đổi ngưỡng chấm điểm hay
+override rule chỉ cần chạy lại PoseRecognizer + PoseEvaluator: vài nghìn
+frame mỗi lần gọi, không decode video, không YOLO. Một ngày quay chỉ mất
+vài giây thay vì hàng giờ GPU.
+"""
+
+import os
+import sys
+import time
+import numpy as np
+from pathlib import Path
+from typing import List, Optional
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from pipeline.batch_runner import output_paths
+from pipeline.keypoint_store import KeypointStore, keypoint_version, UNWRITTEN, NO_PERSON
+from pipeline.results_writer import ResultsWriter
+from pipeline.video_pipeline import NO_POSE
+from streaming.session_stats import SessionStats
+
+
+def find_store(video_path: str, model_path: str,
+               keypoint_dir: Optional[str] = None) -> Optional[KeypointStore]:
+    """
+    Complete keypoint store of a video, or None if it was never fully processed.
+
+    Args:
+        video_path: Source video
+        model_path: YOLOv8 pose model the keypoints were produced with
+        keypoint_dir: Store root (default: APP_CONFIG['keypoint_store_dir'])
+    """
+    directory = KeypointStore.locate(video_path, keypoint_version(model_path), keypoint_dir)
+    return KeypointStore.open(directory, mode='full')
+
+
+def rescore_store(store: KeypointStore, recognizer, evaluator,
+                  results_path: Optional[str] = None, chunk_size: int = 4096) -> dict:
+    """
+    Recognize + evaluate every stored frame in large vectorized chunks.
+
+    Same records and summary as VideoPipeline.run(), minus the video.
+
+    Args:
+        store: Complete KeypointStore (KeypointStore.open / find_store)
+        recognizer: PoseRecognizer (recognize_batch)
+        evaluator: PoseEvaluator (evaluate_batch)
+        results_path: Per-frame results .csv / .json (optional)
+        chunk_size: Frames per recognize_batch / evaluate_batch call
+
+    Returns:
+        dict summary: frames, detected, elapsed, fps, session, keypoints ('store')
+    """
+    video_fps = float(store.meta.get('fps') or 30.0)
+    height, width = store.shape
+    scale = np.array([width, height], dtype=np.float32)
+    stats = SessionStats(fps=video_fps)
+    results = ResultsWriter(results_path).open() if results_path else None
+
+    frames, detected = 0, 0
+    start = time.time()
+    try:
+        for offset in range(0, len(store), chunk_size):
+            keypoints, flags = store.read_range(offset, offset + chunk_size)
+            indices = np.flatnonzero(np.asarray(flags) != UNWRITTEN)
+            found = indices[np.asarray(flags)[indices] > NO_PERSON]
+
+            # Người đầu tiên mỗi frame (giống VideoPipeline)
+            people = np.asarray(keypoints[found, 0], dtype=np.float32)
+            analyses = {}
+            if len(found):
+                recognized = recognizer.recognize_batch((people[..., :2] / scale).reshape(len(found), -1))
+                names = [pose for pose, _ in recognized]
+                scores, feedbacks, issues = evaluator.evaluate_batch(
+                    names, people[..., :2].astype(np.int64), return_issues=True
+                )
+                for j, i in enumerate(found):
+                    analyses[i] = ((names[j], recognized[j][1], int(scores[j]), feedbacks[j]), issues[j], people[j])
+
+            for i in indices:
+                (pose_name, confidence, score, feedback), issues, person = analyses.get(i, (NO_POSE, (), None))
+                stats.update(pose_name if person is not None else None, score, issues)
+                if results is not None:
+                    index = offset + int(i)
+                    results.write({
+                        'frame': index,
+                        'time': round(index / video_fps, 3),
+                        'pose': pose_name,
+                        'confidence': round(float(confidence), 4),
+                        'score': score,
+                        'feedback': feedback,
+                        'keypoints': person.round(2).tolist() if person is not None else None,
+                    })
+            frames += len(indices)
+            detected += len(found)
+    finally:
+        if results is not None:
+            results.close()
+
+    elapsed = time.time() - start
+    return {
+        'frames': frames,
+        'detected': detected,
+        'elapsed': elapsed,
+        'fps': frames / elapsed if elapsed > 0 else 0.0,
+        'session': stats.summary(),
+        'keypoints': 'store',
+    }
+
+
+def rescore_videos(videos: List[Path], recognizer, evaluator, model_path: str,
+                   output_dir: str, keypoint_dir: Optional[str] = None,
+                   results_format: str = 'json') -> dict:
+    """
+    Rescore many videos (e.g. a day of recordings) from their keypoint stores.
+
+    Args:
+        videos: Video files
+        recognizer: PoseRecognizer
+        evaluator: PoseEvaluator
+        model_path: YOLOv8 pose model the stores were written with
+        output_dir: Where <name>.<format> + <name>.summary.json are written
+            (full source name kept, see batch_runner.output_paths)
+        keypoint_dir: Store root (default: APP_CONFIG)
+        results_format: 'json' or 'csv'
+
+    Returns:
+        dict summary: total, done, missing (videos without a complete store),
+        frames, elapsed
+    """
+    output_dir = Path(output_dir)
+    # Giữ cấu trúc thư mục con (tránh trùng tên giữa các ngày / phòng)
+    root = Path(os.path.commonpath([str(Path(v).resolve().parent) for v in videos])) if videos else None
+    summary = {'total': len(videos), 'done': 0, 'missing': [], 'frames': 0}
+    start = time.time()
+    for video in videos:
+        store = find_store(str(video), model_path, keypoint_dir)
+        if store is None:
+            summary['missing'].append(str(video))
+            print(f"   ⏭  {video} (chưa có keypoints, cần chạy detector trước)")
+            continue
+
+        relative = Path(video).resolve().relative_to(root)
+        results_path, _ = output_paths(str(video), str(output_dir / relative), results_format)
+        result = rescore_store(store, recognizer, evaluator, results_path)
+        ResultsWriter.write_summary(results_path, result['session'])
+        summary['done'] += 1
+        summary['frames'] += result['frames']
+        print(f"   ✅ {video}: {result['frames']} frames ({result['fps']:.0f} FPS)")
+    summary['elapsed'] = time.time() - start
+    return summary
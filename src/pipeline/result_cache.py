@@ -0,0 +1,225 @@
+"""
+Result Cache - Content-addressed disk cache of image analysis results.
+
+Khóa = SHA-256 nội dung file + "phiên bản" (model, classifier, cấu hình,
+mã nguồn các bước nhận dạng/chấm điểm), nên mở lại cùng một ảnh hay chạy
+lại batch trên thư mục ít thay đổi sẽ bỏ qua hoàn toàn YOLO/classifier.
+Mỗi entry là một file .npz nhỏ; tổng dung lượng giới hạn theo LRU (mtime).
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import hashlib
+import numpy as np
+from pathlib import Path
+from typing import Optional, Tuple, Union
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.app_config import APP_CONFIG
+from detection.pose_keypoints import PoseKeypoints
+
+
+# Mã nguồn ảnh hưởng tới kết quả: đổi ngưỡng / override rule → khóa mới
+_SCORING_SOURCES = [
+    'recognition/pose_recognizer.py',
+    'evaluation/pose_evaluator.py',
+    'evaluation/pose_rules.py',
+    'geometry/geometry_utils.py',
+    'geometry/pose_geometry.py',
+]
+
+_CHUNK = 1 << 20
+
+
+def file_identity(path: Optional[str]) -> str:
+    """Name + size + mtime of a model file (cheap stand-in for hashing weights)."""
+    if not path:
+        return ''
+    p = Path(path)
+    if not p.exists():
+        return p.name
+    stat = p.stat()
+    return f"{p.name}:{stat.st_size}:{int(stat.st_mtime)}"
+
+
+def cache_version(model_path: str, classifier_path: str, backend: str = '',
+                  process_size: Optional[Tuple[int, int]] = None) -> str:
+    """
+    Fingerprint of everything besides the image that changes the result.
+
+    Args:
+        model_path: YOLOv8 pose model
+        classifier_path: Pose classifier weights
+        backend: Classifier backend
+        process_size: (width, height) analysis frame (default: APP_CONFIG)
+
+    Returns:
+        Short hex digest
+    """
+    size = process_size or (APP_CONFIG['process_width'], APP_CONFIG['process_height'])
+    digest = hashlib.sha256()
+    digest.update(json.dumps([
+        APP_CONFIG['version'], file_identity(model_path), file_identity(classifier_path),
+        backend, list(size), APP_CONFIG['confidence_threshold'],
+    ]).encode())
+
+    src = Path(__file__).parent.parent
+    for name in _SCORING_SOURCES:
+        path = src / name
+        if path.exists():
+            digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+class ResultCache:
+    """
+    Disk-backed, size-bounded LRU cache of (keypoints, pose, confidence, score, feedback).
+
+    Example:
+        >>> cache = ResultCache('.cache/results', version=cache_version(model, clf))
+        >>> key = cache.key_for_file('images/plank.jpg')
+        >>> hit = cache.get(key)
+        >>> if hit is None:
+        ...     keypoints, analysis = run_models(image)
+        ...     cache.put(key, keypoints, analysis)
+    """
+
+    def __init__(self, cache_dir: str = '.cache/results', version: str = '',
+                 max_bytes: int = 256 * 1024 * 1024):
+        """
+        Args:
+            cache_dir: Directory of .npz entries
+            version: Model/config fingerprint (see cache_version())
+            max_bytes: Evict least recently used entries above this total size
+        """
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.version = version
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+        # {path: [last_used, size]} - dựng lại từ thư mục (mtime = lần dùng cuối)
+        self._index = {}
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith('.npz'):
+                stat = entry.stat()
+                self._index[entry.path] = [stat.st_mtime, stat.st_size]
+        self._total = sum(size for _, size in self._index.values())
+
+    def key_for_file(self, path: Union[str, Path]) -> str:
+        """SHA-256 of the file content (read in chunks) + cache version."""
+        digest = hashlib.sha256(self.version.encode())
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(_CHUNK), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def key_for_bytes(self, data: bytes) -> str:
+        """SHA-256 of in-memory content + cache version."""
+        return hashlib.sha256(self.version.encode() + data).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return str(self.cache_dir / f"{key}.npz")
+
+    def get(self, key: str) -> Optional[Tuple[Optional[PoseKeypoints], tuple]]:
+        """
+        Look up a result.
+
+        Args:
+            key: From key_for_file() / key_for_bytes()
+
+        Returns:
+            (keypoints or None, (pose_name, confidence, score, feedback)), or None on miss
+        """
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as entry:
+                meta = json.loads(entry['meta'].tobytes().decode('utf-8'))
+                keypoints = None
+                if len(entry['keypoints']):
+                    boxes = entry['boxes'] if len(entry['boxes']) else None
+                    scores = entry['scores'] if len(entry['scores']) else None
+                    keypoints = PoseKeypoints(entry['keypoints'], tuple(meta['shape']),
+                                              boxes=boxes, scores=scores)
+        except (FileNotFoundError, OSError, KeyError, ValueError):
+            self.misses += 1
+            return None
+
+        # Đánh dấu vừa dùng (LRU)
+        now = time.time()
+        try:
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+        if path in self._index:
+            self._index[path][0] = now
+
+        self.hits += 1
+        return keypoints, (meta['pose'], meta['confidence'], meta['score'], meta['feedback'])
+
+    def put(self, key: str, keypoints: Optional[PoseKeypoints], analysis: tuple,
+            shape: Optional[Tuple[int, int]] = None):
+        """
+        Store a result (atomic write, then evict down to max_bytes).
+
+        Args:
+            key: Cache key
+            keypoints: PoseKeypoints or None (no person)
+            analysis: (pose_name, confidence, score, feedback)
+            shape: (height, width) of the analyzed frame (default: keypoints.orig_shape)
+        """
+        pose_name, confidence, score, feedback = analysis
+        if keypoints is not None:
+            shape = keypoints.orig_shape
+        meta = {'pose': pose_name, 'confidence': float(confidence), 'score': int(score),
+                'feedback': feedback, 'shape': list(shape or (0, 0))}
+
+        empty = np.zeros(0, dtype=np.float32)
+        buffer = io.BytesIO()
+        np.savez(
+            buffer,
+            keypoints=keypoints.data.astype(np.float32) if keypoints is not None else empty,
+            boxes=keypoints.boxes.astype(np.float32) if keypoints is not None and keypoints.boxes is not None else empty,
+            scores=keypoints.scores.astype(np.float32) if keypoints is not None and keypoints.scores is not None else empty,
+            meta=np.frombuffer(json.dumps(meta, ensure_ascii=False).encode('utf-8'), dtype=np.uint8),
+        )
+
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(buffer.getbuffer())
+        os.replace(tmp, path)  # Nhiều worker ghi cùng lúc vẫn an toàn
+
+        previous = self._index.get(path)
+        if previous is not None:
+            self._total -= previous[1]
+        size = buffer.getbuffer().nbytes
+        self._index[path] = [time.time(), size]
+        self._total += size
+        self._evict()
+
+    def _evict(self):
+        """Delete least recently used entries until under max_bytes."""
+        if self._total <= self.max_bytes:
+            return
+        for path, (_, size) in sorted(self._index.items(), key=lambda item: item[1][0]):
+            if self._total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # Worker khác đã xóa
+            del self._index[path]
+            self._total -= size
+
+    def __len__(self):
+        return len(self._index)
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of cached entries (as seen by this process)."""
+        return self._total
@@ -0,0 +1,111 @@
+"""
+Results Writer - Save per-frame analysis results.
+
+Writes one record per frame as CSV (one row per frame, keypoint columns
+named like datasets/yoga_pose_keypoint.csv) or JSON (list of records),
+plus an optional per-session summary next to it (<name>.summary.json).
+"""
+
+import csv
+import json
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from detection.keypoint_constants import KEYPOINT_NAMES
+
+
+RESULT_FIELDS = ['frame', 'time', 'pose', 'confidence', 'score', 'feedback']
+
+
+class ResultsWriter:
+    """
+    Incremental per-frame results writer (CSV or JSON by file suffix).
+
+    Example:
+        >>> with ResultsWriter('results/yoga.csv') as writer:
+        ...     writer.write({'frame': 0, 'time': 0.0, 'pose': 'Plank', ...})
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Output file (.csv → CSV, anything else → JSON)
+        """
+        self.path = Path(path)
+        self.format = 'csv' if self.path.suffix.lower() == '.csv' else 'json'
+        self.count = 0
+        self._file = None
+        self._writer = None
+
+    def open(self):
+        """Create the output file (and parent directory)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, 'w', newline='', encoding='utf-8')
+
+        if self.format == 'csv':
+            keypoint_fields = [f"{name}_{axis}" for name in KEYPOINT_NAMES for axis in ('x', 'y')]
+            self._writer = csv.writer(self._file)
+            self._writer.writerow(RESULT_FIELDS + keypoint_fields)
+        else:
+            self._file.write('[\n')
+        return self
+
+    def write(self, record: dict):
+        """
+        Append one frame record.
+
+        Args:
+            record: dict with RESULT_FIELDS and optional 'keypoints' (17 × [x, y, conf])
+        """
+        if self._file is None:
+            self.open()
+
+        if self.format == 'csv':
+            keypoints = record.get('keypoints') or []
+            flat = [round(v, 2) for point in keypoints for v in point[:2]]
+            self._writer.writerow([record.get(field, '') for field in RESULT_FIELDS] + flat)
+        else:
+            if self.count > 0:
+                self._file.write(',\n')
+            self._file.write(json.dumps(record, ensure_ascii=False))
+        self.count += 1
+
+    def close(self):
+        """Finish and close the output file."""
+        if self._file is None:
+            return
+        if self.format == 'json':
+            self._file.write('\n]\n')
+        self._file.close()
+        self._file = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @staticmethod
+    def summary_path(results_path: str) -> Path:
+        """Session summary file that belongs to a results file."""
+        path = Path(results_path)
+        return path.with_name(f"{path.stem}.summary.json")
+
+    @classmethod
+    def write_summary(cls, results_path: str, summary: dict) -> Path:
+        """
+        Save a session summary (SessionStats.summary()) next to the results.
+
+        Args:
+            results_path: Per-frame results file
+            summary: JSON-serializable summary dict
+
+        Returns:
+            Path of the written summary file
+        """
+        path = cls.summary_path(results_path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+        return path
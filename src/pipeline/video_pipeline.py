@@ -0,0 +1,336 @@
+"""
+Video Pipeline - Headless offline video processing.
+
+decode → inference → render → encode, mỗi stage chạy trên một thread riêng
+và nối với nhau bằng queue có giới hạn (backpressure), nên đọc video,
+YOLOv8, vẽ và ghi file chạy song song thay vì nối tiếp. Việc giải mã
+video được FrameReader làm trước trên thread riêng (ring buffer).
+"""
+
+import cv2
+import sys
+import time
+import queue
+import threading
+import numpy as np
+from pathlib import Path
+from typing import Optional, Tuple
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config.app_config import APP_CONFIG
+from detection.letterbox import Letterboxer
+from pipeline.frame_reader import FrameReader
+from pipeline.results_writer import ResultsWriter
+from pipeline.keypoint_store import KeypointStore, keypoint_version
+from streaming.session_stats import SessionStats
+
+
+NO_POSE = ("NO POSE", 0.0, 0, "Không tìm thấy người")
+
+# Sentinel báo hết stream
+_END = None
+
+
+def letterbox(image: np.ndarray, target_size: Tuple[int, int]) -> np.ndarray:
+    """
+    Resize giữ nguyên tỷ lệ về target_size, phần thừa padding đen (giống app_ui).
+
+    Dùng cho ảnh đơn lẻ (trả về canvas mới); video dùng Letterboxer có pool.
+
+    Args:
+        image: Ảnh BGR
+        target_size: (width, height)
+
+    Returns:
+        Ảnh BGR kích thước target_size
+    """
+    return Letterboxer(target_size, buffers=1)(image)
+
+
+class VideoPipeline:
+    """
+    Multi-stage threaded video processor.
+
+    Example:
+        >>> pipeline = VideoPipeline(detector, recognizer, evaluator, drawer, overlay)
+        >>> summary = pipeline.run('videos/yoga.mp4', 'results/yoga.mp4', 'results/yoga.csv')
+        >>> print(f"{summary['frames']} frames @ {summary['fps']:.1f} FPS")
+    """
+
+    def __init__(self,
+                 detector,
+                 recognizer,
+                 evaluator,
+                 drawer=None,
+                 overlay=None,
+                 process_size: Optional[Tuple[int, int]] = None,
+                 queue_size: int = 8,
+                 batch_size: int = 4,
+                 keypoint_dir: Optional[str] = None,
+                 model_path: Optional[str] = None):
+        """
+        Initialize pipeline.
+
+        Args:
+            detector: PoseDetector
+            recognizer: PoseRecognizer
+            evaluator: PoseEvaluator
+            drawer: SkeletonDrawer (None = không vẽ khung xương)
+            overlay: OverlayUI (None = không vẽ bảng điểm)
+            process_size: (width, height) khung xử lý (default: APP_CONFIG)
+            queue_size: Số frame tối đa chờ giữa 2 stage
+            batch_size: Số frame tối đa mỗi lần gọi YOLOv8
+            keypoint_dir: Thư mục KeypointStore (None = tắt). Lần đầu ghi keypoints
+                của video; các lần sau đọc từ mmap, không gọi YOLOv8
+            model_path: Model của keypoints đã lưu (default: detector.model_path).
+                Với detector=None chỉ chạy được video đã có store (vẽ lại)
+        """
+        self.detector = detector
+        self.recognizer = recognizer
+        self.evaluator = evaluator
+        self.drawer = drawer
+        self.overlay = overlay
+        self.process_size = process_size or (APP_CONFIG['process_width'], APP_CONFIG['process_height'])
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.keypoint_dir = keypoint_dir
+        self.model_path = model_path or getattr(detector, 'model_path', '')
+
+        self._store = None   # KeypointStore của video đang chạy (đọc hoặc ghi)
+        self._stop = threading.Event()
+        self._errors = []
+
+    # --- Helpers ---
+    def _put(self, q: queue.Queue, item) -> bool:
+        """Blocking put that gives up when the pipeline is stopping."""
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q: queue.Queue):
+        """Blocking get that returns _END when the pipeline is stopping."""
+        while not self._stop.is_set():
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+        return _END
+
+    def _run_stage(self, target, *args):
+        """Run a stage, recording errors and stopping the whole pipeline on failure."""
+        try:
+            target(*args)
+        except Exception as e:
+            self._errors.append(e)
+            self._stop.set()
+
+    # --- Stages ---
+    def _decode_stage(self, cap: FrameReader, out_q: queue.Queue):
+        """Letterbox prefetched frames to process_size."""
+        # Đủ canvas cho mọi frame có thể đang nằm trong 3 queue + các stage
+        letterboxer = Letterboxer(self.process_size, buffers=3 * self.queue_size + self.batch_size + 4)
+        index = 0
+        while not self._stop.is_set():
+            ret, frame = cap.read()
+            if not ret:
+                break
+            if not self._put(out_q, (index, letterboxer(frame))):
+                return
+            index += 1
+        self._put(out_q, _END)
+
+    def _inference_stage(self, in_q: queue.Queue, out_q: queue.Queue):
+        """YOLOv8 → PoseRecognizer → PoseEvaluator, batching frames already waiting."""
+        finished = False
+        while not finished:
+            item = self._get(in_q)
+            if item is _END:
+                break
+
+            batch = [item]
+            while len(batch) < self.batch_size:
+                try:
+                    item = in_q.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _END:
+                    finished = True
+                    break
+                batch.append(item)
+
+            if self._store is not None and not self._store.writable:
+                # Video đã xử lý: keypoints từ mmap, bỏ qua YOLOv8
+                keypoints = [self._store.read(index) for index, _ in batch]
+            else:
+                results = self.detector.predict_batch([frame for _, frame in batch])
+                keypoints = [self.detector.get_pose_keypoints(result) for result in results]
+                if self._store is not None:
+                    for (index, _), kps in zip(batch, keypoints):
+                        self._store.write(index, kps)
+
+            # Phân loại + chấm điểm cả batch một lần (người đầu tiên mỗi frame)
+            found = [i for i, kps in enumerate(keypoints) if kps is not None]
+            analyses = [NO_POSE] * len(batch)
+            issues = [()] * len(batch)
+            if found:
+                recognized = self.recognizer.recognize_batch(
+                    np.stack([keypoints[i].flat34() for i in found])
+                )
+                names = [pose for pose, _ in recognized]
+                scores, feedbacks, frame_issues = self.evaluator.evaluate_batch(
+                    names, np.stack([keypoints[i].xy[0] for i in found]).astype(np.int64),
+                    return_issues=True
+                )
+                for j, i in enumerate(found):
+                    analyses[i] = (names[j], recognized[j][1], int(scores[j]), feedbacks[j])
+                    issues[i] = frame_issues[j]
+
+            for (index, frame), kps, analysis, issue in zip(batch, keypoints, analyses, issues):
+                if not self._put(out_q, (index, frame, kps, analysis, issue)):
+                    return
+        self._put(out_q, _END)
+
+    def _render_stage(self, in_q: queue.Queue, out_q: queue.Queue):
+        """Draw skeleton + scoreboard on the frame (in place)."""
+        while True:
+            item = self._get(in_q)
+            if item is _END:
+                break
+
+            index, frame, kps, (pose_name, confidence, score, feedback), issues = item
+            if kps is not None:
+                if self.drawer is not None:
+                    frame = self.drawer.draw(frame, kps.tuples(), score)
+                if self.overlay is not None:
+                    frame = self.overlay.draw_scoreboard(frame, pose_name, score, feedback)
+
+            if not self._put(out_q, (index, frame, kps, (pose_name, confidence, score, feedback), issues)):
+                return
+        self._put(out_q, _END)
+
+    # --- Public API ---
+    def run(self, video_path: str, output_path: Optional[str] = None,
+            results_path: Optional[str] = None) -> dict:
+        """
+        Process a whole video.
+
+        Args:
+            video_path: Input video
+            output_path: Annotated output video (optional)
+            results_path: Per-frame results .csv / .json (optional)
+
+        Returns:
+            dict summary: frames, detected, elapsed, fps, session
+            (SessionStats.summary(): time, score stats and issues per pose) and
+            keypoints ('detector', 'store' = read from KeypointStore)
+        """
+        cap = FrameReader(video_path, buffers=self.queue_size)
+        if not cap.isOpened():
+            raise IOError(f"Cannot open video: {video_path}")
+
+        video_fps = cap.get(cv2.CAP_PROP_FPS) or APP_CONFIG['fps_target']
+        self._store = self._open_store(video_path, cap, video_fps)
+        from_store = self._store is not None and not self._store.writable
+        if self.detector is None and not from_store:
+            cap.release()
+            raise FileNotFoundError(f"No complete keypoint store for {video_path} (run the detector first)")
+
+        writer = None
+        if output_path:
+            Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+            writer = cv2.VideoWriter(str(output_path), cv2.VideoWriter_fourcc(*'mp4v'),
+                                     video_fps, self.process_size)
+        results = ResultsWriter(results_path).open() if results_path else None
+        stats = SessionStats(fps=video_fps)
+
+        self._stop.clear()
+        self._errors = []
+        decoded_q = queue.Queue(maxsize=self.queue_size)
+        analyzed_q = queue.Queue(maxsize=self.queue_size)
+        rendered_q = queue.Queue(maxsize=self.queue_size)
+
+        threads = [
+            threading.Thread(target=self._run_stage, args=(self._decode_stage, cap, decoded_q), daemon=True),
+            threading.Thread(target=self._run_stage, args=(self._inference_stage, decoded_q, analyzed_q), daemon=True),
+            threading.Thread(target=self._run_stage, args=(self._render_stage, analyzed_q, rendered_q), daemon=True),
+        ]
+
+        frames, detected = 0, 0
+        finished = False
+        start = time.time()
+        try:
+            for thread in threads:
+                thread.start()
+
+            # Encode stage (main thread)
+            while True:
+                item = self._get(rendered_q)
+                if item is _END:
+                    break
+
+                index, frame, kps, (pose_name, confidence, score, feedback), issues = item
+                stats.update(pose_name if kps is not None else None, score, issues)
+                if writer is not None:
+                    writer.write(frame)
+                if results is not None:
+                    results.write({
+                        'frame': index,
+                        'time': round(index / video_fps, 3),
+                        'pose': pose_name,
+                        'confidence': round(float(confidence), 4),
+                        'score': score,
+                        'feedback': feedback,
+                        'keypoints': kps.data[0].round(2).tolist() if kps is not None else None,
+                    })
+                frames += 1
+                detected += kps is not None
+            finished = True
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join(timeout=2.0)
+            cap.release()
+            if writer is not None:
+                writer.release()
+            if results is not None:
+                results.close()
+            if self._store is not None:
+                # Chỉ đánh dấu dùng được khi đã chạy hết video không lỗi
+                self._store.close(complete=finished and not self._errors)
+                self._store = None
+
+        if self._errors:
+            raise self._errors[0]
+
+        elapsed = time.time() - start
+        return {
+            'frames': frames,
+            'detected': detected,
+            'elapsed': elapsed,
+            'fps': frames / elapsed if elapsed > 0 else 0.0,
+            'session': stats.summary(),
+            'keypoints': 'store' if from_store else 'detector',
+        }
+
+    def _open_store(self, video_path: str, cap: FrameReader, video_fps: float) -> Optional[KeypointStore]:
+        """Existing complete store (read), a new one to fill (write), or None if disabled."""
+        if not self.keypoint_dir:
+            return None
+        version = keypoint_version(self.model_path, self.process_size)
+        directory = KeypointStore.locate(video_path, version, self.keypoint_dir)
+
+        store = KeypointStore.open(directory, mode='full')
+        if store is not None:
+            return store
+
+        frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        if frames <= 0 or self.detector is None:
+            return None  # Stream không biết độ dài → không cấp phát được
+        width, height = self.process_size
+        return KeypointStore.create(directory, frames, frame_shape=(height, width),
+                                    meta={'source': str(video_path), 'fps': video_fps, 'version': version,
+                                          'mode': 'full'})
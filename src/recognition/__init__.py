@@ -2,7 +2,14 @@
 Recognition module - ML-based pose classification.
 """
 
-from .ml_classifier import MLPoseClassifier, NeuralNet
+from .numpy_classifier import NumpyPoseClassifier
 from .pose_recognizer import PoseRecognizer
 
-__all__ = ['MLPoseClassifier', 'NeuralNet', 'PoseRecognizer']
+try:
+    from .ml_classifier import MLPoseClassifier, NeuralNet
+except ImportError:
+    # torch chưa được cài: chỉ dùng được NumPy backend
+    MLPoseClassifier = None
+    NeuralNet = None
+
+__all__ = ['MLPoseClassifier', 'NeuralNet', 'NumpyPoseClassifier', 'PoseRecognizer']
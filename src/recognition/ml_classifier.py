@@ -4,9 +4,10 @@ ML Pose Classifier - Neural Network for pose classification.
 Uses trained MLP to classify yoga poses from keypoints.
 """
 
+import time
 import torch
 import torch.nn as nn
-from typing import Tuple, List
+from typing import Tuple, List, Sequence
 import numpy as np
 
 
@@ -61,6 +62,7 @@ class MLPoseClassifier:
         self.model_path = model_path
         self.classes = ['Downdog', 'Goddess', 'Plank', 'Tree', 'Warrior2']
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        self.warmup_stats = {}  # {"Nx34": {'cold_ms', 'warm_ms'}} - xem warmup()
         self._load_model()
     
     def _load_model(self):
@@ -130,6 +132,69 @@ class MLPoseClassifier:
         
         return pose_name, confidence_value
     
+    def predict_batch(self, keypoints: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Predict poses for many samples in one forward pass.
+        
+        Args:
+            keypoints: Array (N, 34) of full keypoints or (N, 24) of body keypoints
+        
+        Returns:
+            Tuple of (indices, confidences)
+            - indices: int array (N,) - index into self.classes
+            - confidences: float array (N,) between 0 and 1
+        """
+        data = np.asarray(keypoints, dtype=np.float32)
+        if data.ndim != 2 or data.shape[1] not in (24, 34):
+            raise ValueError(f"Expected array of shape (N, 34) or (N, 24), got {data.shape}")
+        
+        # Remove head keypoints (first 10 values) if present
+        if data.shape[1] == 34:
+            data = data[:, 10:]
+        
+        if len(data) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        
+        input_tensor = torch.from_numpy(np.ascontiguousarray(data)).to(self.device)
+        
+        with torch.no_grad():
+            output = self.model(input_tensor)  # (N, 5)
+            probabilities = torch.softmax(output, dim=-1)
+            confidences, predicted = torch.max(probabilities, dim=-1)
+        
+        return predicted.cpu().numpy(), confidences.cpu().numpy()
+    
+    def warmup(self, shapes: Sequence[Tuple[int, int]] = ((1, 34),), runs: int = 3) -> dict:
+        """
+        Run synthetic batches so the first real prediction is not the slow one.
+        
+        Args:
+            shapes: (batch, 34 or 24) input shapes used at runtime,
+                e.g. [(1, 34), (4, 34)] for single frames and video batches
+            runs: Calls per shape (1 cold + runs-1 warm)
+        
+        Returns:
+            dict {"NxD": {'cold_ms': first call, 'warm_ms': best later call}},
+            also kept in self.warmup_stats
+        """
+        rng = np.random.default_rng(0)
+        for shape in shapes:
+            keypoints = rng.uniform(0, 1, shape).astype(np.float32)
+            
+            latencies = []
+            for _ in range(max(1, runs)):
+                start = time.perf_counter()
+                self.predict_batch(keypoints)
+                latencies.append((time.perf_counter() - start) * 1000)
+            
+            key = f"{shape[0]}x{shape[1]}"
+            self.warmup_stats[key] = {
+                'cold_ms': round(latencies[0], 2),
+                'warm_ms': round(min(latencies[1:] or latencies), 2),
+            }
+            print(f"🔥 Warmup classifier {key}: cold {latencies[0]:.1f} ms → warm {self.warmup_stats[key]['warm_ms']:.2f} ms")
+        return self.warmup_stats
+    
     def __call__(self, keypoints: List[float]) -> str:
         """
         Shortcut for predict() - returns only pose name (for compatibility).
@@ -0,0 +1,170 @@
+"""
+NumPy Pose Classifier - torch-free inference for the pose MLP.
+
+Runs the trained 24 → 256 → 5 network as two matmuls + softmax.
+Weights are read from the .pth checkpoint once and cached as a .npz
+next to it, so later processes can classify without importing torch.
+"""
+
+import os
+import numpy as np
+from typing import Tuple, List
+
+
+class NumpyPoseClassifier:
+    """
+    Pure-NumPy drop-in for MLPoseClassifier (same predict API).
+
+    Example:
+        >>> classifier = NumpyPoseClassifier('./models/pose_classification.pth')
+        >>> pose_name, confidence = classifier.predict(keypoints)  # 34 values
+        >>> indices, confidences = classifier.predict_batch(batch)  # (N, 34)
+    """
+
+    def __init__(self, model_path: str):
+        """
+        Initialize classifier.
+
+        Args:
+            model_path: Path to trained weights - .pth checkpoint or exported .npz
+        """
+        self.model_path = model_path
+        self.classes = ['Downdog', 'Goddess', 'Plank', 'Tree', 'Warrior2']
+        self.device = 'cpu'
+        self._load_model()
+
+    @staticmethod
+    def export_weights(model_path: str, output_path: str = None) -> str:
+        """
+        Export a .pth state_dict to a .npz file (requires torch).
+
+        Args:
+            model_path: Path to .pth checkpoint
+            output_path: Destination .npz (default: same name as checkpoint)
+
+        Returns:
+            Path of the written .npz file
+        """
+        import torch
+
+        state_dict = torch.load(model_path, map_location='cpu')
+        output_path = output_path or os.path.splitext(model_path)[0] + '.npz'
+        # Ghi file tạm rồi os.replace: worker khác đang np.load không bao giờ thấy file dở dang
+        tmp = f"{output_path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp, 'wb') as f:
+                np.savez(f, **{name.replace('.', '_'): tensor.numpy() for name, tensor in state_dict.items()})
+            os.replace(tmp, output_path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        return output_path
+
+    def _load_model(self):
+        """Load weights, converting the .pth checkpoint to .npz on first use."""
+        try:
+            npz_path = self.model_path
+            if not self.model_path.endswith('.npz'):
+                npz_path = os.path.splitext(self.model_path)[0] + '.npz'
+                # Chỉ có .npz đi kèm (không có .pth) → dùng luôn .npz
+                is_stale = os.path.exists(self.model_path) and (
+                    not os.path.exists(npz_path) or
+                    os.path.getmtime(npz_path) < os.path.getmtime(self.model_path))
+                if is_stale:
+                    try:
+                        self.export_weights(self.model_path, npz_path)
+                    except OSError:
+                        # Thư mục model chỉ đọc: convert trong bộ nhớ, không cache
+                        npz_path = None
+
+            if npz_path is None:
+                import torch
+                state_dict = torch.load(self.model_path, map_location='cpu')
+                weights = {name.replace('.', '_'): t.numpy() for name, t in state_dict.items()}
+            else:
+                with np.load(npz_path) as data:
+                    weights = {name: data[name] for name in data.files}
+
+            # Store transposed so inference is x @ W (no transpose per call)
+            self.w1 = np.ascontiguousarray(weights['l1_weight'].T, dtype=np.float32)  # (24, 256)
+            self.b1 = weights['l1_bias'].astype(np.float32)
+            self.w2 = np.ascontiguousarray(weights['l2_weight'].T, dtype=np.float32)  # (256, 5)
+            self.b2 = weights['l2_bias'].astype(np.float32)
+            print(f"✅ Loaded ML classifier (NumPy): {self.model_path}")
+        except Exception as e:
+            raise RuntimeError(f"Failed to load model: {e}")
+
+    def predict_proba(self, body_keypoints: np.ndarray) -> np.ndarray:
+        """
+        Class probabilities for body keypoints.
+
+        Args:
+            body_keypoints: Array (N, 24)
+
+        Returns:
+            Array (N, 5) of softmax probabilities
+        """
+        hidden = body_keypoints @ self.w1
+        hidden += self.b1
+        np.maximum(hidden, 0, out=hidden)  # ReLU
+
+        logits = hidden @ self.w2
+        logits += self.b2
+        logits -= logits.max(axis=-1, keepdims=True)  # Numerically stable softmax
+        np.exp(logits, out=logits)
+        logits /= logits.sum(axis=-1, keepdims=True)
+        return logits
+
+    def predict_batch(self, keypoints: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Predict poses for many samples at once.
+
+        Args:
+            keypoints: Array (N, 34) of full keypoints or (N, 24) of body keypoints
+
+        Returns:
+            Tuple of (indices, confidences) arrays of shape (N,)
+        """
+        data = np.asarray(keypoints, dtype=np.float32)
+        if data.ndim != 2 or data.shape[1] not in (24, 34):
+            raise ValueError(f"Expected array of shape (N, 34) or (N, 24), got {data.shape}")
+
+        # Remove head keypoints (first 10 values) if present
+        if data.shape[1] == 34:
+            data = data[:, 10:]
+
+        probabilities = self.predict_proba(data)
+        indices = probabilities.argmax(axis=-1)
+        return indices, probabilities[np.arange(len(indices)), indices]
+
+    def predict(self, keypoints: List[float]) -> Tuple[str, float]:
+        """
+        Predict pose from keypoints.
+
+        Args:
+            keypoints: List of 34 normalized values (17 keypoints × 2)
+
+        Returns:
+            Tuple of (pose_name, confidence)
+        """
+        if len(keypoints) != 34:
+            raise ValueError(f"Expected 34 keypoint values, got {len(keypoints)}")
+
+        indices, confidences = self.predict_batch(np.asarray(keypoints, dtype=np.float32)[None])
+        return self.classes[int(indices[0])], float(confidences[0])
+
+    def __call__(self, keypoints: List[float]) -> str:
+        """
+        Shortcut for predict() - returns only pose name.
+
+        Args:
+            keypoints: List of 34 values (full keypoints) or 24 values (body only)
+
+        Returns:
+            Pose name string
+        """
+        if len(keypoints) == 24:
+            keypoints = [0.0] * 10 + list(keypoints)
+
+        pose_name, _ = self.predict(keypoints)
+        return pose_name
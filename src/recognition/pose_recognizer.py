@@ -7,26 +7,29 @@ Kết hợp AI Classification và Geometric Rules để sửa lỗi nhận diệ
 
 from typing import Tuple, List
 import numpy as np
-import math
-from .ml_classifier import MLPoseClassifier
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from geometry.pose_geometry import PoseGeometry
+from .numpy_classifier import NumpyPoseClassifier
 
 class PoseRecognizer:
-    def __init__(self, model_path: str):
-        self.classifier = MLPoseClassifier(model_path)
+    def __init__(self, model_path: str, backend: str = 'torch'):
+        """
+        Args:
+            model_path: Đường dẫn weights của classifier (.pth hoặc .npz)
+            backend: 'torch' (MLPoseClassifier) hoặc 'numpy' (NumpyPoseClassifier, không cần torch)
+        """
+        if backend == 'numpy':
+            self.classifier = NumpyPoseClassifier(model_path)
+        elif backend == 'torch':
+            from .ml_classifier import MLPoseClassifier
+            self.classifier = MLPoseClassifier(model_path)
+        else:
+            raise ValueError(f"Unknown classifier backend: {backend}")
+        self.geometry = PoseGeometry()
     
-    def _calculate_angle(self, a, b, c):
-        """Tính góc giữa 3 điểm (a, b, c) với b là đỉnh."""
-        a = np.array(a)
-        b = np.array(b)
-        c = np.array(c)
-        
-        ba = a - b
-        bc = c - b
-        
-        cosine_angle = np.dot(ba, bc) / (np.linalg.norm(ba) * np.linalg.norm(bc))
-        angle = np.arccos(np.clip(cosine_angle, -1.0, 1.0))
-        return np.degrees(angle)
-
     def _normalize_keypoints(self, keypoints: List[float]) -> List[float]:
         """Chuẩn hóa giữ nguyên tỷ lệ (Aspect Ratio)."""
         data = np.array(keypoints)
@@ -39,114 +42,109 @@ class PoseRecognizer:
         scale = max(max_x - min_x, max_y - min_y)
         if scale == 0: scale = 1
 
-        normalized_data = []
-        for x, y in data:
-            normalized_data.extend([(x - min_x) / scale, (y - min_y) / scale])
-        return normalized_data
+        normalized_data = (data - [min_x, min_y]) / scale
+        return normalized_data.reshape(-1).tolist()
+    
+    def _normalize_keypoints_batch(self, keypoints: np.ndarray) -> np.ndarray:
+        """Chuẩn hóa giữ nguyên tỷ lệ cho N người cùng lúc: (N, 34) -> (N, 34)."""
+        data = keypoints.reshape(len(keypoints), -1, 2)
+        min_xy = data.min(axis=1, keepdims=True)
+        max_xy = data.max(axis=1, keepdims=True)
+        
+        scale = (max_xy - min_xy).max(axis=2, keepdims=True)
+        scale[scale == 0] = 1
+        
+        return ((data - min_xy) / scale).reshape(len(keypoints), -1)
     
     def _override_prediction(self, ai_pose: str, keypoints: List[float]) -> str:
         """
         Dùng hình học để kiểm tra lại kết quả của AI.
         Nếu AI sai logic cơ bản, ép về kết quả đúng.
         """
-        # Chuyển đổi keypoints về dạng dễ truy cập
-        # Index COCO: Hip(11,12), Knee(13,14), Ankle(15,16)
-        # Vì keypoints ở đây là list phẳng [x0, y0, ...], ta cần ánh xạ lại index
-        # Index trong list phẳng = coco_index * 2
-        
-        def get_pt(idx): 
-            return (keypoints[idx*2], keypoints[idx*2+1])
-        
         try:
-            # ✅ CASE 0: Kiểm tra cúi xuống (Bent Over) - STRICT!
-            # Nếu AI bảo Goddess nhưng người đang cúi → KHÔNG PHẢI Goddess!
-            if ai_pose == 'Goddess':
-                shoulder_y_left = keypoints[5*2 + 1]   # Y của vai trái
-                shoulder_y_right = keypoints[6*2 + 1]  # Y của vai phải
-                hip_y_left = keypoints[11*2 + 1]       # Y của hông trái
-                hip_y_right = keypoints[12*2 + 1]      # Y của hông phải
-                wrist_y_left = keypoints[9*2 + 1]      # Y của cổ tay trái
-                wrist_y_right = keypoints[10*2 + 1]    # Y của cổ tay phải
-                
-                avg_shoulder_y = (shoulder_y_left + shoulder_y_right) / 2
-                avg_hip_y = (hip_y_left + hip_y_right) / 2
-                avg_wrist_y = (wrist_y_left + wrist_y_right) / 2
-                
-                # CHECK 1: Goddess PHẢI có vai TRÊN hông (y nhỏ hơn trong coordinate)
-                # Nếu vai DƯỚI hông rõ ràng (y lớn hơn nhiều) = đang cúi
-                # RELAX: Cho phép vai hơi thấp hơn hông một chút (khi squat sâu)
-                body_height = abs(shoulder_y_left - hip_y_left)
-                if avg_shoulder_y > avg_hip_y + (body_height * 0.15):  # Vai thấp hơn 15%
-                    return 'Unknown'  # Cúi rõ ràng!
-                
-                # CHECK 2: Cổ tay phải cao hơn hông đáng kể (tay giơ lên)
-                # Goddess thật: tay giơ cao (wrist_y << hip_y)
-                # Cúi xuống: tay chạm đất (wrist_y ≈ hip_y)
-                # RELAX: Threshold lớn hơn để cho phép tay không giơ quá cao
-                if avg_wrist_y >= avg_hip_y:  # Cổ tay thấp hơn hoặc ngang hông
-                    return 'Unknown'  # Tay không giơ lên = CÚI!
-            
-            # ✅ CASE 0.5: Kiểm tra Downdog vs Plank (Hip angle check)
-            # Downdog và Plank đều có tay chống + chân thẳng → dễ nhầm!
-            if ai_pose == 'Downdog' or ai_pose == 'Plank':
-                shoulder_left = get_pt(5)
-                shoulder_right = get_pt(6)
-                hip_left = get_pt(11)
-                hip_right = get_pt(12)
-                knee_left = get_pt(13)
-                knee_right = get_pt(14)
-                
-                # Tính góc vai-hông-gối (hip angle)
-                avg_shoulder = ((shoulder_left[0] + shoulder_right[0]) / 2, 
-                               (shoulder_left[1] + shoulder_right[1]) / 2)
-                avg_hip = ((hip_left[0] + hip_right[0]) / 2,
-                          (hip_left[1] + hip_right[1]) / 2)
-                avg_knee = ((knee_left[0] + knee_right[0]) / 2,
-                           (knee_left[1] + knee_right[1]) / 2)
-                
-                hip_angle = self._calculate_angle(avg_shoulder, avg_hip, avg_knee)
-                
-                # Downdog: Góc nhỏ (70-120°) - hông nâng cao, hình chữ V
-                # Plank: Góc lớn (>140°) - thân ngang, thẳng
-                if ai_pose == 'Downdog' and hip_angle > 140:
-                    return 'Plank'  # Thân ngang → Plank!
-                elif ai_pose == 'Plank' and hip_angle < 120:
-                    return 'Downdog'  # Hông nâng cao → Downdog!
-            
-            # Tính góc đầu gối trái và phải
-            angle_l = self._calculate_angle(get_pt(11), get_pt(13), get_pt(15))
-            angle_r = self._calculate_angle(get_pt(12), get_pt(14), get_pt(16))
-            
-            # Logic phân biệt Tree vs Goddess
-            # Tree: 1 chân thẳng (>160), 1 chân gập
-            # Goddess: 2 chân đều gập (<140)
-            
-            is_one_leg_straight = (angle_l > 160) or (angle_r > 160)
-            is_both_legs_bent = (angle_l < 150) and (angle_r < 150)
-            
-            # CASE 1: AI bảo là Goddess, nhưng có 1 chân thẳng tắp -> Chắc chắn là Tree hoặc Warrior
-            if ai_pose == 'Goddess' and is_one_leg_straight:
-                # Kiểm tra thêm độ rộng chân để phân biệt Tree và Warrior
-                # Tree: Chân khép (khoảng cách 2 mắt cá nhỏ)
-                # Warrior: Chân mở rộng
-                ankle_dist = abs(keypoints[15*2] - keypoints[16*2]) # Khoảng cách x
-                hip_width = abs(keypoints[11*2] - keypoints[12*2])
-                
-                # Nếu khoảng cách 2 chân nhỏ hơn 2 lần vai -> Khả năng cao là Tree
-                if ankle_dist < (hip_width * 2.5):
-                    return 'Tree'
-                else:
-                    return 'Warrior2'
-
-            # CASE 2: AI bảo là Tree, nhưng cả 2 chân đều cong -> Chắc chắn là Goddess
-            if ai_pose == 'Tree' and is_both_legs_bent:
-                return 'Goddess'
-                
+            data = np.asarray(keypoints, dtype=np.float64).reshape(1, 34)
+            return str(self._override_predictions(np.array([ai_pose]), data)[0])
         except Exception:
             # Nếu có lỗi tính toán (do keypoints rác), giữ nguyên kết quả AI
-            pass
-            
-        return ai_pose
+            return ai_pose
+    
+    def _override_predictions(self, ai_poses: np.ndarray, keypoints: np.ndarray) -> np.ndarray:
+        """
+        Phiên bản vector hóa của _override_prediction cho N mẫu.
+        
+        Args:
+            ai_poses: Array (N,) tên tư thế AI dự đoán
+            keypoints: Array (N, 34) keypoints phẳng [x0, y0, ...]
+        
+        Returns:
+            Array (N,) tên tư thế sau khi kiểm tra hình học
+        """
+        kp = keypoints.reshape(len(keypoints), 17, 2)
+        x, y = kp[..., 0], kp[..., 1]
+        
+        # Góc không có eps: chi bị suy biến → NaN → không override (giữ AI)
+        geo = self.geometry.compute(kp, eps=0.0)
+        
+        final = ai_poses.astype(object)
+        decided = np.zeros(len(kp), dtype=bool)
+        
+        # ✅ CASE 0: Kiểm tra cúi xuống (Bent Over) - STRICT!
+        # Nếu AI bảo Goddess nhưng người đang cúi → KHÔNG PHẢI Goddess!
+        is_goddess = ai_poses == 'Goddess'
+        avg_shoulder_y = (y[:, 5] + y[:, 6]) / 2
+        avg_hip_y = (y[:, 11] + y[:, 12]) / 2
+        avg_wrist_y = (y[:, 9] + y[:, 10]) / 2
+        body_height = np.abs(y[:, 5] - y[:, 11])
+        
+        # CHECK 1: Vai thấp hơn hông >15% (cúi rõ ràng)
+        # CHECK 2: Cổ tay thấp hơn hoặc ngang hông (tay không giơ lên = CÚI)
+        is_bent_over = is_goddess & (
+            (avg_shoulder_y > avg_hip_y + (body_height * 0.15)) | (avg_wrist_y >= avg_hip_y)
+        )
+        final[is_bent_over] = 'Unknown'
+        decided |= is_bent_over
+        
+        # ✅ CASE 0.5: Kiểm tra Downdog vs Plank (Hip angle check)
+        # Downdog: Góc nhỏ (70-120°) - hông nâng cao, hình chữ V
+        # Plank: Góc lớn (>140°) - thân ngang, thẳng
+        hip_angle = geo['center_hip']
+        to_plank = ~decided & (ai_poses == 'Downdog') & (hip_angle > 140)
+        to_downdog = ~decided & (ai_poses == 'Plank') & (hip_angle < 120)
+        final[to_plank] = 'Plank'
+        final[to_downdog] = 'Downdog'
+        decided |= to_plank | to_downdog
+        
+        # Logic phân biệt Tree vs Goddess
+        # Tree: 1 chân thẳng (>160), 1 chân gập
+        # Goddess: 2 chân đều gập (<140)
+        angle_l = geo['left_knee']
+        angle_r = geo['right_knee']
+        is_one_leg_straight = (angle_l > 160) | (angle_r > 160)
+        is_both_legs_bent = (angle_l < 150) & (angle_r < 150)
+        
+        # CASE 1: AI bảo là Goddess, nhưng có 1 chân thẳng tắp -> Tree hoặc Warrior
+        # Tree: Chân khép (khoảng cách x 2 mắt cá nhỏ), Warrior: Chân mở rộng
+        case_1 = ~decided & is_goddess & is_one_leg_straight
+        ankle_dist = np.abs(x[:, 15] - x[:, 16])
+        hip_width = np.abs(x[:, 11] - x[:, 12])
+        final[case_1] = np.where(ankle_dist < (hip_width * 2.5), 'Tree', 'Warrior2')[case_1]
+        decided |= case_1
+        
+        # CASE 2: AI bảo là Tree, nhưng cả 2 chân đều cong -> Chắc chắn là Goddess
+        case_2 = ~decided & (ai_poses == 'Tree') & is_both_legs_bent
+        final[case_2] = 'Goddess'
+        
+        return final
+
+    def warmup(self, shapes=((1, 34),), runs: int = 3) -> dict:
+        """
+        Warm up the classifier (MLPoseClassifier.warmup); backend NumPy không cần.
+        
+        Returns:
+            dict {"NxD": {'cold_ms', 'warm_ms'}}, hoặc {} nếu backend không có warmup
+        """
+        warmup = getattr(self.classifier, 'warmup', None)
+        return warmup(shapes, runs) if warmup is not None else {}
 
     def recognize(self, keypoints: List[float]) -> Tuple[str, float]:
         # 1. Chuẩn hóa
@@ -164,5 +162,44 @@ class PoseRecognizer:
         
         return final_pose, confidence
     
+    def recognize_multi(self, keypoints) -> List[Tuple[str, float]]:
+        """
+        Nhận dạng tư thế cho nhiều người trong cùng một frame.
+        
+        Args:
+            keypoints: Array (P, 17, 2), (P, 17, 3) hoặc (P, 34) - keypoints chuẩn hóa
+                       của P người (ví dụ từ PoseDetector.get_keypoints_multi)
+        
+        Returns:
+            List P phần tử (pose_name, confidence)
+        """
+        return self.recognize_batch(keypoints)
+    
+    def recognize_batch(self, keypoints) -> List[Tuple[str, float]]:
+        """
+        Nhận dạng N mẫu keypoints với một lần forward duy nhất.
+        
+        Args:
+            keypoints: Array (N, 17, 2), (N, 17, 3) hoặc (N, 34) - keypoints chuẩn hóa
+        
+        Returns:
+            List N phần tử (pose_name, confidence)
+        """
+        data = np.asarray(keypoints, dtype=np.float32)
+        if data.ndim == 3:
+            data = data[:, :, :2].reshape(len(data), -1)
+        
+        if len(data) == 0:
+            return []
+        
+        # 1. Chuẩn hóa + 2. AI dự đoán (một batch)
+        indices, confidences = self.classifier.predict_batch(self._normalize_keypoints_batch(data))
+        
+        # 3. Kiểm tra logic hình học (vector hóa trên cả batch)
+        ai_poses = np.array(self.classifier.classes)[indices]
+        final_poses = self._override_predictions(ai_poses, data.astype(np.float64))
+        
+        return list(zip(final_poses.tolist(), confidences.tolist()))
+    
     def __call__(self, keypoints: List[float]) -> Tuple[str, float]:
         return self.recognize(keypoints)
\ No newline at end of file
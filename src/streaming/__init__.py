@@ -0,0 +1,9 @@
+"""
+Streaming module - Temporal smoothing, pose-hold events and session statistics over frame streams.
+"""
+
+from .one_euro import OneEuroFilter
+from .pose_stream import PoseStream, PoseStateMachine, IDLE_LABELS
+from .session_stats import SessionStats, PoseStats, format_summary
+
+__all__ = ['OneEuroFilter', 'PoseStream', 'PoseStateMachine', 'SessionStats', 'PoseStats', 'IDLE_LABELS', 'format_summary']
@@ -0,0 +1,95 @@
+"""
+One-Euro Filter - Adaptive low-pass filter for keypoint streams.
+
+Khi người đứng yên (giữ tư thế), cutoff thấp → lọc mạnh, hết rung keypoints;
+khi chuyển động nhanh, cutoff tăng theo vận tốc → ít trễ.
+Casiez et al., "1€ Filter", CHI 2012.
+"""
+
+import math
+import numpy as np
+from typing import Optional
+
+
+class OneEuroFilter:
+    """
+    Vectorized One-Euro filter over an array of keypoints.
+
+    Joints at (0, 0) (not detected) pass through unchanged and restart
+    their filter state when they reappear.
+
+    Example:
+        >>> smoother = OneEuroFilter(freq=30)
+        >>> smoothed = smoother(keypoints, timestamp)   # (17, 2|3) pixels
+    """
+
+    def __init__(self, freq: float = 30.0, min_cutoff: float = 1.0, beta: float = 0.01,
+                 d_cutoff: float = 1.0):
+        """
+        Args:
+            freq: Expected sample rate (Hz), used when no timestamp is given
+            min_cutoff: Cutoff (Hz) when still - lower = smoother, more lag
+            beta: Cutoff increase per pixel/second of speed - higher = less lag
+            d_cutoff: Cutoff (Hz) for the speed estimate
+        """
+        self.freq = freq
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        """Forget state (next sample passes through)."""
+        self._x = None
+        self._dx = None
+        self._t = None
+
+    @staticmethod
+    def _alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def __call__(self, keypoints: np.ndarray, timestamp: Optional[float] = None) -> np.ndarray:
+        """
+        Filter one sample.
+
+        Args:
+            keypoints: Array (17, 2|3) in pixels; a third (confidence) column is kept as is
+            timestamp: Sample time in seconds (default: 1/freq after the previous one)
+
+        Returns:
+            Filtered copy of keypoints
+        """
+        out = np.array(keypoints, dtype=np.float64)
+        x = out[..., :2]
+        found = (x != 0).any(axis=-1)
+
+        if self._x is None:
+            self._x = x.copy()
+            self._dx = np.zeros_like(x)
+            self._t = timestamp
+            return out
+
+        dt = 1.0 / self.freq
+        if timestamp is not None and self._t is not None and timestamp > self._t:
+            dt = timestamp - self._t
+        self._t = timestamp
+
+        # Khớp mới xuất hiện lại: bắt đầu từ giá trị hiện tại
+        fresh = found & ~(self._x != 0).any(axis=-1)
+        self._x[fresh] = x[fresh]
+        self._dx[fresh] = 0
+
+        dx = (x - self._x) / dt
+        dx_hat = self._dx + self._alpha(self.d_cutoff, dt) * (dx - self._dx)
+        cutoff = self.min_cutoff + self.beta * np.abs(dx_hat)
+        alpha = 1.0 / (1.0 + 1.0 / (2 * math.pi * cutoff * dt))
+        x_hat = self._x + alpha * (x - self._x)
+
+        # Khớp mất (0, 0): giữ nguyên 0 và quên trạng thái
+        x_hat[~found] = 0
+        dx_hat[~found] = 0
+        self._x, self._dx = x_hat, dx_hat
+
+        out[..., :2] = x_hat
+        return out
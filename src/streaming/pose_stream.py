@@ -0,0 +1,202 @@
+"""
+Pose Stream - Temporal smoothing and pose-hold state machine.
+
+Nhận dạng và chấm điểm từng frame độc lập nên nhãn/điểm nhấp nháy. Mỗi người
+được giữ một ring buffer nhãn/điểm cố định; nhãn ổn định được bầu theo cửa sổ,
+và chỉ phát sự kiện khi vào / giữ / thoát tư thế.
+"""
+
+import numpy as np
+from typing import Dict, List, Optional
+
+from .one_euro import OneEuroFilter
+
+
+# Nhãn không phải tư thế (không vào state machine)
+IDLE_LABELS = ('NO POSE', 'Unknown', 'Loading')
+
+
+class PoseStateMachine:
+    """
+    Majority vote over a label window, with entered/held/exited events.
+
+    A pose is entered once it fills at least enter_ratio of the window and
+    exited when its share drops below exit_ratio (hysteresis), so single
+    misclassified frames never flip the label.
+
+    Example:
+        >>> machine = PoseStateMachine(window=15)
+        >>> state = machine.update(t, 'Plank', 82, 'Tốt')
+        >>> for event in state['events']:
+        ...     print(event['type'], event['pose'], event['duration'])
+    """
+
+    def __init__(self, window: int = 15, enter_ratio: float = 0.6, exit_ratio: float = 0.3,
+                 hold_interval: float = 5.0, score_step: int = 2):
+        """
+        Args:
+            window: Ring buffer size (frames) for votes and score averaging
+            enter_ratio: Min share of the window to enter a pose
+            exit_ratio: Leave the current pose when its share drops below this
+            hold_interval: Seconds between 'held' events while in a pose
+            score_step: Min smoothed-score change that counts as a state change
+        """
+        self.window = window
+        self.enter_ratio = enter_ratio
+        self.exit_ratio = exit_ratio
+        self.hold_interval = hold_interval
+        self.score_step = score_step
+        self._vocab: Dict[str, int] = {}
+        self.reset()
+
+    def reset(self):
+        """Clear the window and leave any pose (no event)."""
+        self._labels = np.full(self.window, -1, dtype=np.int64)
+        self._scores = np.zeros(self.window, dtype=np.float64)
+        self._head = 0
+        self._count = 0
+        self.pose = None
+        self.entered_at = None
+        self._last_held = None
+        self._shown = None   # (pose, score, feedback) lần cuối báo changed
+        self._feedback = ""
+
+    def _label_id(self, label: str) -> int:
+        if label in IDLE_LABELS:
+            return -1
+        return self._vocab.setdefault(label, len(self._vocab))
+
+    def _event(self, kind: str, pose: str, timestamp: float) -> dict:
+        return {'type': kind, 'pose': pose, 'time': timestamp,
+                'duration': timestamp - self.entered_at}
+
+    def update(self, timestamp: float, pose: str, score: float = 0, feedback: str = "") -> dict:
+        """
+        Push one frame's raw result.
+
+        Args:
+            timestamp: Frame time in seconds
+            pose: Raw label of this frame ('NO POSE' when nobody was found)
+            score: Raw 0-100 score of this frame
+            feedback: Raw feedback of this frame
+
+        Returns:
+            dict with stable 'pose' ('NO POSE' when idle), smoothed 'score',
+            'feedback', hold 'duration' (s), 'events' (list of dicts) and
+            'changed' (True when the UI should refresh)
+        """
+        label = self._label_id(pose)
+        self._labels[self._head] = label
+        self._scores[self._head] = score
+        self._head = (self._head + 1) % self.window
+        self._count = min(self._count + 1, self.window)
+
+        labels = self._labels[:self._count] if self._count < self.window else self._labels
+        votes = np.bincount(labels[labels >= 0], minlength=len(self._vocab))
+        events = []
+
+        current = self._vocab.get(self.pose, -1) if self.pose is not None else -1
+        if current >= 0 and votes[current] < self.exit_ratio * self.window:
+            events.append(self._event('exited', self.pose, timestamp))
+            self.pose, current = None, -1
+
+        if len(votes) and votes.max() >= self.enter_ratio * self.window:
+            winner = int(votes.argmax())
+            if winner != current:
+                if current >= 0:
+                    events.append(self._event('exited', self.pose, timestamp))
+                self.pose = list(self._vocab)[winner]
+                self.entered_at = self._last_held = timestamp
+                events.append(self._event('entered', self.pose, timestamp))
+
+        if self.pose is not None:
+            if timestamp - self._last_held >= self.hold_interval:
+                self._last_held = timestamp
+                events.append(self._event('held', self.pose, timestamp))
+            if label == self._vocab[self.pose]:
+                self._feedback = feedback
+            mask = labels == self._vocab[self.pose]
+            scores = self._scores[:self._count] if self._count < self.window else self._scores
+            smoothed = int(round(scores[mask].mean())) if mask.any() else 0
+            state = (self.pose, smoothed, self._feedback)
+            duration = timestamp - self.entered_at
+        else:
+            state = ('NO POSE', 0, feedback if pose in IDLE_LABELS else self._feedback)
+            duration = 0.0
+
+        changed = (self._shown is None or state[0] != self._shown[0] or state[2] != self._shown[2]
+                   or abs(state[1] - self._shown[1]) >= self.score_step)
+        if changed:
+            self._shown = state
+
+        return {'pose': state[0], 'score': state[1], 'feedback': state[2],
+                'duration': duration, 'events': events, 'changed': changed}
+
+
+class PoseStream:
+    """
+    Per-person keypoint smoothing and pose state, keyed by track id.
+
+    Example:
+        >>> stream = PoseStream(fps=30)
+        >>> smoothed = stream.smooth(0, t, keypoints.data[0])
+        >>> pose, conf = recognizer.recognize(...)        # on smoothed keypoints
+        >>> state = stream.update(0, t, pose, score, feedback)
+        >>> if state['changed']:
+        ...     update_ui(state['pose'], state['score'], state['feedback'])
+    """
+
+    def __init__(self, fps: float = 30.0, window: int = 15, min_cutoff: float = 1.0,
+                 beta: float = 0.01, **state_kwargs):
+        """
+        Args:
+            fps: Stream frame rate (for the filter when timestamps are missing)
+            window: Vote / score window per person (frames)
+            min_cutoff: One-Euro cutoff when still (Hz)
+            beta: One-Euro speed coefficient
+            **state_kwargs: Extra PoseStateMachine arguments
+        """
+        self.fps = fps
+        self.window = window
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.state_kwargs = state_kwargs
+        self._filters: Dict[int, OneEuroFilter] = {}
+        self._machines: Dict[int, PoseStateMachine] = {}
+
+    def smooth(self, person: int, timestamp: Optional[float], keypoints: np.ndarray) -> np.ndarray:
+        """
+        One-Euro filter a person's keypoints.
+
+        Args:
+            person: Track id
+            timestamp: Frame time in seconds
+            keypoints: Array (17, 2|3) in pixels
+
+        Returns:
+            Smoothed copy (same shape)
+        """
+        if person not in self._filters:
+            self._filters[person] = OneEuroFilter(self.fps, self.min_cutoff, self.beta)
+        return self._filters[person](keypoints, timestamp)
+
+    def update(self, person: int, timestamp: float, pose: str, score: float = 0,
+               feedback: str = "") -> dict:
+        """Push a person's raw label/score (see PoseStateMachine.update)."""
+        if person not in self._machines:
+            self._machines[person] = PoseStateMachine(self.window, **self.state_kwargs)
+        return self._machines[person].update(timestamp, pose, score, feedback)
+
+    def lost(self, person: int):
+        """Person not visible this frame: drop its filter state (keypoints jump on return)."""
+        if person in self._filters:
+            self._filters[person].reset()
+
+    def people(self) -> List[int]:
+        """Track ids seen so far."""
+        return sorted(self._machines)
+
+    def reset(self):
+        """Forget everyone (new video)."""
+        self._filters.clear()
+        self._machines.clear()
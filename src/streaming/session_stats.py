@@ -0,0 +1,163 @@
+"""
+Session Stats - Incremental per-session statistics.
+
+Cập nhật từng frame từ thread xử lý, truy vấn bất cứ lúc nào từ UI mà không
+cần lưu lại các frame: mỗi tư thế chỉ giữ vài số đếm, một histogram 101 ô
+(điểm 0-100) cho percentile và bộ đếm lỗi. Bộ nhớ không đổi dù video dài bao lâu.
+"""
+
+import threading
+import numpy as np
+from collections import Counter
+from typing import Dict, Iterable, Optional
+
+from .pose_stream import IDLE_LABELS
+
+
+class PoseStats:
+    """
+    Running statistics of one pose (O(1) memory).
+
+    Scores are 0-100 integers, so a 101-bin histogram gives exact percentiles.
+    """
+
+    def __init__(self):
+        self.frames = 0
+        self.seconds = 0.0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.histogram = np.zeros(101, dtype=np.int64)
+        self.issues = Counter()
+
+    def add(self, score: float, issues: Iterable[str] = (), seconds: float = 0.0):
+        """Add one frame."""
+        score = float(min(100, max(0, score)))
+        self.frames += 1
+        self.seconds += seconds
+        self.total += score
+        self.min = score if self.min is None else min(self.min, score)
+        self.max = score if self.max is None else max(self.max, score)
+        self.histogram[int(round(score))] += 1
+        self.issues.update(issues)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.frames if self.frames else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Nearest-rank percentile (q in 0-100) from the histogram."""
+        if self.frames == 0:
+            return 0.0
+        rank = max(1, int(np.ceil(q / 100 * self.frames)))
+        return float(np.searchsorted(np.cumsum(self.histogram), rank))
+
+    def summary(self, top_issues: int = 5) -> dict:
+        """Plain-dict snapshot (JSON-serializable)."""
+        return {
+            'frames': self.frames,
+            'seconds': round(self.seconds, 2),
+            'mean': round(self.mean, 1),
+            'min': self.min,
+            'max': self.max,
+            'p10': self.percentile(10),
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'issues': self.issues.most_common(top_issues),
+        }
+
+
+class SessionStats:
+    """
+    Thread-safe aggregator of a whole session (one student / one video).
+
+    Example:
+        >>> stats = SessionStats(fps=30)
+        >>> stats.update('Plank', 82, ('hông quá cao',))   # processing thread, per frame
+        >>> stats.update(None)                              # frame without a pose
+        >>> print(stats.summary()['poses']['Plank']['p50'])  # any thread, any time
+    """
+
+    def __init__(self, fps: float = 30.0):
+        """
+        Args:
+            fps: Frame rate; each update() counts 1/fps seconds unless told otherwise
+        """
+        self.frame_time = 1.0 / fps
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Start a new session."""
+        with self._lock:
+            self._poses: Dict[str, PoseStats] = {}
+            self.frames = 0
+            self.seconds = 0.0
+
+    def update(self, pose: Optional[str], score: float = 0, issues: Iterable[str] = (),
+               seconds: Optional[float] = None):
+        """
+        Add one frame.
+
+        Args:
+            pose: Pose held this frame (None / 'NO POSE' / 'Unknown' = only session time)
+            score: 0-100 score of the frame
+            issues: Issue names reported by PoseEvaluator for the frame
+            seconds: Frame duration (default: 1/fps)
+        """
+        seconds = self.frame_time if seconds is None else seconds
+        with self._lock:
+            self.frames += 1
+            self.seconds += seconds
+            if pose is None or pose in IDLE_LABELS:
+                return
+            if pose not in self._poses:
+                self._poses[pose] = PoseStats()
+            self._poses[pose].add(score, issues, seconds)
+
+    def pose(self, name: str) -> Optional[dict]:
+        """Summary of one pose, or None if it was never held."""
+        with self._lock:
+            stats = self._poses.get(name)
+            return stats.summary() if stats is not None else None
+
+    def summary(self, top_issues: int = 5) -> dict:
+        """
+        Snapshot of the whole session.
+
+        Returns:
+            dict: frames, seconds, active_seconds (time in any pose) and
+            poses {name: {frames, seconds, mean, min, max, p10, p50, p90, issues}}
+            ordered by time spent
+        """
+        with self._lock:
+            poses = sorted(self._poses.items(), key=lambda item: -item[1].seconds)
+            return {
+                'frames': self.frames,
+                'seconds': round(self.seconds, 2),
+                'active_seconds': round(sum(s.seconds for _, s in poses), 2),
+                'poses': {name: stats.summary(top_issues) for name, stats in poses},
+            }
+
+    def format(self) -> str:
+        """Human-readable multi-line summary (logs / dialogs)."""
+        return format_summary(self.summary(top_issues=3))
+
+
+def format_summary(summary: dict) -> str:
+    """
+    Render a SessionStats.summary() dict as text.
+
+    Args:
+        summary: Output of SessionStats.summary() (e.g. from VideoPipeline.run)
+
+    Returns:
+        Multi-line string, one line per pose plus its top issues
+    """
+    lines = [f"⏱ {summary['seconds']:.0f}s, trong tư thế {summary['active_seconds']:.0f}s"]
+    for name, stats in summary['poses'].items():
+        lines.append(f"🧘 {name}: {stats['seconds']:.0f}s, điểm TB {stats['mean']:.0f} "
+                     f"(min {stats['min']:.0f}, p50 {stats['p50']:.0f}, max {stats['max']:.0f})")
+        for issue, count in stats['issues'][:3]:
+            lines.append(f"   ⚠️ {issue}: {count} frame")
+    return "\n".join(lines)
@@ -0,0 +1,7 @@
+"""
+Tracking module - Propagate keypoints between detector frames.
+"""
+
+from .keypoint_tracker import KeypointTracker, KeypointExtrapolator
+
+__all__ = ['KeypointTracker', 'KeypointExtrapolator']
@@ -0,0 +1,226 @@
+"""
+Keypoint Tracker - Lucas-Kanade optical flow between full detections.
+
+Trong một tư thế yoga giữ yên, keypoints gần như không đổi giữa các frame,
+nên chỉ cần chạy YOLOv8 mỗi K frame (hoặc khi tracking kém đi); các frame
+giữa được bám theo bằng optical flow trên vùng nhỏ quanh từng khớp.
+"""
+
+import sys
+import cv2
+import numpy as np
+from pathlib import Path
+from typing import Optional, Tuple
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from detection.pose_keypoints import PoseKeypoints
+
+
+class KeypointExtrapolator:
+    """
+    Constant-velocity keypoints for frames that were not inferred.
+
+    Example:
+        >>> extrapolator = KeypointExtrapolator()
+        >>> extrapolator.update(10, keypoints.data[0])   # inferred frame
+        >>> predicted = extrapolator.predict(11)          # skipped frame, (17, 3)
+    """
+
+    def __init__(self, max_gap: int = 10):
+        """
+        Args:
+            max_gap: Stop predicting this many frames after the last inference
+        """
+        self.max_gap = max_gap
+        self._history = []  # [(index, keypoints (17, 3))], tối đa 2 phần tử
+
+    def update(self, index: int, keypoints: Optional[np.ndarray]):
+        """
+        Store keypoints from an inferred frame (None = no person → forget).
+
+        Args:
+            index: Frame number
+            keypoints: Array (17, 2|3) in pixels, or None
+        """
+        if keypoints is None:
+            self._history.clear()
+            return
+        self._history = (self._history + [(index, np.asarray(keypoints, dtype=np.float64))])[-2:]
+
+    def predict(self, index: int) -> Optional[np.ndarray]:
+        """
+        Keypoints for a skipped frame.
+
+        Args:
+            index: Frame number (after the last update)
+
+        Returns:
+            Array like the stored keypoints, or None if nothing to extrapolate from
+        """
+        if not self._history:
+            return None
+        last_index, last = self._history[-1]
+        gap = index - last_index
+        if gap > self.max_gap:
+            return None
+        if len(self._history) < 2 or gap <= 0:
+            return last.copy()
+
+        prev_index, prev = self._history[0]
+        velocity = (last[:, :2] - prev[:, :2]) / (last_index - prev_index)
+        predicted = last.copy()
+        predicted[:, :2] += velocity * gap
+
+        # Điểm không detect được (0, 0) giữ nguyên
+        missing = (last[:, :2] == 0).all(axis=1) | (prev[:, :2] == 0).all(axis=1)
+        predicted[missing, :2] = last[missing, :2]
+        return predicted
+
+
+class KeypointTracker:
+    """
+    Track one person's keypoints with pyramidal Lucas-Kanade optical flow.
+
+    Joints are tracked forward and backward; a joint counts as tracked when
+    the round trip lands within fb_threshold pixels and its patch still
+    matches (LK error below max_error). Lost joints fall back to a
+    constant-velocity prediction with decayed confidence.
+
+    Example:
+        >>> tracker = KeypointTracker(max_age=15)
+        >>> if tracker.needs_detection():
+        ...     keypoints = detector.get_pose_keypoints(detector.predict(frame))
+        ...     tracker.init(frame, keypoints)
+        ... else:
+        ...     keypoints = tracker.track(frame)
+    """
+
+    def __init__(self,
+                 max_age: int = 15,
+                 min_confidence: float = 0.6,
+                 min_keypoint_conf: float = 0.3,
+                 win_size: Tuple[int, int] = (21, 21),
+                 max_level: int = 2,
+                 fb_threshold: float = 2.0,
+                 max_error: float = 8.0,
+                 lost_decay: float = 0.5):
+        """
+        Initialize tracker.
+
+        Args:
+            max_age: Force a detection after this many tracked frames
+            min_confidence: Force a detection when fewer than this fraction of joints track
+            min_keypoint_conf: Only joints at least this confident are tracked
+            win_size: LK search window per pyramid level
+            max_level: LK pyramid levels
+            fb_threshold: Max forward-backward error (pixels) for a good track
+            max_error: Max mean patch difference (gray levels) for a good track
+            lost_decay: Confidence multiplier for joints that failed to track
+        """
+        self.max_age = max_age
+        self.min_confidence = min_confidence
+        self.min_keypoint_conf = min_keypoint_conf
+        self.fb_threshold = fb_threshold
+        self.max_error = max_error
+        self.lost_decay = lost_decay
+        self.lk_params = dict(
+            winSize=win_size,
+            maxLevel=max_level,
+            criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03),
+        )
+        self._motion = KeypointExtrapolator(max_gap=max_age)
+        self.reset()
+
+    def reset(self):
+        """Forget the current track (next frame needs a detection)."""
+        self._gray = None
+        self._keypoints = None
+        self._box = None
+        self._index = 0
+        self.age = 0
+        self.confidence = 0.0
+        self._motion.update(0, None)
+
+    @staticmethod
+    def _to_gray(frame: np.ndarray) -> np.ndarray:
+        return frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+    def needs_detection(self) -> bool:
+        """True when there is no usable track: none yet, too old, or too many joints lost."""
+        return (self._keypoints is None or self.age >= self.max_age
+                or self.confidence < self.min_confidence)
+
+    def init(self, frame: np.ndarray, keypoints: Optional[PoseKeypoints], person: int = 0):
+        """
+        Start (or restart) tracking from a full detection.
+
+        Args:
+            frame: BGR frame the detection ran on
+            keypoints: Detector output for that frame (None = no person)
+            person: Which person to track
+        """
+        if keypoints is None or len(keypoints) <= person:
+            self.reset()
+            return
+
+        self._gray = self._to_gray(frame)
+        self._keypoints = keypoints.data[person].astype(np.float32).copy()
+        self._box = keypoints.boxes[person].copy() if keypoints.boxes is not None else None
+        self._index += 1
+        self._motion.update(self._index, self._keypoints)
+        self.age = 0
+        self.confidence = 1.0
+
+    def track(self, frame: np.ndarray) -> Optional[PoseKeypoints]:
+        """
+        Propagate the last keypoints onto a new frame.
+
+        Args:
+            frame: Next BGR frame (same size as the previous one)
+
+        Returns:
+            PoseKeypoints with one person (tracked), or None if there is no track
+        """
+        if self._keypoints is None:
+            return None
+
+        gray = self._to_gray(frame)
+        data = self._keypoints.copy()
+        self._index += 1
+
+        valid = (data[:, 2] >= self.min_keypoint_conf) & (data[:, :2] != 0).any(axis=1)
+        good = np.zeros(len(data), dtype=bool)
+
+        if valid.any():
+            p0 = data[valid, None, :2].astype(np.float32)
+            p1, status, error = cv2.calcOpticalFlowPyrLK(self._gray, gray, p0, None, **self.lk_params)
+            back, status_back, _ = cv2.calcOpticalFlowPyrLK(gray, self._gray, p1, None, **self.lk_params)
+            fb_error = np.abs(p0 - back).reshape(-1, 2).max(axis=1)
+            ok = ((status.ravel() == 1) & (status_back.ravel() == 1)
+                  & (fb_error < self.fb_threshold) & (error.ravel() < self.max_error))
+
+            rows = np.flatnonzero(valid)
+            good[rows[ok]] = True
+            data[rows[ok], :2] = p1.reshape(-1, 2)[ok]
+
+            # Dời box theo chuyển động trung vị của các khớp bám được
+            if self._box is not None and ok.any():
+                shift = np.median(p1.reshape(-1, 2)[ok] - p0.reshape(-1, 2)[ok], axis=0)
+                self._box = self._box + np.tile(shift, 2)
+
+        # Khớp bị mất: ngoại suy vận tốc, giảm confidence
+        lost = valid & ~good
+        if lost.any():
+            predicted = self._motion.predict(self._index)
+            if predicted is not None:
+                data[lost, :2] = predicted[lost, :2]
+            data[lost, 2] *= self.lost_decay
+
+        self.confidence = good.sum() / max(1, valid.sum())
+        self.age += 1
+        self._gray = gray
+        self._keypoints = data
+        self._motion.update(self._index, data)
+
+        boxes = self._box[None] if self._box is not None else None
+        return PoseKeypoints(data[None], gray.shape[:2], boxes=boxes)
@@ -4,5 +4,7 @@ Visualization module - Drawing skeleton and UI overlay.
 
 from .skeleton_drawer import SkeletonDrawer
 from .overlay_ui import OverlayUI
+from .text_renderer import TextRenderer
+from .sprite_cache import SpriteCache
 
-__all__ = ['SkeletonDrawer', 'OverlayUI']
+__all__ = ['SkeletonDrawer', 'OverlayUI', 'TextRenderer', 'SpriteCache']
@@ -2,13 +2,14 @@
 Overlay UI - Draw score and feedback overlay on frame.
 
 Displays pose name, score, and feedback message on image with adaptive scaling.
-Supports Vietnamese text using PIL.
+Supports Vietnamese text using PIL (via TextRenderer).
 """
 
 import cv2
 import numpy as np
 from typing import Tuple, List
-from PIL import Image, ImageDraw, ImageFont
+
+from .text_renderer import TextRenderer
 
 
 class OverlayUI:
@@ -30,7 +31,8 @@ class OverlayUI:
     def __init__(self, 
                  base_panel_width: int = 350,
                  base_panel_height: int = 120,
-                 alpha: float = 0.7):
+                 alpha: float = 0.7,
+                 sprite_cache_size: int = 256):
         """
         Initialize overlay UI with base dimensions (for ~720p resolution).
         
@@ -38,6 +40,7 @@ class OverlayUI:
             base_panel_width: Width of info panel at base resolution
             base_panel_height: Height of info panel at base resolution
             alpha: Transparency (0=transparent, 1=opaque)
+            sprite_cache_size: Max cached text sprites (0 = re-render every frame)
         """
         self.base_panel_width = base_panel_width
         self.base_panel_height = base_panel_height
@@ -49,6 +52,12 @@ class OverlayUI:
         self.excellent_color = (0, 255, 0)  # Green
         self.good_color = (0, 165, 255)  # Orange
         self.poor_color = (0, 0, 255)  # Red
+
+        # Font cache + sprite cache (LRU) cho chữ lặp lại + vẽ theo ROI
+        self.text_renderer = TextRenderer(cache_size=sprite_cache_size)
+
+        # Buffer nền panel theo kích thước (panel đổi size theo độ phân giải)
+        self._panel_buffers = {}
     
     def get_score_color(self, score: int) -> Tuple[int, int, int]:
         """Get color based on score."""
@@ -63,11 +72,31 @@ class OverlayUI:
                                    frame: np.ndarray,
                                    x: int, y: int,
                                    width: int, height: int) -> np.ndarray:
-        """Draw semi-transparent background panel."""
-        overlay = frame.copy()
-        cv2.rectangle(overlay, (x, y), (x + width, y + height), self.bg_color, -1)
-        cv2.addWeighted(overlay, self.alpha, frame, 1 - self.alpha, 0, frame)
+        """
+        Draw semi-transparent background panel (in place).
+
+        Chỉ trộn trong vùng panel (không copy/addWeighted cả frame), dùng
+        buffer màu nền cấp phát sẵn theo kích thước panel.
+        """
+        fh, fw = frame.shape[:2]
+        # cv2.rectangle tính cả điểm cuối → +1
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + width + 1, fw), min(y + height + 1, fh)
+        if x0 >= x1 or y0 >= y1:
+            return frame
+
+        roi = frame[y0:y1, x0:x1]
+        cv2.addWeighted(self._panel_buffer(roi.shape), self.alpha, roi, 1 - self.alpha, 0, dst=roi)
         return frame
+
+    def _panel_buffer(self, shape) -> np.ndarray:
+        """Solid bg_color buffer of the given shape (one per panel size)."""
+        buffer = self._panel_buffers.get(shape)
+        if buffer is None:
+            buffer = np.empty(shape, dtype=np.uint8)
+            buffer[:] = self.bg_color
+            self._panel_buffers[shape] = buffer
+        return buffer
     
     def draw_score_bar(self,
                       frame: np.ndarray,
@@ -107,32 +136,7 @@ class OverlayUI:
         Returns:
             Frame with text drawn
         """
-        # Convert BGR to RGB for PIL
-        img_pil = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
-        draw = ImageDraw.Draw(img_pil)
-        
-        # Try to load a Unicode font (DejaVu supports Vietnamese)
-        try:
-            # Try system fonts that support Vietnamese
-            font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", font_size)
-        except:
-            try:
-                font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", font_size)
-            except:
-                # Fallback to default
-                font = ImageFont.load_default()
-        
-        # Convert BGR to RGB for PIL
-        color_rgb = (color[2], color[1], color[0])
-        
-        # Draw text
-        draw.text(position, text, font=font, fill=color_rgb)
-        
-        # Convert back to BGR for OpenCV
-        frame_rgb = np.array(img_pil)
-        frame_bgr = cv2.cvtColor(frame_rgb, cv2.COLOR_RGB2BGR)
-        
-        return frame_bgr
+        return self.text_renderer.draw(frame, [text], position, font_size, color)
     
     def draw_scoreboard(self,
                        frame: np.ndarray,
@@ -227,15 +231,15 @@ class OverlayUI:
         curr_y = y1 + int(40 * scale)
         
         # 1. Tên tư thế
-        cv2.putText(frame, header_text, (curr_x, curr_y),
-                   font_face, font_scale_header, self.text_color, thickness_header, cv2.LINE_AA)
+        self.text_renderer.draw_hershey(frame, header_text, (curr_x, curr_y),
+                                        font_face, font_scale_header, self.text_color, thickness_header)
         
         # 2. Điểm số (Căn phải)
         score_color = self.get_score_color(score)
         (sw, sh), _ = cv2.getTextSize(score_text, font_face, font_scale_header, thickness_header)
         score_x = x1 + panel_w - sw - int(20 * scale)
-        cv2.putText(frame, score_text, (score_x, curr_y),
-                   font_face, font_scale_header, score_color, thickness_header, cv2.LINE_AA)
+        self.text_renderer.draw_hershey(frame, score_text, (score_x, curr_y),
+                                        font_face, font_scale_header, score_color, thickness_header)
         
         # 3. Thanh tiến trình (Progress Bar)
         curr_y += int(15 * scale)
@@ -247,16 +251,16 @@ class OverlayUI:
         curr_y += int(35 * scale)
         font_size = int(16 * scale)  # Convert font_scale to pixel size
         
-        for line in feedback_lines:
-            frame = self.put_vietnamese_text(
-                frame, 
-                line, 
-                (curr_x, curr_y - font_size),  # Adjust Y for PIL rendering
-                font_size, 
-                (220, 220, 220)
-            )
-            curr_y += line_spacing
-            
+        # Vẽ tất cả các dòng một lần vào patch nhỏ rồi trộn vào ROI
+        frame = self.text_renderer.draw(
+            frame,
+            feedback_lines,
+            (curr_x, curr_y - font_size),  # Adjust Y for PIL rendering
+            font_size,
+            (220, 220, 220),
+            line_spacing
+        )
+        
         return frame
     
     def draw_fps(self, frame: np.ndarray, fps: float) -> np.ndarray:
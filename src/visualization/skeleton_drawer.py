@@ -23,11 +23,13 @@ class SkeletonDrawer:
     Features:
     - COCO skeleton connections (17 keypoints)
     - Color-coding based on score (Green/Orange/Red)
-    - Keypoint markers
+    - Keypoint markers (anti-aliased sprite rendered once, stamped with NumPy)
+    - Multi-person batch drawing (one polylines call per color)
     
     Example:
         >>> drawer = SkeletonDrawer()
         >>> result = drawer.draw(frame, keypoints, score=85)
+        >>> result = drawer.draw_batch(frame, keypoints_multi, scores)  # (P, 17, 2)
     """
     
     def __init__(self, config: dict = None):
@@ -41,6 +43,8 @@ class SkeletonDrawer:
         self.skeleton = COCO_SKELETON
         self.thickness = self.config.get('skeleton_thickness', 3)
         self.keypoint_radius = self.config.get('keypoint_radius', 5)
+        self._edges = np.array(self.skeleton, dtype=np.intp)
+        self._markers = {}  # (color, radius) → sprite của keypoint marker
     
     def get_color(self, score: int) -> Tuple[int, int, int]:
         """
@@ -59,87 +63,241 @@ class SkeletonDrawer:
         else:
             return (0, 0, 255)  # Red - Needs work
     
+    @staticmethod
+    def _as_array(keypoints) -> np.ndarray:
+        """List of (x, y) tuples / (17, 2|3) / (P, 17, 2|3) → int32 (P, 17, 2)."""
+        points = np.asarray(keypoints)
+        if points.ndim == 2:
+            points = points[None]
+        if points.ndim != 3 or points.shape[1] != 17:
+            raise ValueError(f"Expected 17 keypoints, got shape {points.shape}")
+        return points[..., :2].astype(np.int32)
+
     def draw_skeleton(self, 
                      frame: np.ndarray, 
-                     keypoints: List[Tuple[int, int]], 
+                     keypoints, 
                      color: Tuple[int, int, int]) -> np.ndarray:
         """
         Draw skeleton connections on frame.
         
         Args:
             frame: Image to draw on
-            keypoints: List of 17 (x, y) tuples
+            keypoints: List of 17 (x, y) tuples, or array (17, 2) / (P, 17, 2)
             color: BGR color
         
         Returns:
             Frame with skeleton drawn
         """
-        if len(keypoints) != 17:
-            raise ValueError(f"Expected 17 keypoints, got {len(keypoints)}")
-        
-        # Draw connections
-        for (i, j) in self.skeleton:
-            pt1 = keypoints[i]
-            pt2 = keypoints[j]
-            
-            # Skip if either point is invalid (0, 0)
-            if pt1 == (0, 0) or pt2 == (0, 0):
-                continue
-            
-            # Draw line
-            cv2.line(frame, pt1, pt2, color, self.thickness, cv2.LINE_AA)
-        
+        points = self._as_array(keypoints)
+        segments = self._segments(points)
+        if len(segments):
+            # Tất cả đoạn cùng màu trong một lần gọi
+            cv2.polylines(frame, list(segments), False, color, self.thickness, cv2.LINE_AA)
         return frame
+
+    def _segments(self, points: np.ndarray) -> np.ndarray:
+        """Valid limb segments (M, 2, 2); skip limbs with an invalid (0, 0) end."""
+        starts = points[:, self._edges[:, 0]]
+        ends = points[:, self._edges[:, 1]]
+        valid = (starts != 0).any(axis=-1) & (ends != 0).any(axis=-1)
+        return np.stack([starts, ends], axis=2)[valid]
     
     def draw_keypoints(self,
                       frame: np.ndarray,
-                      keypoints: List[Tuple[int, int]],
+                      keypoints,
                       color: Tuple[int, int, int]) -> np.ndarray:
         """
         Draw keypoint markers on frame.
         
         Args:
             frame: Image to draw on
-            keypoints: List of 17 (x, y) tuples
+            keypoints: List of 17 (x, y) tuples, or array (17, 2) / (P, 17, 2)
             color: BGR color
         
         Returns:
             Frame with keypoints drawn
         """
-        for pt in keypoints:
-            # Skip invalid points
-            if pt == (0, 0):
-                continue
-            
-            # Draw filled circle
-            cv2.circle(frame, pt, self.keypoint_radius, color, -1, cv2.LINE_AA)
-            # Draw border
-            cv2.circle(frame, pt, self.keypoint_radius, (255, 255, 255), 1, cv2.LINE_AA)
-        
+        points = self._as_array(keypoints).reshape(-1, 2).astype(np.intp)
+        points = points[(points != 0).any(axis=-1)]  # Skip invalid points
+        if len(points) == 0:
+            return frame
+
+        offsets, premultiplied, transmit = self._marker(color, self.keypoint_radius)
+        half = int(np.abs(offsets).max())
+        h, w = frame.shape[:2]
+        x, y = points[:, 0], points[:, 1]
+
+        # Thứ tự lớp như cv2.circle lần lượt: marker chồng lên marker trước nó
+        # được trộn ở lượt sau; trong một lượt không có 2 marker chồng nhau
+        wave = self._marker_waves(x, y, 2 * half)
+        order = np.argsort(wave, kind='stable')
+        ends = np.cumsum(np.bincount(wave))
+
+        if frame.flags.c_contiguous:
+            # Chỉ số phẳng của mọi pixel marker tính một lần; mỗi lượt một
+            # gather → trộn (uint16, >> 8) → scatter
+            flat = frame.reshape(-1)
+            channels = frame.shape[2]
+            pixels = ((offsets[:, 0] * w + offsets[:, 1]) * channels)[:, None] + np.arange(channels)
+            index = ((y * w + x) * channels)[:, None] + pixels.reshape(-1)
+            premultiplied = np.repeat(premultiplied.reshape(1, -1), len(points), axis=0)
+            transmit = np.repeat(transmit.reshape(1, -1), len(points), axis=0)
+
+            inside = ((x >= half) & (x < w - half) & (y >= half) & (y < h - half)).all()
+            if not inside:
+                # Sát biên: bỏ các pixel nằm ngoài frame
+                ys = (y[:, None] + offsets[:, 0]).repeat(channels, axis=1)
+                xs = (x[:, None] + offsets[:, 1]).repeat(channels, axis=1)
+                valid = (ys >= 0) & (ys < h) & (xs >= 0) & (xs < w)
+            start = 0
+            for end in ends:
+                rows = order[start:end]
+                start = end
+                if inside:
+                    idx, pre, trans = index[rows], premultiplied[rows], transmit[rows]
+                else:
+                    ok = valid[rows]
+                    idx, pre, trans = index[rows][ok], premultiplied[rows][ok], transmit[rows][ok]
+                flat[idx] = ((flat.take(idx) * trans + pre) >> 8).astype(np.uint8)
+            return frame
+
+        # Frame là view không liên tục (ROI): chỉ số 2D
+        start = 0
+        for end in ends:
+            ys = y[order[start:end], None] + offsets[:, 0]
+            xs = x[order[start:end], None] + offsets[:, 1]
+            valid = (ys >= 0) & (ys < h) & (xs >= 0) & (xs < w)
+            k = np.nonzero(valid)[1]
+            ys, xs = ys[valid], xs[valid]
+            frame[ys, xs] = ((frame[ys, xs] * transmit[k] + premultiplied[k]) >> 8).astype(np.uint8)
+            start = end
+        return frame
+
+    @staticmethod
+    def _marker_waves(x: np.ndarray, y: np.ndarray, span: int) -> np.ndarray:
+        """
+        Drawing pass of each marker: later than every earlier marker it overlaps.
+
+        Args:
+            x, y: Marker centers (N,) in drawing order
+            span: Centers closer than this (per axis) may overlap
+
+        Returns:
+            Array (N,) of pass indices (0 = no earlier marker underneath)
+        """
+        x, y = x.astype(np.int32), y.astype(np.int32)
+        near = np.abs(x[:, None] - x) <= span
+        near &= np.abs(y[:, None] - y) <= span
+        order = np.arange(len(x))
+        earlier = near & (order[:, None] > order)  # Chỉ marker vẽ trước
+        wave = np.zeros(len(x), dtype=np.intp)
+        stacked = np.flatnonzero(earlier.any(axis=1))
+        if len(stacked) == 1:
+            wave[stacked] = 1
+        elif len(stacked):
+            # Chỉ các marker nằm trên marker khác (thường vài điểm ở mặt):
+            # lặp tới khi ổn định, số vòng = độ dài chuỗi chồng nhau
+            below = earlier[stacked][:, stacked]
+            passes = np.ones(len(stacked), dtype=np.intp)
+            while True:
+                updated = (below * (passes + 1)).max(axis=1)
+                np.maximum(updated, 1, out=updated)
+                if (updated == passes).all():
+                    break
+                passes = updated
+            wave[stacked] = passes
+        return wave
+
+    def _marker(self, color: Tuple[int, int, int], radius: int):
+        """
+        Anti-aliased keypoint marker (filled circle + white border), rendered once.
+
+        Marker được vẽ bằng cv2.circle lên nền đen và nền trắng; hiệu hai ảnh là
+        phần nền còn thấy qua từng pixel, nên trộn lên nền bất kỳ chỉ còn
+        (background * transmit + premultiplied) >> 8 (lệch tối đa vài mức xám so với
+        cv2.circle vẽ trực tiếp, do làm tròn AA).
+
+        Returns:
+            tuple: (offsets (K, 2) [dy, dx] from the center, premultiplied (K, 3)
+            and transmit (K, 3) as uint16 in 1/256 units) for the K pixels the
+            marker touches
+        """
+        key = (tuple(int(c) for c in color), radius)
+        marker = self._markers.get(key)
+        if marker is None:
+            half = radius + 2  # Viền AA tràn ra ngoài bán kính
+            size = 2 * half + 1
+            layers = []
+            for background in (0, 255):
+                sprite = np.full((size, size, 3), background, dtype=np.uint8)
+                cv2.circle(sprite, (half, half), radius, key[0], -1, cv2.LINE_AA)
+                cv2.circle(sprite, (half, half), radius, (255, 255, 255), 1, cv2.LINE_AA)
+                layers.append(sprite.astype(np.float32))
+            on_black, on_white = layers
+
+            transmit = (on_white - on_black) / 255.0
+            touched = np.nonzero((transmit < 1.0).any(axis=-1))
+            offsets = np.stack(touched, axis=1).astype(np.intp) - half
+            marker = (offsets,
+                      np.round((on_black[touched] + 0.5) * 256).astype(np.uint16),  # +0.5: làm tròn khi >> 8
+                      np.round(transmit[touched] * 256).astype(np.uint16))
+            self._markers[key] = marker
+        return marker
+
+    def draw_batch(self,
+                   frame: np.ndarray,
+                   keypoints,
+                   scores,
+                   out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Draw skeletons for several persons at once.
+
+        One cv2.polylines call per score color for all limbs (instead of one
+        cv2.line per limb per person), then the keypoint markers of everybody,
+        so a limb of one person never covers a joint of another.
+
+        Args:
+            frame: Image to draw on
+            keypoints: Array (P, 17, 2|3) of pixel keypoints
+            scores: P scores (or one score for everybody)
+            out: Optional buffer (same shape as frame) to draw into;
+                 default: draw on frame in place
+
+        Returns:
+            The image drawn on (out or frame)
+        """
+        if out is not None:
+            out[...] = frame
+            frame = out
+
+        points = self._as_array(keypoints)
+        scores = np.broadcast_to(np.asarray(scores), (len(points),))
+        colors = [self.get_color(int(score)) for score in scores]
+
+        for color in dict.fromkeys(colors):
+            people = np.array([c == color for c in colors])
+            self.draw_skeleton(frame, points[people], color)
+        for color in dict.fromkeys(colors):
+            people = np.array([c == color for c in colors])
+            self.draw_keypoints(frame, points[people], color)
+
         return frame
     
     def draw(self,
             frame: np.ndarray,
-            keypoints: List[Tuple[int, int]],
-            score: int = 75) -> np.ndarray:
+            keypoints,
+            score: int = 75,
+            out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Draw complete skeleton with keypoints.
         
         Args:
             frame: Image to draw on (will be modified in-place)
-            keypoints: List of 17 (x, y) pixel coordinates
+            keypoints: List of 17 (x, y) pixel coordinates (or array (17, 2|3))
             score: Score 0-100 (affects color)
+            out: Optional buffer to draw into instead of frame (frame is untouched)
         
         Returns:
             Frame with skeleton and keypoints drawn
         """
-        # Get color based on score
-        color = self.get_color(score)
-        
-        # Draw skeleton connections
-        frame = self.draw_skeleton(frame, keypoints, color)
-        
-        # Draw keypoint markers
-        frame = self.draw_keypoints(frame, keypoints, color)
-        
-        return frame
+        return self.draw_batch(frame, [self._as_array(keypoints)[0]], [score], out)
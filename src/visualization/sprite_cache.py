@@ -0,0 +1,66 @@
+"""
+Sprite Cache - LRU cache of pre-rendered text masks.
+
+Bảng điểm lặp lại liên tục cùng một số chuỗi (5 tên tư thế, 101 mức điểm,
+vài câu feedback cố định), nên mỗi chuỗi chỉ cần rasterize một lần.
+"""
+
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+
+class SpriteCache:
+    """
+    Least-recently-used cache of rendered sprites (alpha masks).
+
+    Example:
+        >>> cache = SpriteCache(max_size=256)
+        >>> mask = cache.get(('hershey', 'PLANK', 0.75, 2), lambda: render('PLANK'))
+        >>> print(cache.hits, cache.misses)
+    """
+
+    def __init__(self, max_size: int = 256):
+        """
+        Args:
+            max_size: Max number of sprites kept (0 = no caching)
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._sprites = OrderedDict()
+
+    def get(self, key: Hashable, render: Callable):
+        """
+        Return the sprite for key, rendering (and caching) it on a miss.
+
+        Args:
+            key: Hashable sprite key, e.g. (kind, text, size, ...)
+            render: Zero-argument function that builds the sprite
+
+        Returns:
+            Cached sprite (treat as read-only)
+        """
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            self._sprites.move_to_end(key)
+            self.hits += 1
+            return sprite
+
+        self.misses += 1
+        sprite = render()
+        if self.max_size > 0:
+            self._sprites[key] = sprite
+            if len(self._sprites) > self.max_size:
+                self._sprites.popitem(last=False)  # Bỏ sprite ít dùng nhất
+        return sprite
+
+    def clear(self):
+        """Drop all sprites and reset counters."""
+        self._sprites.clear()
+        self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._sprites)
+
+    def __contains__(self, key):
+        return key in self._sprites
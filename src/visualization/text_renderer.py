@@ -0,0 +1,192 @@
+"""
+Text Renderer - Unicode (Vietnamese) text for OpenCV frames.
+
+cv2.putText không vẽ được tiếng Việt nên phải dùng PIL. Thay vì chuyển cả
+frame BGR → PIL → NumPy → BGR cho từng dòng, tất cả các dòng được vẽ một
+lần vào một alpha mask nhỏ rồi trộn màu chỉ trong vùng ROI đó của frame.
+Font được load từ đĩa một lần cho mỗi cỡ chữ, và mask đã vẽ được giữ trong
+SpriteCache nên chuỗi lặp lại (tên tư thế, điểm, feedback) chỉ cần blit.
+"""
+
+import cv2
+import numpy as np
+from typing import Dict, List, Sequence, Tuple
+from PIL import Image, ImageDraw, ImageFont
+
+from .sprite_cache import SpriteCache
+
+
+# Fonts hỗ trợ tiếng Việt (thử lần lượt)
+FONT_PATHS = [
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+]
+
+
+class TextRenderer:
+    """
+    Render multi-line Unicode text into an alpha patch and blend it into a frame.
+
+    The patch is a coverage (alpha) mask; since every call uses one color, that
+    is all an RGBA patch would carry, at a quarter of the size. Masks do not
+    depend on color either, so one cached sprite serves every color.
+
+    Example:
+        >>> text = TextRenderer()
+        >>> text.draw(frame, ["Tốt!", "Hông hơi cao"], (40, 80), 16, (220, 220, 220), 30)
+        >>> text.draw_hershey(frame, "PLANK", (40, 50), cv2.FONT_HERSHEY_SIMPLEX, 0.75, (255, 255, 255), 2)
+    """
+
+    def __init__(self, font_paths: Sequence[str] = FONT_PATHS, cache_size: int = 256):
+        """
+        Initialize renderer.
+
+        Args:
+            font_paths: TrueType fonts to try in order (fallback: PIL default font)
+            cache_size: Max number of cached text sprites (0 = no caching)
+        """
+        self.font_paths = list(font_paths)
+        self._fonts: Dict[int, ImageFont.ImageFont] = {}
+        self.sprites = SpriteCache(cache_size)
+
+    def get_font(self, size: int):
+        """Load a font once per pixel size."""
+        font = self._fonts.get(size)
+        if font is None:
+            for path in self.font_paths:
+                try:
+                    font = ImageFont.truetype(path, size)
+                    break
+                except OSError:
+                    continue
+            else:
+                font = ImageFont.load_default()
+            self._fonts[size] = font
+        return font
+
+    def render(self, lines: List[str], font_size: int, line_spacing: int) -> np.ndarray:
+        """
+        Rasterize lines into one alpha mask.
+
+        Args:
+            lines: Text lines (top to bottom)
+            font_size: Font size in pixels
+            line_spacing: Distance between line tops in pixels
+
+        Returns:
+            uint8 mask (height, width), 255 = text (cached, read-only)
+        """
+        key = ('pil', tuple(lines), font_size, line_spacing)
+        return self.sprites.get(key, lambda: self._render_pil(lines, font_size, line_spacing))
+
+    def _render_pil(self, lines: List[str], font_size: int, line_spacing: int) -> np.ndarray:
+        """Rasterize lines with PIL (cache miss)."""
+        font = self.get_font(font_size)
+        width = max(int(np.ceil(font.getbbox(line)[2])) for line in lines) if lines else 0
+        ascent, descent = font.getmetrics() if hasattr(font, 'getmetrics') else (font_size, 0)
+        height = (len(lines) - 1) * line_spacing + ascent + descent if lines else 0
+
+        mask = Image.new('L', (max(1, width), max(1, height)), 0)
+        draw = ImageDraw.Draw(mask)
+        for i, line in enumerate(lines):
+            draw.text((0, i * line_spacing), line, font=font, fill=255)
+        return np.asarray(mask)
+
+    def render_hershey(self, text: str, font_face: int, font_scale: float,
+                       thickness: int) -> Tuple[np.ndarray, Tuple[int, int]]:
+        """
+        Rasterize an OpenCV Hershey string into an alpha mask.
+
+        Args:
+            text: ASCII text
+            font_face: cv2.FONT_HERSHEY_*
+            font_scale: cv2 font scale
+            thickness: Stroke thickness
+
+        Returns:
+            tuple: (mask, origin) where origin is the text baseline-left point inside the mask
+        """
+        key = ('hershey', text, font_face, font_scale, thickness)
+        return self.sprites.get(key, lambda: self._render_hershey(text, font_face, font_scale, thickness))
+
+    @staticmethod
+    def _render_hershey(text, font_face, font_scale, thickness):
+        """Rasterize with cv2.putText on a black mask (cache miss)."""
+        (tw, th), baseline = cv2.getTextSize(text, font_face, font_scale, thickness)
+        pad = thickness + 2  # Nét AA tràn ra ngoài bounding box
+        mask = np.zeros((th + baseline + 2 * pad, tw + 2 * pad), dtype=np.uint8)
+        origin = (pad, pad + th)
+        cv2.putText(mask, text, origin, font_face, font_scale, 255, thickness, cv2.LINE_AA)
+        return mask, origin
+
+    @staticmethod
+    def blend(frame: np.ndarray, mask: np.ndarray, position: Tuple[int, int],
+              color: Tuple[int, int, int]) -> np.ndarray:
+        """
+        Alpha-blend a solid color through a mask into the frame ROI (in place).
+
+        Args:
+            frame: BGR image
+            mask: uint8 alpha mask
+            position: (x, y) of the mask's top-left corner (may be partly outside)
+            color: BGR color
+
+        Returns:
+            The same frame
+        """
+        x, y = position
+        h, w = mask.shape
+        fh, fw = frame.shape[:2]
+
+        # Cắt mask theo biên frame
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + w, fw), min(y + h, fh)
+        if x0 >= x1 or y0 >= y1:
+            return frame
+
+        alpha = mask[y0 - y:y1 - y, x0 - x:x1 - x, None].astype(np.uint16)
+        roi = frame[y0:y1, x0:x1]
+        color = np.asarray(color, dtype=np.uint16)
+        roi[...] = ((roi * (255 - alpha) + color * alpha + 127) // 255).astype(np.uint8)
+        return frame
+
+    def draw(self, frame: np.ndarray, lines: List[str], position: Tuple[int, int],
+             font_size: int, color: Tuple[int, int, int], line_spacing: int = 0) -> np.ndarray:
+        """
+        Draw lines of text on frame (in place).
+
+        Args:
+            frame: BGR image
+            lines: Text lines (supports Vietnamese)
+            position: (x, y) top-left of the first line
+            font_size: Font size in pixels
+            color: BGR color tuple
+            line_spacing: Distance between line tops (default: font_size)
+
+        Returns:
+            The same frame
+        """
+        if not any(lines):
+            return frame
+        mask = self.render(lines, font_size, line_spacing or font_size)
+        return self.blend(frame, mask, position, color)
+
+    def draw_hershey(self, frame: np.ndarray, text: str, org: Tuple[int, int], font_face: int,
+                     font_scale: float, color: Tuple[int, int, int], thickness: int = 1) -> np.ndarray:
+        """
+        Cached drop-in for cv2.putText(..., cv2.LINE_AA) (in place).
+
+        Args:
+            frame: BGR image
+            text: ASCII text
+            org: Bottom-left corner of the text (same as cv2.putText)
+            font_face: cv2.FONT_HERSHEY_*
+            font_scale: cv2 font scale
+            color: BGR color tuple
+            thickness: Stroke thickness
+
+        Returns:
+            The same frame
+        """
+        mask, (ox, oy) = self.render_hershey(text, font_face, font_scale, thickness)
+        return self.blend(frame, mask, (org[0] - ox, org[1] - oy), color)
@@ -0,0 +1,66 @@
+"""
+Shared test fakes.
+
+Stand-ins for PoseDetector and PoseRecognizer, so the pipeline tests
+can run the batching / threading / store logic without YOLO weights
+or a trained classifier.
+"""
+
+import sys
+import time
+import numpy as np
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from detection.pose_keypoints import PoseKeypoints
+
+
+class FakeDetector:
+    """
+    One fixed person per frame; records every predict_batch call.
+
+    Args:
+        delay: Seconds to sleep per predict_batch call (slower than decode →
+               frames pile up and batches fill)
+        fail_at: Raise RuntimeError when this frame index is reached
+        dark: Frames with mean brightness below this have no person (None = never)
+    """
+
+    model_path = 'fake-pose.pt'
+
+    def __init__(self, delay=0.0, fail_at=None, dark=None):
+        self.delay = delay
+        self.fail_at = fail_at
+        self.dark = dark
+        self.calls = 0     # Tổng số frame đã detect
+        self.batches = []  # Số frame của mỗi lần gọi
+        self.seen = []     # Độ sáng từng frame, theo thứ tự
+
+    def predict_batch(self, frames):
+        if self.delay:
+            time.sleep(self.delay)
+        self.batches.append(len(frames))
+        self.calls += len(frames)
+        for frame in frames:
+            if self.fail_at is not None and len(self.seen) == self.fail_at:
+                raise RuntimeError("detector exploded")
+            self.seen.append(float(frame.mean()))
+        return frames
+
+    def get_pose_keypoints(self, frame):
+        if self.dark is not None and frame.mean() < self.dark:
+            return None
+        data = np.zeros((1, 17, 3), dtype=np.float32)
+        data[0, :, 0] = np.linspace(300, 660, 17)
+        data[0, :, 1] = np.linspace(100, 500, 17)
+        data[0, :, 2] = 0.9
+        return PoseKeypoints(data, frame.shape[:2])
+
+
+class FakeRecognizer:
+    """Every person is a Plank at 0.9 confidence."""
+
+    def recognize_batch(self, features):
+        return [('Plank', 0.9)] * len(features)
@@ -0,0 +1,123 @@
+"""
+Test Batch Runner.
+
+Checks input discovery, manifest-based resume, unique output paths
+for inputs that share a stem, and that --batch-size reaches the video
+pipeline of each worker (fake models, no weights needed).
+"""
+
+import sys
+import json
+import tempfile
+import cv2
+import numpy as np
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from pipeline import BatchRunner, ResultsWriter, collect_inputs
+from pipeline import batch_runner
+from pipeline.batch_runner import load_manifest, output_paths
+from evaluation import PoseEvaluator
+
+from fakes import FakeDetector, FakeRecognizer
+
+
+def test_batch_resume():
+    """Directory/glob discovery and skipping files already done."""
+    print("=" * 60)
+    print("🧪 TESTING BATCH RUNNER")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / 'in' / 'sub').mkdir(parents=True)
+        for name in ['a.jpg', 'sub/b.png', 'sub/c.mp4', 'notes.txt']:
+            (root / 'in' / name).touch()
+
+        # 1. Directory (recursive) vs glob
+        files = collect_inputs(str(root / 'in'))
+        assert [p.name for p in files] == ['a.jpg', 'b.png', 'c.mp4']
+        assert [p.name for p in collect_inputs(str(root / 'in' / '**' / '*.mp4'))] == ['c.mp4']
+        print(f"✅ Found {len(files)} media files")
+
+        # 2. Manifest: done được bỏ qua, error được chạy lại, dòng hỏng bị bỏ qua
+        runner = BatchRunner(str(root / 'out'), workers=1)
+        runner.output_dir.mkdir()
+        with open(runner.manifest_path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps({'input': str(files[0].resolve()), 'status': 'done'}) + '\n')
+            f.write(json.dumps({'input': str(files[1].resolve()), 'status': 'error'}) + '\n')
+            f.write('{"input": "trunc')
+
+        assert len(load_manifest(runner.manifest_path)) == 2
+        assert [p.name for p in runner.pending(files)] == ['b.png', 'c.mp4']
+        print("✅ Resume skips finished files")
+
+    return True
+
+
+def test_output_paths():
+    """a.jpg / a.png and session.v1.mp4 / session.v2.mp4 must not share outputs."""
+    print("=" * 60)
+    print("🧪 TESTING BATCH OUTPUT PATHS")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / 'in'
+        (root / 'day1').mkdir(parents=True)
+        names = ['day1/a.jpg', 'day1/a.png', 'day1/session.v1.mp4', 'day1/session.v2.mp4', 'day1/session.avi']
+        for name in names:
+            (root / name).touch()
+
+        runner = BatchRunner(str(Path(tmp) / 'out'), workers=1)
+        outputs = []
+        for path in collect_inputs(str(root)):
+            stem = runner._output_stem(path, root.resolve())
+            results_path, media_path = output_paths(str(path), stem, 'json')
+            outputs += [results_path, media_path, str(ResultsWriter.summary_path(results_path))]
+
+        assert len(outputs) == len(set(outputs)) == 3 * len(names)
+        assert str(Path(tmp) / 'out' / 'day1' / 'a.jpg.json') in outputs
+        assert str(Path(tmp) / 'out' / 'day1' / 'session.v1.mp4') in outputs
+        assert str(Path(tmp) / 'out' / 'day1' / 'session.avi.mp4') in outputs
+        print(f"✅ {len(names)} inputs → {len(outputs)} distinct output files")
+
+    return True
+
+
+def test_batch_size():
+    """BatchRunner(batch_size=...) is passed to every worker's VideoPipeline."""
+    print("=" * 60)
+    print("🧪 TESTING BATCH SIZE IN WORKERS")
+    print("=" * 60)
+
+    runner = BatchRunner('results/batch', workers=2, batch_size=8)
+    assert runner.batch_size == 8
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video = str(Path(tmp) / 'clip.avi')
+        writer = cv2.VideoWriter(video, cv2.VideoWriter_fourcc(*'MJPG'), 10, (320, 180))
+        for _ in range(32):
+            writer.write(np.full((180, 320, 3), 200, dtype=np.uint8))
+        writer.release()
+
+        # Giả lập _init_worker (không load model thật)
+        for batch_size in (1, 8):
+            detector = FakeDetector(delay=0.02)  # Chậm hơn decode → frame dồn lại, batch đầy
+            batch_runner._WORKER.update(detector=detector, recognizer=FakeRecognizer(),
+                                        evaluator=PoseEvaluator(), drawer=None, overlay=None,
+                                        cache=None, keypoint_dir=None, batch_size=batch_size)
+            record = batch_runner._process_file(video, str(Path(tmp) / f'clip-{batch_size}'), 'json')
+            assert record['frames'] == sum(detector.batches) == 32
+            assert max(detector.batches) <= batch_size
+            print(f"✅ batch_size={batch_size}: largest YOLOv8 call {max(detector.batches)} frames")
+        assert max(detector.batches) > 4  # Không còn bị kẹt ở mặc định 4
+        batch_runner._WORKER.clear()
+
+    return True
+
+
+if __name__ == "__main__":
+    success = test_batch_resume() and test_output_paths() and test_batch_size()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,60 @@
+"""
+Test Evaluation module.
+
+Checks table-driven PoseEvaluator (single vs batch scoring).
+"""
+
+import sys
+import numpy as np
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from evaluation import PoseEvaluator
+
+
+# Plank nhìn ngang: vai-hông-gối ~170°, tay thẳng chống xuống sàn
+PLANK_KEYPOINTS = [
+    (100, 200), (95, 195), (95, 195), (90, 198), (90, 198),   # Head
+    (150, 220), (150, 220),                                  # Shoulders
+    (150, 290), (150, 290),                                  # Elbows
+    (150, 360), (150, 360),                                  # Wrists
+    (350, 250), (350, 250),                                  # Hips
+    (500, 290), (500, 290),                                  # Knees
+    (650, 330), (650, 330),                                  # Ankles
+]
+
+
+def test_evaluator():
+    """Table-driven rules score a clean plank and batch == single."""
+    print("=" * 60)
+    print("🧪 TESTING POSE EVALUATOR")
+    print("=" * 60)
+
+    evaluator = PoseEvaluator()
+
+    # 1. Known good pose
+    score, feedback = evaluator.evaluate('Plank', PLANK_KEYPOINTS)
+    print(f"   Plank: {score}/100 - {feedback}")
+    assert score == 100 and feedback.endswith("✅")
+
+    # 2. Unknown pose
+    assert evaluator.evaluate('Unknown', PLANK_KEYPOINTS) == (0, "Không xác định được tư thế chuẩn")
+
+    # 3. Batch scoring == per-frame scoring
+    rng = np.random.default_rng(0)
+    batch = rng.integers(0, 540, (200, 17, 2))
+    names = rng.choice(['Plank', 'Tree', 'Warrior2', 'Goddess', 'Downdog', 'Unknown'], len(batch))
+
+    scores, feedbacks = evaluator.evaluate_batch(names, batch)
+    for name, kp, s, f in zip(names, batch, scores, feedbacks):
+        assert evaluator.evaluate(name, [tuple(p) for p in kp]) == (s, f)
+    print(f"✅ Batch of {len(batch)} matches single evaluation")
+
+    return True
+
+
+if __name__ == "__main__":
+    success = test_evaluator()
+    sys.exit(0 if success else 1)
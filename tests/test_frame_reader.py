@@ -0,0 +1,113 @@
+"""
+Test Frame Reader.
+
+Reads a small video through the prefetch ring buffer, and checks that
+release() never closes the capture while the decoder thread is still
+inside cap.read() (slow network streams / stuck decoders).
+"""
+
+import sys
+import time
+import tempfile
+import threading
+import cv2
+import numpy as np
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from pipeline import FrameReader
+
+
+class SlowCapture(cv2.VideoCapture):
+    """Capture whose read() blocks longer than release()'s join timeout."""
+
+    def __init__(self, delay=1.5):
+        super().__init__()
+        self.delay = delay
+        self.reading = threading.Event()
+        self.released = 0
+        self.released_while_reading = False
+
+    def isOpened(self):
+        return self.released == 0
+
+    def get(self, prop_id):
+        return 0.0
+
+    def read(self, image=None):
+        self.reading.set()
+        time.sleep(self.delay)
+        self.reading.clear()
+        return True, np.zeros((4, 4, 3), dtype=np.uint8)
+
+    def release(self):
+        self.released_while_reading |= self.reading.is_set()
+        self.released += 1
+
+
+def test_frame_reader():
+    """Frames arrive in order through the ring buffer; release() closes the video once."""
+    print("=" * 60)
+    print("🧪 TESTING FRAME READER")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video = str(Path(tmp) / 'clip.avi')
+        writer = cv2.VideoWriter(video, cv2.VideoWriter_fourcc(*'MJPG'), 10, (64, 48))
+        for i in range(20):
+            writer.write(np.full((48, 64, 3), 10 * i + 5, dtype=np.uint8))
+        writer.release()
+
+        reader = FrameReader(video, buffers=3)
+        assert reader.isOpened() and reader.get(cv2.CAP_PROP_FRAME_COUNT) == 20
+        values = []
+        while True:
+            ok, frame = reader.read(timeout=5)
+            if not ok:
+                break
+            values.append(float(frame.mean()))
+        assert len(values) == 20 and all(abs(v - (10 * i + 5)) < 2 for i, v in enumerate(values))
+        reader.release()
+        assert not reader.isOpened() and not reader.cap.isOpened()
+        print("✅ 20 frames in order through a 3-slot ring")
+
+    return True
+
+
+def test_release_during_read():
+    """release() during a slow cap.read() leaves closing to the decoder thread."""
+    print("=" * 60)
+    print("🧪 TESTING FRAME READER RELEASE DURING READ")
+    print("=" * 60)
+
+    cap = SlowCapture(delay=1.5)
+    reader = FrameReader(cap, buffers=2)
+    assert cap.reading.wait(timeout=2)
+
+    start = time.time()
+    reader.release()                                  # join(timeout=1.0) hết hạn giữa lúc read
+    assert time.time() - start < 1.4
+    assert cap.released == 0 and not cap.released_while_reading
+    assert reader.read() == (False, None)
+
+    reader._thread.join(timeout=5)
+    assert not reader._thread.is_alive()
+    assert cap.released == 1 and not cap.released_while_reading
+    print("✅ Capture closed by the decoder thread after its read returned")
+
+    # Decoder đang chờ ring (không trong read) → dừng ngay, video đóng đúng một lần
+    cap = SlowCapture(delay=0.0)
+    reader = FrameReader(cap, buffers=2)
+    time.sleep(0.2)
+    reader.release()
+    assert not reader._thread.is_alive() and cap.released == 1
+    print("✅ Capture closed exactly once after a normal stop")
+
+    return True
+
+
+if __name__ == "__main__":
+    success = test_frame_reader() and test_release_during_read()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,61 @@
+"""
+Test Geometry module.
+
+Checks vectorized PoseGeometry against GeometryUtils.
+"""
+
+import sys
+import numpy as np
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from geometry import GeometryUtils, PoseGeometry, ANGLE_TRIPLETS, DISTANCE_PAIRS
+
+
+def test_pose_geometry():
+    """Vectorized angles/distances must match the per-angle helpers."""
+    print("=" * 60)
+    print("🧪 TESTING POSE GEOMETRY")
+    print("=" * 60)
+
+    geometry = PoseGeometry()
+    batch = np.random.default_rng(0).integers(0, 960, (64, 17, 2))
+
+    # 1. Batch (N, 17, 2)
+    features = geometry.compute(batch)
+    for name, (a, b, c) in ANGLE_TRIPLETS.items():
+        if max(a, b, c) >= 17:
+            continue  # Midpoint triplets are checked below
+        expected = [GeometryUtils.calculate_angle(kp[a], kp[b], kp[c]) for kp in batch]
+        assert np.allclose(features[name], expected), name
+    for name, (a, b) in DISTANCE_PAIRS.items():
+        expected = [GeometryUtils.calculate_distance(kp[a], kp[b]) for kp in batch]
+        assert np.allclose(features[name], expected), name
+    print(f"✅ Batch of {len(batch)}: {len(features)} features match")
+
+    # 2. Midpoint triplet (shoulder center - hip center - knee center)
+    kp = batch[0]
+    mid = lambda i, j: (kp[i] + kp[j]) / 2
+    expected = GeometryUtils.calculate_angle(mid(5, 6), mid(11, 12), mid(13, 14))
+    assert np.isclose(features['center_hip'][0], expected)
+    print(f"✅ center_hip: {expected:.1f}°")
+
+    # 3. Single person (17, 3) with confidence column
+    single = geometry.compute(np.concatenate([kp, np.ones((17, 1))], axis=1))
+    assert single['left_knee'].shape == ()
+    assert np.isclose(single['left_knee'], features['left_knee'][0])
+
+    # 4. Degenerate limb: eps=0 gives NaN instead of 90°
+    zeros = np.zeros((17, 2))
+    assert np.isclose(geometry.compute(zeros)['left_knee'], 90.0)
+    assert np.isnan(geometry.compute(zeros, eps=0.0)['left_knee'])
+    print("✅ Single-person and degenerate cases OK")
+
+    return True
+
+
+if __name__ == "__main__":
+    success = test_pose_geometry()
+    sys.exit(0 if success else 1)
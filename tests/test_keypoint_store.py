@@ -0,0 +1,171 @@
+"""
+Test Keypoint Store.
+
+Round trip through the float16 memmap, incomplete stores being ignored,
+frame-count overflow, a second VideoPipeline run that reads the stored
+keypoints instead of calling the detector, and rescoring / re-rendering
+from the store with no detector at all.
+"""
+
+import sys
+import json
+import tempfile
+import cv2
+import numpy as np
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from detection.pose_keypoints import PoseKeypoints
+from evaluation import PoseEvaluator
+from pipeline import KeypointStore, VideoPipeline, keypoint_version, rescore_store, rescore_videos
+from pipeline.keypoint_store import NO_PERSON, DETECTED, TRACKED
+
+from fakes import FakeDetector, FakeRecognizer
+
+
+def test_keypoint_store():
+    """Write → close → open → read gives the same keypoints (float16 precision)."""
+    print("=" * 60)
+    print("🧪 TESTING KEYPOINT STORE")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        rng = np.random.default_rng(0)
+        two = PoseKeypoints(np.concatenate([rng.uniform(0, 960, (2, 17, 2)),
+                                            rng.uniform(0, 1, (2, 17, 1))], axis=2).astype(np.float32),
+                            (540, 960))
+        one = PoseKeypoints(two.data[:1], (540, 960))
+
+        # 1. Round trip (float16: sai số < 0.5 px ở khung 960x540)
+        store = KeypointStore.create(root / 'a', frames=4, persons=2, frame_shape=(540, 960),
+                                     meta={'fps': 30})
+        assert store.write(0, two, DETECTED) and store.write(1, None)
+        assert store.write(2, one, TRACKED)
+        assert KeypointStore.open(root / 'a') is None       # Chưa close → chưa dùng được
+        store.close(complete=True)
+
+        store = KeypointStore.open(root / 'a')
+        assert store is not None and not store.writable and store.meta['fps'] == 30
+        assert np.abs(store.read(0).data - two.data).max() < 0.5
+        assert store.read(1) is None and store.read(3) is None
+        assert len(store.read(2)) == 1 and store.read(2).orig_shape == (540, 960)
+        keypoints, flags = store.read_range(0, 3)
+        assert keypoints.shape == (3, 2, 17, 3) and list(flags) == [DETECTED, NO_PERSON, TRACKED]
+        print("✅ Round trip (float16, memory-mapped)")
+
+        # 2. Dừng giữa chừng / video dài hơn frame count → không được đánh dấu complete
+        partial = KeypointStore.create(root / 'b', frames=2, persons=1, frame_shape=(540, 960))
+        partial.write(0, one)
+        partial.close(complete=False)
+        assert KeypointStore.open(root / 'b') is None
+        assert KeypointStore.open(root / 'b', require_complete=False).frames_written == 1
+
+        short = KeypointStore.create(root / 'c', frames=1, persons=1, frame_shape=(540, 960))
+        assert short.write(0, one) and not short.write(1, one) and short.overflow
+        short.close(complete=True)
+        assert KeypointStore.open(root / 'c') is None
+        print("✅ Incomplete stores are never reused")
+
+        # 3. VideoPipeline: lần 2 đọc keypoints từ store, không gọi detector
+        video = str(root / 'clip.mp4')
+        writer = cv2.VideoWriter(video, cv2.VideoWriter_fourcc(*'mp4v'), 10, (320, 180))
+        for i in range(12):
+            writer.write(np.full((180, 320, 3), 0 if i % 4 == 0 else 200, dtype=np.uint8))
+        writer.release()
+
+        # Store của GUI (ROI crop + optical flow): version khác, và kể cả nằm đúng thư mục
+        # 'full' cũng bị từ chối vì meta mode khác → VideoPipeline vẫn chạy detector
+        keypoint_dir = str(root / 'keypoints')
+        assert keypoint_version('fake-pose.pt', mode='roi+track') != keypoint_version('fake-pose.pt')
+        gui = KeypointStore.create(KeypointStore.locate(video, keypoint_version('fake-pose.pt'), keypoint_dir),
+                                   frames=12, persons=1, meta={'mode': 'roi+track'})
+        for i in range(12):
+            gui.write(i, one, TRACKED)
+        gui.close(complete=True)
+        assert KeypointStore.open(gui.directory) is not None
+        assert KeypointStore.open(gui.directory, mode='full') is None
+
+        detector = FakeDetector(dark=50)
+        pipeline = VideoPipeline(detector, FakeRecognizer(), PoseEvaluator(), batch_size=4,
+                                 keypoint_dir=keypoint_dir)
+        first = pipeline.run(video)
+        calls = detector.calls
+        second = pipeline.run(video)
+        assert first['keypoints'] == 'detector' and calls == first['frames'] == 12
+        assert second['keypoints'] == 'store' and detector.calls == calls
+        assert second['detected'] == first['detected'] == 9
+        assert second['session'] == first['session']
+        print("✅ Second run served from the store without the detector")
+
+    return True
+
+
+def test_rescore():
+    """Rescore from the store = same session as the detector run, with no detector."""
+    print("=" * 60)
+    print("🧪 TESTING RESCORE FROM STORED KEYPOINTS")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        video = str(root / 'day' / 'clip.mp4')
+        Path(video).parent.mkdir()
+        writer = cv2.VideoWriter(video, cv2.VideoWriter_fourcc(*'mp4v'), 10, (320, 180))
+        for i in range(10):
+            writer.write(np.full((180, 320, 3), 0 if i < 3 else 200, dtype=np.uint8))
+        writer.release()
+
+        keypoint_dir = str(root / 'keypoints')
+        detected = VideoPipeline(FakeDetector(dark=50), FakeRecognizer(), PoseEvaluator(),
+                                 keypoint_dir=keypoint_dir).run(video, results_path=str(root / 'a.json'))
+
+        # 1. Chỉ recognizer + evaluator trên mảng keypoints, chunk nhỏ để qua nhiều lần gọi
+        store = KeypointStore.open(KeypointStore.locate(video, keypoint_version(FakeDetector.model_path), keypoint_dir))
+        rescored = rescore_store(store, FakeRecognizer(), PoseEvaluator(),
+                                 results_path=str(root / 'b.json'), chunk_size=4)
+        assert rescored['frames'] == 10 and rescored['detected'] == 7
+        assert rescored['session'] == detected['session']
+        assert (root / 'a.json').read_text() == (root / 'b.json').read_text()
+        print("✅ rescore_store matches the detector run")
+
+        # 2. Vẽ lại video không cần detector; video chưa có store → lỗi rõ ràng
+        rendered = VideoPipeline(None, FakeRecognizer(), PoseEvaluator(), keypoint_dir=keypoint_dir,
+                                 model_path=FakeDetector.model_path).run(video, str(root / 'out.mp4'))
+        assert rendered['keypoints'] == 'store' and rendered['session'] == detected['session']
+        try:
+            VideoPipeline(None, FakeRecognizer(), PoseEvaluator(), keypoint_dir=str(root / 'empty'),
+                          model_path=FakeDetector.model_path).run(video)
+            assert False, "expected FileNotFoundError"
+        except FileNotFoundError:
+            pass
+        print("✅ Re-render from the store without a detector")
+
+        # 3. Cả thư mục: giữ cấu trúc thư mục con và tên đầy đủ (clip.mp4 / clip.mov
+        # không ghi đè nhau), báo video chưa có keypoints
+        twin = str(root / 'day' / 'clip.mov')
+        writer = cv2.VideoWriter(twin, cv2.VideoWriter_fourcc(*'mp4v'), 10, (320, 180))
+        for i in range(6):
+            writer.write(np.full((180, 320, 3), 200, dtype=np.uint8))
+        writer.release()
+        VideoPipeline(FakeDetector(dark=50), FakeRecognizer(), PoseEvaluator(), keypoint_dir=keypoint_dir).run(twin)
+
+        other = root / 'day' / 'new.mp4'
+        other.write_bytes(b'never processed')
+        summary = rescore_videos([Path(video), Path(twin), other], FakeRecognizer(), PoseEvaluator(),
+                                 FakeDetector.model_path, str(root / 'rescore'), keypoint_dir)
+        assert summary['done'] == 2 and summary['missing'] == [str(other)]
+        assert (root / 'rescore' / 'clip.mp4.json').read_text() == (root / 'b.json').read_text()
+        assert len(json.loads((root / 'rescore' / 'clip.mov.json').read_text())) == 6
+        assert (root / 'rescore' / 'clip.mp4.summary.json').exists()
+        assert (root / 'rescore' / 'clip.mov.summary.json').exists()
+        print("✅ rescore_videos over a directory")
+
+    return True
+
+
+if __name__ == "__main__":
+    success = test_keypoint_store() and test_rescore()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,53 @@
+"""
+Test Letterboxer.
+
+Checks resize-into-canvas, padding reuse and coordinate mapping.
+"""
+
+import sys
+import cv2
+import numpy as np
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from detection.letterbox import Letterboxer
+
+
+def test_letterbox():
+    """Letterbox 640x480 → 960x540 and map points back."""
+    print("=" * 60)
+    print("🧪 TESTING LETTERBOXER")
+    print("=" * 60)
+
+    image = np.random.default_rng(0).integers(0, 255, (480, 640, 3), dtype=np.uint8)
+    letterbox = Letterboxer((960, 540), buffers=2)
+
+    # 1. Nội dung = resize thường, viền đen
+    frame = letterbox(image)
+    assert frame.shape == (540, 960, 3)
+    assert letterbox.offset == (120, 0) and letterbox.scale == 1.125
+    assert np.array_equal(frame[:, 120:840], cv2.resize(image, (720, 540)))
+    assert frame[:, :120].max() == 0 and frame[:, 840:].max() == 0
+    print(f"✅ Letterboxed to {frame.shape[1]}x{frame.shape[0]}, offset {letterbox.offset}")
+
+    # 2. Canvas dùng lại: viền bị vẽ đè vẫn được xóa
+    frame[:] = 255
+    letterbox(image)
+    again = letterbox(image)
+    assert again is frame and again[:, :120].max() == 0
+
+    # 3. Keypoints canvas → ảnh gốc → canvas
+    points = np.array([[120.0, 0.0, 0.9], [840.0, 540.0, 0.5]])
+    source = letterbox.to_source(points)
+    assert np.allclose(source, [[0, 0, 0.9], [640, 480, 0.5]])
+    assert np.allclose(letterbox.to_canvas(source), points)
+    print("✅ Coordinate mapping round-trips")
+
+    return True
+
+
+if __name__ == "__main__":
+    success = test_letterbox()
+    sys.exit(0 if success else 1)
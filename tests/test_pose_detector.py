@@ -0,0 +1,127 @@
+"""
+Test PoseDetector batching.
+
+Runs predict_batch / detect_batch against a fake YOLO model (no weights
+needed) and checks how frames are split into model.predict calls, and
+that every frame gets back its own result, in input order.
+"""
+
+import sys
+import numpy as np
+import torch
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from ultralytics.engine.results import Results
+
+from detection.pose_detector import PoseDetector
+
+
+class FakeModel:
+    """YOLO stand-in: one Results per image, keypoints encode the frame id."""
+
+    def __init__(self):
+        self.chunks = []  # Số frame của mỗi lần gọi predict
+        self.kwargs = []
+
+    def predict(self, images, **kwargs):
+        self.chunks.append(len(images))
+        self.kwargs.append(kwargs)
+        return [self._result(image) for image in images]
+
+    @staticmethod
+    def _result(image):
+        frame_id = int(image[0, 0, 0])
+        height, width = image.shape[:2]
+        if frame_id == 0:
+            # Frame 0: không có người
+            keypoints = torch.zeros((0, 17, 3))
+        else:
+            keypoints = torch.zeros((1, 17, 3))
+            keypoints[0, :, 0] = frame_id
+            keypoints[0, :, 1] = 2 * frame_id
+            keypoints[0, :, 2] = 1.0
+        boxes = torch.tensor([[0, 0, width, height, 0.9, 0]] * len(keypoints), dtype=torch.float32)
+        return Results(image, 'fake.jpg', {0: 'person'}, boxes=boxes.reshape(-1, 6), keypoints=keypoints)
+
+
+def make_detector():
+    """PoseDetector with a FakeModel instead of YOLO weights."""
+    detector = PoseDetector.__new__(PoseDetector)
+    detector.model = FakeModel()
+    detector.device = 'cpu'
+    return detector
+
+
+def make_frames(count, height=40, width=80):
+    """Frames whose first pixel holds the frame id (0 .. count-1)."""
+    frames = [np.zeros((height, width, 3), dtype=np.uint8) for _ in range(count)]
+    for frame_id, frame in enumerate(frames):
+        frame[0, 0, 0] = frame_id
+    return frames
+
+
+def test_predict_batch():
+    """Chunk sizes passed to model.predict, one result per frame in order."""
+    print("=" * 60)
+    print("🧪 TESTING POSE DETECTOR PREDICT_BATCH")
+    print("=" * 60)
+
+    cases = [
+        (0, 4, []),              # Không có frame → không gọi model
+        (7, None, [7]),          # Mặc định: tất cả trong một lần gọi
+        (8, 4, [4, 4]),
+        (7, 3, [3, 3, 1]),       # Chunk cuối ngắn hơn
+        (2, 5, [2]),             # batch_size > số frame
+        (5, 1, [1, 1, 1, 1, 1]),
+    ]
+    for count, batch_size, chunks in cases:
+        detector = make_detector()
+        results = detector.predict_batch(make_frames(count), batch_size=batch_size)
+        assert detector.model.chunks == chunks, (count, batch_size, detector.model.chunks)
+        assert all(kwargs['device'] == 'cpu' and not kwargs['save'] for kwargs in detector.model.kwargs)
+        assert len(results) == count
+        assert [int(result.orig_img[0, 0, 0]) for result in results] == list(range(count))
+        print(f"✅ {count} frames, batch_size={batch_size}: chunks {chunks}")
+
+    # Generator cũng được (chỉ duyệt một lần)
+    detector = make_detector()
+    results = detector.predict_batch((frame for frame in make_frames(5)), batch_size=2)
+    assert detector.model.chunks == [2, 2, 1] and len(results) == 5
+    print("✅ Generator input")
+
+    return True
+
+
+def test_detect_batch():
+    """detect_batch maps keypoints back to their frames; no person → None."""
+    print("=" * 60)
+    print("🧪 TESTING POSE DETECTOR DETECT_BATCH")
+    print("=" * 60)
+
+    frames = make_frames(7, height=40, width=80)
+    detector = make_detector()
+    absolute = detector.detect_batch(frames, return_absolute=True, batch_size=3)
+    assert detector.model.chunks == [3, 3, 1]
+    assert absolute[0] is None
+    for frame_id in range(1, 7):
+        assert absolute[frame_id] == [(frame_id, 2 * frame_id)] * 17
+    print("✅ Absolute keypoints: one entry per frame, in order")
+
+    normalized = make_detector().detect_batch(frames, batch_size=4)
+    assert len(normalized) == 7 and normalized[0] is None
+    for frame_id in range(1, 7):
+        assert np.allclose(normalized[frame_id], [frame_id / 80, 2 * frame_id / 40] * 17)
+    print("✅ Normalized keypoints: one entry per frame, in order")
+
+    assert make_detector().detect_batch([], batch_size=4) == []
+    print("✅ Empty input → []")
+
+    return True
+
+
+if __name__ == "__main__":
+    success = test_predict_batch() and test_detect_batch()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,144 @@
+"""
+Test PoseKeypoints.
+
+Builds real ultralytics Results from synthetic tensors (no model needed)
+and checks every PoseKeypoints view (xy, conf, xyn, flat34, body24,
+tuples) against the per-joint loops PoseDetector used before the
+container existed, for zero, one and several persons.
+"""
+
+import sys
+import numpy as np
+import torch
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from ultralytics.engine.results import Results
+
+from detection.pose_keypoints import PoseKeypoints
+from detection.pose_detector import PoseDetector
+
+
+# --- Legacy extraction (PoseDetector trước PoseKeypoints) ---
+def legacy_extract_keypoints(keypoint_array):
+    features = []
+    for idx in range(17):
+        x, y = keypoint_array[idx][0], keypoint_array[idx][1]
+        features.extend([x, y])
+    return features  # 34 values total
+
+
+def legacy_normalized(result):
+    if result.keypoints is None:
+        return None
+    keypoints = result.keypoints.xyn.cpu().numpy()
+    if len(keypoints) == 0:
+        return None
+    return legacy_extract_keypoints(keypoints[0])
+
+
+def legacy_absolute(result):
+    if result.keypoints is None:
+        return None
+    keypoints = result.keypoints.xy.cpu().numpy()
+    if len(keypoints) == 0:
+        return None
+    return [(int(kp[0]), int(kp[1])) for kp in keypoints[0]]
+
+
+def legacy_multi(result, normalized=False):
+    if result.keypoints is None or result.boxes is None:
+        return None
+    xy = (result.keypoints.xyn if normalized else result.keypoints.xy).cpu().numpy()
+    if len(xy) == 0:
+        return None
+    kp_conf = result.keypoints.conf.cpu().numpy()
+    keypoints = np.concatenate([xy, kp_conf[..., None]], axis=-1)
+    return keypoints, result.boxes.xyxy.cpu().numpy(), result.boxes.conf.cpu().numpy()
+
+
+def make_result(persons, height=540, width=960, seed=0):
+    """Results shaped like YOLOv8-pose output with `persons` random people."""
+    rng = np.random.default_rng(seed)
+    xy = rng.uniform(0, [width, height], (persons, 17, 2))
+    conf = rng.uniform(0, 1, (persons, 17, 1))
+    keypoints = torch.tensor(np.concatenate([xy, conf], axis=2), dtype=torch.float32)
+
+    corners = np.sort(rng.uniform(0, [width, height, width, height], (persons, 4)).reshape(persons, 2, 2), axis=1)
+    boxes = np.concatenate([corners.reshape(persons, 4), rng.uniform(0.3, 1, (persons, 1)),
+                            np.zeros((persons, 1))], axis=1)
+    return Results(np.zeros((height, width, 3), dtype=np.uint8), 'synthetic.jpg', {0: 'person'},
+                   boxes=torch.tensor(boxes, dtype=torch.float32), keypoints=keypoints)
+
+
+def test_pose_keypoints():
+    """Every view matches the legacy extraction for 1 and 3 persons."""
+    print("=" * 60)
+    print("🧪 TESTING POSE KEYPOINTS")
+    print("=" * 60)
+
+    for persons in (1, 3):
+        result = make_result(persons, seed=persons)
+        kps = PoseKeypoints.from_result(result)
+        assert kps is not None and len(kps) == persons
+        assert kps.orig_shape == (540, 960)
+
+        # 1. Người đầu tiên: flat34 / body24 / tuples như API cũ
+        assert np.allclose(kps.flat34(), legacy_normalized(result), atol=1e-6)
+        assert np.allclose(kps.body24(), legacy_normalized(result)[10:], atol=1e-6)
+        assert np.allclose(PoseDetector.extract_keypoints(None, kps.xyn[0]), legacy_normalized(result), atol=1e-6)
+        assert kps.tuples() == legacy_absolute(result)
+        assert all(type(v) is int for point in kps.tuples() for v in point)
+
+        # 2. Mọi người: xy / conf / xyn / boxes / scores như get_keypoints_multi cũ
+        pixel, boxes, scores = legacy_multi(result)
+        normalized, _, _ = legacy_multi(result, normalized=True)
+        assert np.allclose(kps.xy, pixel[..., :2], atol=1e-4)
+        assert np.allclose(kps.conf, pixel[..., 2])
+        assert np.allclose(kps.xyn, normalized[..., :2], atol=1e-6)
+        assert np.allclose(kps.boxes, boxes) and np.allclose(kps.scores, scores)
+        for person in range(persons):
+            assert np.allclose(kps.flat34(person), legacy_extract_keypoints(normalized[person]), atol=1e-6)
+            assert np.allclose(kps.flat34(person, normalized=False), legacy_extract_keypoints(pixel[person]),
+                               atol=1e-4)
+            assert kps.tuples(person) == [(int(x), int(y)) for x, y in pixel[person, :, :2]]
+        print(f"✅ {persons} person(s): all views match the legacy extraction")
+
+    # 3. Views dùng chung một mảng (không copy lại từ device)
+    assert np.shares_memory(kps.xy, kps.data) and np.shares_memory(kps.conf, kps.data)
+    assert kps.xyn is kps.xyn
+    print("✅ xy / conf are views, xyn is computed once")
+
+    return True
+
+
+def test_pose_keypoints_empty():
+    """No person / no keypoint head → None, like the legacy getters."""
+    print("=" * 60)
+    print("🧪 TESTING POSE KEYPOINTS (NO PERSON)")
+    print("=" * 60)
+
+    empty = make_result(0)
+    assert len(empty.keypoints.data) == 0
+    assert PoseKeypoints.from_result(empty) is None
+    assert legacy_normalized(empty) is None and legacy_absolute(empty) is None and legacy_multi(empty) is None
+
+    detection_only = Results(np.zeros((540, 960, 3), dtype=np.uint8), 'synthetic.jpg', {0: 'person'},
+                             boxes=torch.zeros((0, 6)))
+    assert detection_only.keypoints is None and PoseKeypoints.from_result(detection_only) is None
+    print("✅ Zero persons → None")
+
+    # (17, 2) không có visibility → conf = 1, vẫn đúng định dạng
+    single = PoseKeypoints(np.arange(34, dtype=np.float32).reshape(17, 2), (100, 200))
+    assert single.data.shape == (1, 17, 3) and np.all(single.conf == 1)
+    assert single.flat34(normalized=False).tolist() == legacy_extract_keypoints(np.arange(34).reshape(17, 2))
+    print("✅ (17, 2) input without confidences")
+
+    return True
+
+
+if __name__ == "__main__":
+    success = test_pose_keypoints() and test_pose_keypoints_empty()
+    sys.exit(0 if success else 1)
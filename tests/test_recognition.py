@@ -0,0 +1,97 @@
+"""
+Test Recognition backends.
+
+Checks that the NumPy classifier matches the torch classifier, and that
+warmup() records cold/warm latency without changing predictions.
+"""
+
+import sys
+import tempfile
+import numpy as np
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+import torch
+from recognition import MLPoseClassifier, NeuralNet, NumpyPoseClassifier, PoseRecognizer
+
+
+def test_numpy_backend():
+    """NumPy backend must reproduce torch predictions."""
+    print("=" * 60)
+    print("🧪 TESTING NUMPY CLASSIFIER BACKEND")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Random weights are enough to compare the two backends
+        torch.manual_seed(0)
+        model_path = str(Path(tmp_dir) / 'pose_classification.pth')
+        torch.save(NeuralNet().state_dict(), model_path)
+
+        torch_clf = MLPoseClassifier(model_path)
+        numpy_clf = NumpyPoseClassifier(model_path)
+
+        # .npz sidecar is written on first load and reused afterwards
+        assert Path(tmp_dir, 'pose_classification.npz').exists()
+        npz_clf = NumpyPoseClassifier(str(Path(tmp_dir) / 'pose_classification.npz'))
+
+        keypoints = np.random.default_rng(0).random((256, 34), dtype=np.float32)
+
+        idx_t, conf_t = torch_clf.predict_batch(keypoints)
+        idx_n, conf_n = numpy_clf.predict_batch(keypoints)
+        idx_z, conf_z = npz_clf.predict_batch(keypoints[:, 10:])
+
+        assert np.array_equal(idx_t, idx_n) and np.array_equal(idx_t, idx_z)
+        assert np.allclose(conf_t, conf_n, atol=1e-5)
+        assert np.allclose(conf_t, conf_z, atol=1e-5)
+        print(f"✅ {len(keypoints)} samples match (max diff {np.abs(conf_t - conf_n).max():.2e})")
+
+        pose_t, c_t = torch_clf.predict(keypoints[0].tolist())
+        pose_n, c_n = numpy_clf.predict(keypoints[0].tolist())
+        assert pose_t == pose_n and abs(c_t - c_n) < 1e-5
+        print(f"✅ Single predict: {pose_n} ({c_n:.1%})")
+
+        # Export ghi qua file tạm (không để lại .tmp); chỉ ship .npz (không có .pth) vẫn load được
+        assert not list(Path(tmp_dir).glob('*.tmp'))
+        Path(model_path).unlink()
+        shipped_clf = NumpyPoseClassifier(model_path)
+        assert np.array_equal(shipped_clf.predict_batch(keypoints)[0], idx_t)
+        print("✅ Atomic .npz export; .npz-only install loads")
+
+    return True
+
+
+def test_warmup():
+    """warmup() records cold/warm latency per input shape; predictions unchanged."""
+    print("=" * 60)
+    print("🧪 TESTING CLASSIFIER WARMUP")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        torch.manual_seed(0)
+        model_path = str(Path(tmp_dir) / 'pose_classification.pth')
+        torch.save(NeuralNet().state_dict(), model_path)
+
+        keypoints = np.random.default_rng(1).uniform(0, 1, (8, 34)).astype(np.float32)
+        clf = MLPoseClassifier(model_path)
+        before = clf.predict_batch(keypoints)
+
+        stats = clf.warmup([(1, 34), (4, 34)], runs=3)
+        assert set(stats) == {'1x34', '4x34'} and clf.warmup_stats is stats
+        assert all(s['cold_ms'] >= 0 and s['warm_ms'] >= 0 for s in stats.values())
+        after = clf.predict_batch(keypoints)
+        assert np.array_equal(before[0], after[0]) and np.allclose(before[1], after[1])
+        print(f"✅ MLPoseClassifier.warmup: {stats}")
+
+        # PoseRecognizer chuyển tiếp tới classifier; backend NumPy không có warmup
+        assert set(PoseRecognizer(model_path).warmup()) == {'1x34'}
+        assert PoseRecognizer(model_path, backend='numpy').warmup() == {}
+        print("✅ PoseRecognizer.warmup delegates to the backend")
+
+    return True
+
+
+if __name__ == "__main__":
+    success = test_numpy_backend() and test_warmup()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,363 @@
+"""
+Test Rendering.
+
+Compares the ROI / cached drawing paths of the visualization module with
+reference renders made the way OverlayUI did before them (full-frame
+BGR → PIL → BGR per text line, cv2.putText), pixel by pixel within a
+1 gray level tolerance (full-frame addWeighted for the panel, one
+cv2.line / cv2.circle per limb and joint for skeletons, within
+MARKER_TOLERANCE for the stamped keypoint sprites), and the LRU
+behaviour of the sprite cache.
+Needs no models or images.
+"""
+
+import sys
+import cv2
+import numpy as np
+from pathlib import Path
+from PIL import Image, ImageDraw, ImageFont
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from visualization import OverlayUI, SkeletonDrawer, SpriteCache, TextRenderer
+from visualization.text_renderer import FONT_PATHS
+
+
+# Sai số cho phép: làm tròn khi trộn alpha
+TOLERANCE = 1
+# Keypoint marker: sprite AA trộn lên nền khác cv2.circle vẽ trực tiếp vài mức xám
+MARKER_TOLERANCE = 5
+
+FEEDBACKS = [
+    "",
+    "Tốt! Giữ nguyên tư thế",
+    "Hông hơi cao, hạ hông xuống thấp hơn một chút để cơ thể thành đường thẳng từ vai đến gót chân",
+]
+
+
+def max_diff(a, b):
+    """Largest per-channel difference between two uint8 images."""
+    assert a.shape == b.shape
+    return int(np.abs(a.astype(np.int16) - b.astype(np.int16)).max())
+
+
+def random_frame(height, width, seed=0):
+    return np.random.default_rng(seed).integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+
+def reference_text(frame, text, position, font_size, color):
+    """One line via a full-frame PIL round trip (OverlayUI.put_vietnamese_text trước đây)."""
+    font = ImageFont.truetype(FONT_PATHS[0], font_size)
+    image = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+    ImageDraw.Draw(image).text(position, text, font=font, fill=(color[2], color[1], color[0]))
+    return cv2.cvtColor(np.array(image), cv2.COLOR_RGB2BGR)
+
+
+class ReferenceOverlay(OverlayUI):
+    """OverlayUI as it drew before ROI blending and sprite caching."""
+
+    def draw_semi_transparent_panel(self, frame, x, y, width, height):
+        overlay = frame.copy()
+        cv2.rectangle(overlay, (x, y), (x + width, y + height), self.bg_color, -1)
+        cv2.addWeighted(overlay, self.alpha, frame, 1 - self.alpha, 0, frame)
+        return frame
+
+    def draw_scoreboard(self, frame, pose_name, score, feedback=""):
+        h, w = frame.shape[:2]
+        scale = max(0.6, min(w / 1280.0, 2.5))
+        margin = int(20 * scale)
+        panel_w = int(self.base_panel_width * scale)
+        font_face = cv2.FONT_HERSHEY_SIMPLEX
+        font_scale_header = 1.0 * scale
+        thickness_header = max(2, int(2 * scale))
+        line_spacing = int(30 * scale)
+
+        feedback_lines = []
+        if feedback:
+            current_line = ""
+            for word in feedback.split():
+                if len(current_line) + len(word) + 1 <= 35:
+                    current_line += word + " "
+                else:
+                    feedback_lines.append(current_line.strip())
+                    current_line = word + " "
+            feedback_lines.append(current_line.strip())
+
+        content_height = (int(40 * scale) + int(20 * scale) + int(20 * scale)
+                          + len(feedback_lines) * line_spacing + int(10 * scale))
+        panel_h = max(int(self.base_panel_height * scale), content_height)
+
+        x1 = margin + int(100 * scale)
+        y1 = margin
+        frame = self.draw_semi_transparent_panel(frame, x1, y1, panel_w, panel_h)
+
+        curr_x = x1 + int(20 * scale)
+        curr_y = y1 + int(40 * scale)
+        cv2.putText(frame, pose_name.upper(), (curr_x, curr_y),
+                    font_face, font_scale_header, self.text_color, thickness_header, cv2.LINE_AA)
+        score_text = f"{score}%"
+        (sw, _), _ = cv2.getTextSize(score_text, font_face, font_scale_header, thickness_header)
+        cv2.putText(frame, score_text, (x1 + panel_w - sw - int(20 * scale), curr_y),
+                    font_face, font_scale_header, self.get_score_color(score), thickness_header, cv2.LINE_AA)
+
+        curr_y += int(15 * scale)
+        self.draw_score_bar(frame, score, curr_x, curr_y, panel_w - int(40 * scale), int(10 * scale))
+
+        curr_y += int(35 * scale)
+        font_size = int(16 * scale)
+        for line in feedback_lines:
+            frame = reference_text(frame, line, (curr_x, curr_y - font_size), font_size, (220, 220, 220))
+            curr_y += line_spacing
+        return frame
+
+
+class ReferenceDrawer(SkeletonDrawer):
+    """SkeletonDrawer as it drew before batching (one cv2 call per limb / joint)."""
+
+    def draw_skeleton(self, frame, keypoints, color):
+        for (i, j) in self.skeleton:
+            if keypoints[i] == (0, 0) or keypoints[j] == (0, 0):
+                continue
+            cv2.line(frame, keypoints[i], keypoints[j], color, self.thickness, cv2.LINE_AA)
+        return frame
+
+    def draw_keypoints(self, frame, keypoints, color):
+        for pt in keypoints:
+            if pt == (0, 0):
+                continue
+            cv2.circle(frame, pt, self.keypoint_radius, color, -1, cv2.LINE_AA)
+            cv2.circle(frame, pt, self.keypoint_radius, (255, 255, 255), 1, cv2.LINE_AA)
+        return frame
+
+    def draw_people(self, frame, people, scores):
+        """All limbs (grouped by color, like draw_batch), then all joint markers."""
+        people = [list(map(tuple, np.asarray(p)[:, :2].astype(np.int64).tolist())) for p in people]
+        colors = [self.get_color(score) for score in scores]
+        for step in (self.draw_skeleton, self.draw_keypoints):
+            for color in dict.fromkeys(colors):
+                for person, person_color in zip(people, colors):
+                    if person_color == color:
+                        step(frame, person, color)
+        return frame
+
+
+def test_text_renderer():
+    """draw() / draw_hershey() match PIL and cv2.putText, also when clipped at the border."""
+    print("=" * 60)
+    print("🧪 TESTING TEXT RENDERER")
+    print("=" * 60)
+
+    renderer = TextRenderer()
+    frame = random_frame(200, 300, seed=1)
+    lines = ["Hông hơi cao", "Giữ thẳng lưng"]
+
+    # 1. Nhiều dòng PIL một lần = từng dòng qua PIL cả frame
+    for position in [(10, 20), (-5, -3), (280, 190)]:
+        reference = frame.copy()
+        for i, line in enumerate(lines):
+            reference = reference_text(reference, line, (position[0], position[1] + i * 24), 16, (200, 220, 220))
+        drawn = renderer.draw(frame.copy(), lines, position, 16, (200, 220, 220), 24)
+        assert max_diff(drawn, reference) <= TOLERANCE, position
+    print("✅ Multi-line PIL text matches the full-frame round trip")
+
+    # 2. Hershey sprite = cv2.putText
+    for org in [(10, 50), (-20, 15), (250, 195), (100, 230)]:
+        for font_scale, thickness in [(0.6, 1), (1.0, 2), (2.3, 4)]:
+            reference = frame.copy()
+            cv2.putText(reference, "PLANK 85%", org, cv2.FONT_HERSHEY_SIMPLEX, font_scale,
+                        (0, 165, 255), thickness, cv2.LINE_AA)
+            drawn = renderer.draw_hershey(frame.copy(), "PLANK 85%", org, cv2.FONT_HERSHEY_SIMPLEX,
+                                          font_scale, (0, 165, 255), thickness)
+            assert max_diff(drawn, reference) <= TOLERANCE, (org, font_scale)
+    print("✅ Hershey text matches cv2.putText")
+
+    # 3. Font load một lần cho mỗi cỡ chữ
+    assert renderer.get_font(16) is renderer.get_font(16)
+    print("✅ Fonts cached per size")
+
+    return True
+
+
+def test_scoreboard():
+    """OverlayUI.draw_scoreboard matches the reference render at several resolutions."""
+    print("=" * 60)
+    print("🧪 TESTING SCOREBOARD AGAINST REFERENCE RENDER")
+    print("=" * 60)
+
+    overlay, reference = OverlayUI(), ReferenceOverlay()
+    for width, height in [(300, 200), (640, 360), (960, 540), (1280, 720), (1920, 1080)]:
+        for seed, feedback in enumerate(FEEDBACKS):
+            frame = random_frame(height, width, seed)
+            for pose_name, score in [("Warrior2", 67), ("Plank", 95), ("Tree", 12)]:
+                expected = reference.draw_scoreboard(frame.copy(), pose_name, score, feedback)
+                drawn = overlay.draw_scoreboard(frame.copy(), pose_name, score, feedback)
+                assert max_diff(drawn, expected) <= TOLERANCE, (width, height, feedback, pose_name)
+        print(f"✅ {width}x{height}: within {TOLERANCE} gray level of the reference")
+
+    return True
+
+
+def test_sprite_cache():
+    """LRU hits / evictions, and cached sprites draw the same pixels as fresh ones."""
+    print("=" * 60)
+    print("🧪 TESTING SPRITE CACHE")
+    print("=" * 60)
+
+    # 1. LRU: get() làm mới thứ tự, phần tử cũ nhất bị bỏ khi đầy
+    renders = []
+    cache = SpriteCache(max_size=2)
+
+    def render(key):
+        return cache.get(key, lambda: renders.append(key) or key.upper())
+
+    assert render('a') == 'A' and render('b') == 'B'
+    assert render('a') == 'A'                     # hit → 'a' mới dùng nhất
+    render('c')                                   # đầy → bỏ 'b' (ít dùng nhất)
+    assert 'a' in cache and 'c' in cache and 'b' not in cache and len(cache) == 2
+    render('b')
+    assert 'a' not in cache and renders == ['a', 'b', 'c', 'b']
+    assert (cache.hits, cache.misses) == (1, 4)
+    cache.clear()
+    assert len(cache) == 0 and cache.hits == cache.misses == 0
+    print("✅ LRU hit / eviction order")
+
+    uncached = SpriteCache(max_size=0)
+    for _ in range(3):
+        uncached.get('a', lambda: 'A')
+    assert len(uncached) == 0 and uncached.misses == 3
+    print("✅ max_size=0 disables caching")
+
+    # 2. Bảng điểm lặp lại: chỉ rasterize lần đầu, pixel giống hệt bản không cache
+    cached, fresh, reference = OverlayUI(), OverlayUI(sprite_cache_size=0), ReferenceOverlay()
+    sprites = cached.text_renderer.sprites
+    frame = random_frame(540, 960, seed=3)
+    for i in range(3):
+        for score in (95, 67, 12):
+            drawn = cached.draw_scoreboard(frame.copy(), "Plank", score, FEEDBACKS[2])
+            assert np.array_equal(drawn, fresh.draw_scoreboard(frame.copy(), "Plank", score, FEEDBACKS[2]))
+            assert max_diff(drawn, reference.draw_scoreboard(frame.copy(), "Plank", score, FEEDBACKS[2])) <= TOLERANCE
+        if i == 0:
+            misses, calls = sprites.misses, sprites.hits + sprites.misses
+    # Lần 2, 3: mọi chuỗi đều là hit, không rasterize lại
+    assert sprites.misses == misses and sprites.hits + sprites.misses == 3 * calls
+    assert len(fresh.text_renderer.sprites) == 0
+    print(f"✅ Repeated scoreboards: {sprites.hits} hits, {sprites.misses} misses, same pixels")
+
+    # 3. Cache nhỏ hơn số chuỗi đang dùng: bị evict rồi vẽ lại vẫn đúng
+    small = OverlayUI(sprite_cache_size=2)
+    for score in list(range(0, 101, 7)) * 2:
+        drawn = small.draw_scoreboard(frame.copy(), "Tree", score, FEEDBACKS[1])
+        assert np.array_equal(drawn, fresh.draw_scoreboard(frame.copy(), "Tree", score, FEEDBACKS[1]))
+    assert len(small.text_renderer.sprites) == 2
+    print("✅ Evicted sprites re-render identically")
+
+    return True
+
+
+def test_panel_blend():
+    """ROI-only panel blend = full-frame copy + addWeighted, including panels clipped by the border."""
+    print("=" * 60)
+    print("🧪 TESTING PANEL ROI BLEND")
+    print("=" * 60)
+
+    panels = [(10, 10, 100, 50), (-20, -10, 100, 50), (250, 150, 100, 100),
+              (0, 0, 299, 199), (400, 400, 10, 10), (-50, -50, 20, 20)]
+    for alpha in (0.7, 0.3, 1.0, 0.0):
+        overlay, reference = OverlayUI(alpha=alpha), ReferenceOverlay(alpha=alpha)
+        for seed, (x, y, width, height) in enumerate(panels):
+            frame = random_frame(200, 300, seed)
+            expected = reference.draw_semi_transparent_panel(frame.copy(), x, y, width, height)
+            drawn = overlay.draw_semi_transparent_panel(frame.copy(), x, y, width, height)
+            assert max_diff(drawn, expected) <= TOLERANCE, (alpha, x, y)
+    print(f"✅ {len(panels)} panels x 4 alphas match the full-frame blend")
+
+    # Vẽ tại chỗ, chỉ trong panel; buffer nền dùng lại theo kích thước
+    overlay = OverlayUI()
+    frame = random_frame(200, 300)
+    before = frame.copy()
+    assert overlay.draw_semi_transparent_panel(frame, 10, 10, 100, 50) is frame
+    outside = np.ones(frame.shape[:2], dtype=bool)
+    outside[10:61, 10:111] = False
+    assert np.array_equal(frame[outside], before[outside]) and not np.array_equal(frame, before)
+    overlay.draw_semi_transparent_panel(frame, 150, 100, 100, 50)
+    assert len(overlay._panel_buffers) == 1
+    print("✅ In place, pixels outside the panel untouched, background buffer reused")
+
+    return True
+
+
+def test_skeleton_batch():
+    """draw / draw_batch match per-limb drawing; no limb is ever drawn over a joint marker."""
+    print("=" * 60)
+    print("🧪 TESTING BATCHED SKELETON DRAWING")
+    print("=" * 60)
+
+    drawer, reference = SkeletonDrawer(), ReferenceDrawer()
+    rng = np.random.default_rng(0)
+
+    # 1. Một người (list tuple hoặc mảng, có điểm (0, 0) bị bỏ qua) = draw() cũ
+    for score in (95, 70, 30):
+        points = rng.integers(8, 292, (17, 2))     # cv2.circle sát biên clip sai (xem phần 4)
+        points[3] = 0
+        frame = random_frame(300, 300, score)
+        expected = reference.draw_people(frame.copy(), [points], [score])
+        assert max_diff(drawer.draw(frame.copy(), list(map(tuple, points.tolist())), score),
+                        expected) <= MARKER_TOLERANCE
+        assert max_diff(drawer.draw(frame.copy(), points, score), expected) <= MARKER_TOLERANCE
+    print("✅ Single person matches per-limb drawing")
+
+    # 2. Nhiều người, trùng / khác màu, keypoints (P, 17, 3) có cột confidence
+    for scores in ([95, 70], [95, 70, 30, 85], [10] * 6):
+        people = np.concatenate([rng.integers(8, 292, (len(scores), 17, 2)),
+                                 rng.uniform(0, 1, (len(scores), 17, 1))], axis=2)
+        frame = random_frame(300, 300, len(scores))
+        expected = reference.draw_people(frame.copy(), people, scores)
+        assert max_diff(drawer.draw_batch(frame.copy(), people, scores), expected) <= MARKER_TOLERANCE
+    print("✅ Multi-person batches match limbs-then-markers drawing")
+
+    # 3. Thứ tự lớp: chân tay người sau (đỏ) cắt ngang khớp người trước (xanh) → khớp vẫn nằm trên
+    green = np.zeros((17, 2), dtype=np.int64)
+    green[5] = (100, 100)                         # Chỉ 1 khớp, không có chi nào
+    red = np.zeros((17, 2), dtype=np.int64)
+    red[5], red[6] = (60, 100), (140, 100)       # Vai trái - vai phải đi qua (100, 100)
+    frame = np.full((200, 200, 3), 128, dtype=np.uint8)
+    drawn = drawer.draw_batch(frame, np.stack([green, red]), [95, 10])
+    assert tuple(drawn[100, 100]) == drawer.get_color(95)
+    assert tuple(drawn[100, 70]) == drawer.get_color(10)
+    print("✅ Joint markers are drawn above every limb")
+
+    # 4. Marker sát / tràn biên = vẽ trên frame có lề rồi cắt (cv2.circle trực tiếp clip lệch tới ~80)
+    color = drawer.get_color(95)
+    for point in ((0, 50), (2, 50), (-3, 50), (296, 50), (299, 99), (50, 0), (-20, 50)):
+        frame = random_frame(100, 300, point[0] + 30)
+        padded = cv2.copyMakeBorder(frame, 20, 20, 20, 20, cv2.BORDER_CONSTANT)
+        reference.draw_keypoints(padded, [(point[0] + 20, point[1] + 20)], color)
+        marked = drawer.draw_keypoints(frame.copy(), np.array([point] + [(0, 0)] * 16), color)
+        assert max_diff(marked, padded[20:-20, 20:-20]) <= MARKER_TOLERANCE, point
+        roi = random_frame(100, 320, 1)[:, 10:310]    # View không liên tục (ROI)
+        roi_copy = roi.copy()
+        drawer.draw_keypoints(roi, np.array([point] + [(0, 0)] * 16), color)
+        assert np.array_equal(roi, drawer.draw_keypoints(roi_copy, np.array([point] + [(0, 0)] * 16), color))
+    print("✅ Markers clipped at the frame border like an unclipped render")
+
+    # 5. Sprite marker render một lần cho mỗi (màu, bán kính)
+    assert set(drawer._markers) == {(drawer.get_color(s), drawer.keypoint_radius) for s in (95, 70, 30, 10)}
+    assert drawer._marker(color, drawer.keypoint_radius) is drawer._marker(color, drawer.keypoint_radius)
+    print("✅ One cached sprite per (color, radius)")
+
+    # 6. out=: vẽ vào buffer của caller, frame gốc không đổi
+    frame = random_frame(300, 300)
+    before, out = frame.copy(), np.empty_like(frame)
+    result = drawer.draw_batch(frame, people, scores, out=out)
+    assert result is out and np.array_equal(frame, before)
+    assert max_diff(out, reference.draw_people(before, people, scores)) <= MARKER_TOLERANCE
+    print("✅ Drawing into a caller buffer leaves the frame untouched")
+
+    return True
+
+
+if __name__ == "__main__":
+    success = (test_text_renderer() and test_scoreboard() and test_sprite_cache()
+               and test_panel_blend() and test_skeleton_batch())
+    sys.exit(0 if success else 1)
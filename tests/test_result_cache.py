@@ -0,0 +1,90 @@
+"""
+Test Result Cache.
+
+Round trip, version invalidation, LRU eviction and a cache hit in
+analyze_image() that never touches the models.
+"""
+
+import sys
+import time
+import tempfile
+import numpy as np
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from detection.pose_keypoints import PoseKeypoints
+from pipeline import ResultCache, analyze_image
+
+
+def test_result_cache():
+    """Same content + same version → hit; anything else → miss."""
+    print("=" * 60)
+    print("🧪 TESTING RESULT CACHE")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        image_a = root / 'a.jpg'
+        image_a.write_bytes(b'plank image bytes')
+        (root / 'copy.jpg').write_bytes(b'plank image bytes')
+
+        rng = np.random.default_rng(0)
+        keypoints = PoseKeypoints(rng.uniform(0, 500, (1, 17, 3)).astype(np.float32), (540, 960),
+                                  boxes=np.array([[10, 20, 300, 400]], dtype=np.float32),
+                                  scores=np.array([0.9], dtype=np.float32))
+        analysis = ('Plank', 0.97, 85, 'Tốt! Cần điều chỉnh: hông quá cao ⚠️')
+
+        # 1. Round trip; khóa theo nội dung, không theo tên file
+        cache = ResultCache(root / 'cache', version='v1')
+        key = cache.key_for_file(image_a)
+        assert key == cache.key_for_file(root / 'copy.jpg')
+        assert cache.get(key) is None
+
+        cache.put(key, keypoints, analysis)
+        cached_kps, cached_analysis = cache.get(key)
+        assert cached_analysis == analysis
+        assert np.array_equal(cached_kps.data, keypoints.data)
+        assert np.array_equal(cached_kps.boxes, keypoints.boxes)
+        assert cached_kps.orig_shape == (540, 960)
+        print(f"✅ Round trip ({cache.size_bytes} bytes/entry)")
+
+        # Không có người cũng được cache
+        empty_key = cache.key_for_bytes(b'empty room')
+        cache.put(empty_key, None, ('NO POSE', 0.0, 0, 'Không tìm thấy người'), (540, 960))
+        assert cache.get(empty_key) == (None, ('NO POSE', 0.0, 0, 'Không tìm thấy người'))
+
+        # 2. Đổi model/config → khóa khác → miss
+        assert ResultCache(root / 'cache', version='v2').key_for_file(image_a) != key
+        assert len(ResultCache(root / 'cache', version='v1')) == 2   # index dựng lại từ đĩa
+        print("✅ New model/config version invalidates entries")
+
+        # 3. LRU: giới hạn ~2 entry, entry vừa dùng được giữ lại
+        entry_size = cache.size_bytes // 2
+        lru = ResultCache(root / 'lru', version='v1', max_bytes=int(entry_size * 2.5))
+        keys = [lru.key_for_bytes(bytes([i])) for i in range(3)]
+        lru.put(keys[0], keypoints, analysis)
+        time.sleep(0.01)
+        lru.put(keys[1], keypoints, analysis)
+        time.sleep(0.01)
+        assert lru.get(keys[0]) is not None      # keys[0] mới dùng → keys[1] cũ nhất
+        time.sleep(0.01)
+        lru.put(keys[2], keypoints, analysis)
+        assert len(lru) == 2 and lru.size_bytes <= lru.max_bytes
+        assert lru.get(keys[1]) is None and lru.get(keys[0]) is not None
+        print("✅ Size-bounded LRU eviction")
+
+        # 4. analyze_image: cache hit → không gọi model (detector=None)
+        image = np.zeros((270, 480, 3), dtype=np.uint8)
+        frame, kps, result = analyze_image(image, None, None, None, cache=cache, cache_key=key)
+        assert result == analysis and frame.shape == (540, 960, 3)
+        assert np.array_equal(kps.data, keypoints.data)
+        print("✅ analyze_image served from cache without models")
+
+    return True
+
+
+if __name__ == "__main__":
+    success = test_result_cache()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,98 @@
+"""
+Test ROI Pose Detector.
+
+Uses a tiny fake detector that "finds" the bright rectangle in whatever
+image it is given, so crop mapping and fallbacks can be checked without
+YOLO weights.
+"""
+
+import sys
+import numpy as np
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from detection import ROIPoseDetector, PoseKeypoints
+
+
+class FakeDetector:
+    """Detects the white rectangle; keypoints = its corners + center."""
+
+    confidence_threshold = 0.5
+
+    def __init__(self):
+        self.calls = []
+
+    def predict(self, image, imgsz=None):
+        self.calls.append((image.shape[:2], imgsz))
+        ys, xs = np.nonzero(image[..., 0] > 200)
+        if len(xs) == 0:
+            return None
+        x1, y1, x2, y2 = xs.min(), ys.min(), xs.max() + 1, ys.max() + 1
+        data = np.zeros((1, 17, 3), dtype=np.float32)
+        data[0, :5, :2] = [(x1, y1), (x2, y1), (x1, y2), (x2, y2), ((x1 + x2) / 2, (y1 + y2) / 2)]
+        data[0, :5, 2] = 0.9      # 12 khớp còn lại: (0, 0) = không detect được
+        boxes = np.array([[x1, y1, x2, y2]], dtype=np.float32)
+        return PoseKeypoints(data, image.shape[:2], boxes=boxes, scores=np.array([0.9]))
+
+    def get_pose_keypoints(self, result):
+        return result
+
+
+def make_frame(x, y, w=120, h=200):
+    frame = np.zeros((540, 960, 3), dtype=np.uint8)
+    frame[y:y + h, x:x + w] = 255
+    return frame
+
+
+def test_roi_detector():
+    """Crop pass maps back to frame coords; lost person → full-frame pass."""
+    print("=" * 60)
+    print("🧪 TESTING ROI POSE DETECTOR")
+    print("=" * 60)
+
+    fake = FakeDetector()
+    detector = ROIPoseDetector(fake, padding=0.25, imgsz=320, refresh_interval=3)
+
+    # 1. Chưa có box → detect cả frame
+    keypoints = detector.detect(make_frame(400, 150))
+    assert detector.last_mode == 'full' and fake.calls[-1] == ((540, 960), None)
+    assert np.allclose(keypoints.boxes[0], [400, 150, 520, 350])
+
+    # 2. Người dịch nhẹ → crop nhỏ, keypoints về toạ độ frame
+    keypoints = detector.detect(make_frame(410, 155))
+    assert detector.last_mode == 'roi'
+    (crop_h, crop_w), imgsz = fake.calls[-1]
+    assert crop_h * crop_w < 540 * 960 / 5 and imgsz == 320
+    assert np.allclose(keypoints.boxes[0], [410, 155, 530, 355])
+    assert np.allclose(keypoints.data[0, 4, :2], [470, 255])
+    assert np.allclose(keypoints.data[0, 5:, :2], 0)
+    assert keypoints.orig_shape == (540, 960)
+    print(f"✅ ROI pass on {crop_w}x{crop_h} crop (imgsz {imgsz}), keypoints mapped back")
+
+    # 3. Người chạy ra mép crop → fallback cả frame
+    keypoints = detector.detect(make_frame(600, 155))
+    assert detector.last_mode == 'full'
+    assert np.allclose(keypoints.boxes[0], [600, 155, 720, 355])
+
+    # 4. Mất người hẳn → None, lần sau detect cả frame
+    assert detector.detect(np.zeros((540, 960, 3), dtype=np.uint8)) is None
+    detector.detect(make_frame(600, 155))
+    assert detector.last_mode == 'full'
+    print("✅ Fallback to full frame when the crop loses the person")
+
+    # 5. Refresh định kỳ
+    modes = []
+    for _ in range(4):
+        detector.detect(make_frame(600, 155))
+        modes.append(detector.last_mode)
+    assert modes == ['roi', 'roi', 'roi', 'full']
+    print(f"✅ Periodic full-frame refresh: {modes}")
+
+    return True
+
+
+if __name__ == "__main__":
+    success = test_roi_detector()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,53 @@
+"""
+Test Adaptive Scheduler.
+
+Checks stride selection from latency.
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from pipeline import AdaptiveScheduler
+
+
+def test_scheduler():
+    """Slow inference → larger stride; force overrides the stride."""
+    print("=" * 60)
+    print("🧪 TESTING ADAPTIVE SCHEDULER")
+    print("=" * 60)
+
+    # 1. Budget 1/30s = 33ms; per-frame 13ms → spare 20ms
+    scheduler = AdaptiveScheduler(target_fps=30)
+    scheduler.record('decode', 0.005)
+    scheduler.record('render', 0.008)
+    scheduler.record('inference', 0.015)
+    assert scheduler.stride == 1
+
+    scheduler = AdaptiveScheduler(target_fps=30, smoothing=1.0)
+    scheduler.record('decode', 0.005)
+    scheduler.record('render', 0.008)
+    scheduler.record('inference', 0.050)   # 50ms / 20ms → every 3rd frame
+    assert scheduler.stride == 3
+    inferred = [i for i in range(12) if scheduler.should_infer(i)]
+    assert inferred == [0, 3, 6, 9]
+    print(f"✅ Stride {scheduler.stride}: inferred frames {inferred}")
+
+    # 2. Quá chậm so với budget → max_stride
+    scheduler.record('render', 0.040)
+    assert scheduler.stride == scheduler.max_stride
+
+    # 3. Tracker mất người → chạy detector ngay dù chưa tới stride
+    assert scheduler.should_infer(100)
+    assert not scheduler.should_infer(101)
+    assert scheduler.should_infer(102, force=True)
+    print("✅ Forced inference when tracking is lost")
+
+    return True
+
+
+if __name__ == "__main__":
+    success = test_scheduler()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,116 @@
+"""
+Test Streaming (temporal smoothing + pose-hold state machine).
+"""
+
+import sys
+import numpy as np
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from streaming import OneEuroFilter, PoseStateMachine, PoseStream, SessionStats
+
+
+def test_streaming():
+    """Jitter is filtered, labels are voted, events fire on state changes only."""
+    print("=" * 60)
+    print("🧪 TESTING STREAMING")
+    print("=" * 60)
+
+    # 1. One-Euro: rung ±3 px quanh điểm đứng yên → giảm mạnh; (0, 0) giữ nguyên
+    rng = np.random.default_rng(0)
+    smoother = OneEuroFilter(freq=30)
+    base = np.full((17, 3), 200.0)
+    base[0] = 0
+    raw, out = [], []
+    for i in range(90):
+        sample = base.copy()
+        sample[1:, :2] += rng.uniform(-3, 3, (16, 2))
+        raw.append(sample[1:, :2])
+        out.append(smoother(sample, i / 30)[1:, :2])
+        assert np.allclose(smoother._x[0], 0)
+    raw_jitter, out_jitter = np.std(raw[30:]), np.std(out[30:])
+    assert out_jitter < raw_jitter / 2
+    print(f"✅ One-Euro jitter {raw_jitter:.2f} → {out_jitter:.2f} px")
+
+    # Chuyển động nhanh: bám kịp (ít trễ)
+    smoother.reset()
+    for i in range(30):
+        sample = base.copy()
+        sample[1:, 0] += 20 * i     # 600 px/s
+        last = smoother(sample, i / 30)
+    assert abs(last[1, 0] - sample[1, 0]) < 25
+
+    # 2. Bầu nhãn: 1 frame sai không đổi nhãn; vào/giữ/thoát có sự kiện
+    machine = PoseStateMachine(window=10, hold_interval=1.0)
+    labels = ['Plank'] * 40 + ['Tree'] + ['Plank'] * 9 + ['NO POSE'] * 20
+    events, changes = [], 0
+    for i, label in enumerate(labels):
+        state = machine.update(i / 10, label, 80 + (i % 3), 'ok')
+        events += [(e['type'], e['duration']) for e in state['events']]
+        changes += state['changed']
+        if 5 <= i < 50:
+            assert state['pose'] == 'Plank' and 79 <= state['score'] <= 82
+
+    kinds = [kind for kind, _ in events]
+    assert kinds == ['entered'] + ['held'] * 5 + ['exited']
+    assert abs(events[-1][1] - 5.2) < 1e-6      # vào ở 0.5s, thoát ở 5.7s
+    assert state['pose'] == 'NO POSE'
+    assert changes == 3                          # NO POSE → Plank → NO POSE
+    print(f"✅ Events: {kinds}; UI refreshed {changes}/{len(labels)} frames")
+
+    # 3. Nhiều người: trạng thái riêng
+    stream = PoseStream(fps=10, window=4)
+    for i in range(4):
+        stream.update(0, i / 10, 'Tree', 90)
+        stream.update(1, i / 10, 'Goddess', 70)
+    assert stream.people() == [0, 1]
+    assert stream.update(0, 0.4, 'Tree', 90)['pose'] == 'Tree'
+    assert stream.update(1, 0.4, 'Goddess', 70)['pose'] == 'Goddess'
+    print("✅ Independent state per person")
+
+    return True
+
+
+def test_session_stats():
+    """Running stats per pose match a full rescan, without storing frames."""
+    print("=" * 60)
+    print("🧪 TESTING SESSION STATS")
+    print("=" * 60)
+
+    rng = np.random.default_rng(1)
+    scores = rng.integers(40, 100, 3000)
+    stats = SessionStats(fps=30)
+    for i, score in enumerate(scores):
+        issues = ('hông quá cao',) if score < 60 else ()
+        stats.update('Plank' if i % 3 else 'Tree', score, issues)
+    for _ in range(60):
+        stats.update('NO POSE')
+
+    plank = scores[np.arange(len(scores)) % 3 != 0]
+    summary = stats.summary()
+    assert summary['frames'] == 3060 and abs(summary['seconds'] - 102) < 1e-6
+    assert abs(summary['active_seconds'] - 100) < 1e-6
+    assert list(summary['poses']) == ['Plank', 'Tree']   # theo thời gian giữ
+
+    result = summary['poses']['Plank']
+    assert result['frames'] == len(plank)
+    assert abs(result['mean'] - plank.mean()) < 0.05
+    assert result['min'] == plank.min() and result['max'] == plank.max()
+    assert result['p50'] == np.percentile(plank, 50, method='inverted_cdf')
+    assert result['p90'] == np.percentile(plank, 90, method='inverted_cdf')
+    assert result['issues'] == [('hông quá cao', int((plank < 60).sum()))]
+    assert stats.pose('Goddess') is None
+    print(stats.format())
+
+    stats.reset()
+    assert stats.summary()['poses'] == {}
+    print("✅ Session summary matches a full rescan")
+
+    return True
+
+
+if __name__ == "__main__":
+    success = test_streaming() and test_session_stats()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,94 @@
+"""
+Test Keypoint Tracking.
+
+Checks optical-flow tracking between detections and constant-velocity
+extrapolation.
+"""
+
+import sys
+import cv2
+import numpy as np
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from detection.pose_keypoints import PoseKeypoints
+from tracking import KeypointTracker, KeypointExtrapolator
+
+
+def test_tracking():
+    """Tracked keypoints follow a shifted image; lost tracks ask for detection."""
+    print("=" * 60)
+    print("🧪 TESTING KEYPOINT TRACKING")
+    print("=" * 60)
+
+    # 1. Ảnh có texture, dịch (+4, +2) px
+    rng = np.random.default_rng(0)
+    frame = cv2.GaussianBlur(rng.integers(0, 256, (240, 320, 3), dtype=np.uint8), (5, 5), 0)
+    shifted = np.roll(frame, (2, 4), axis=(0, 1))
+
+    data = np.zeros((1, 17, 3), dtype=np.float32)
+    data[0, :, 0] = np.linspace(60, 260, 17)
+    data[0, :, 1] = np.linspace(60, 180, 17)
+    data[0, :, 2] = 0.9
+    data[0, 3] = 0          # khớp không detect được
+    boxes = np.array([[50, 50, 270, 190]], dtype=np.float32)
+
+    tracker = KeypointTracker(max_age=5)
+    assert tracker.needs_detection()
+    assert tracker.track(frame) is None
+
+    tracker.init(frame, PoseKeypoints(data, frame.shape[:2], boxes=boxes))
+    assert not tracker.needs_detection()
+    tracked = tracker.track(shifted)
+
+    moved = np.delete(tracked.data[0, :, :2] - data[0, :, :2], 3, axis=0)
+    assert np.allclose(moved, [4, 2], atol=0.5), moved
+    assert np.allclose(tracked.data[0, 3], 0)
+    assert np.allclose(tracked.boxes[0], boxes[0] + [4, 2, 4, 2], atol=0.5)
+    assert tracker.confidence == 1.0
+    print(f"✅ Tracked 16 joints, mean shift {moved.mean(axis=0).round(2)}")
+
+    # 2. Đổi cảnh hoàn toàn → tracking mất, cần detect lại
+    other = cv2.GaussianBlur(rng.integers(0, 256, frame.shape, dtype=np.uint8), (5, 5), 0)
+    tracked = tracker.track(other)
+    assert tracker.confidence < tracker.min_confidence and tracker.needs_detection()
+    assert (tracked.data[0, :, 2] <= 0.9 * tracker.lost_decay + 1e-6).mean() > 0.5
+    print(f"✅ Scene change → confidence {tracker.confidence:.2f}, detection requested")
+
+    # 3. Quá max_age frame → detect lại
+    tracker.init(frame, PoseKeypoints(data, frame.shape[:2]))
+    for _ in range(5):
+        tracker.track(frame)
+    assert tracker.needs_detection()
+    tracker.init(frame, None)
+    assert tracker.needs_detection()
+    print("✅ Detection requested after max_age frames / no person")
+
+    # 4. Constant-velocity extrapolation, (0, 0) giữ nguyên
+    extrapolator = KeypointExtrapolator()
+    assert extrapolator.predict(1) is None
+
+    first = np.zeros((17, 3))
+    first[:, :2] = 100
+    second = first.copy()
+    second[:, 0] += 30          # +10 px / frame
+    second[0, :2] = 0           # nose lost
+
+    extrapolator.update(0, first)
+    extrapolator.update(3, second)
+    predicted = extrapolator.predict(4)
+    assert np.allclose(predicted[1:, 0], 140) and np.allclose(predicted[1:, 1], 100)
+    assert np.allclose(predicted[0, :2], 0)
+
+    extrapolator.update(6, None)
+    assert extrapolator.predict(7) is None
+    print("✅ Extrapolated keypoints for lost joints")
+
+    return True
+
+
+if __name__ == "__main__":
+    success = test_tracking()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,114 @@
+"""
+Test Video Pipeline.
+
+Runs the threaded decode → inference → render → encode pipeline with fake
+models: frame order and count are preserved, frames are batched up to
+batch_size, pooled letterbox canvases are not overwritten while in flight,
+and an exception inside a stage comes out of run() instead of hanging.
+"""
+
+import sys
+import json
+import tempfile
+import threading
+import cv2
+import numpy as np
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / 'src'))
+
+from evaluation import PoseEvaluator
+from pipeline import VideoPipeline
+
+from fakes import FakeDetector, FakeRecognizer
+
+
+class FakeOverlay:
+    """Records the brightness of each frame when it reaches the render stage."""
+
+    def __init__(self):
+        self.seen = []
+
+    def draw_scoreboard(self, frame, pose_name, score, feedback):
+        self.seen.append(float(frame.mean()))
+        return frame
+
+
+def write_video(path, frames=24):
+    """Frame i is a flat gray image of value 8 * i + 4 (order visible for up to 32 frames)."""
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'MJPG'), 10, (320, 180))
+    for i in range(frames):
+        writer.write(np.full((180, 320, 3), (8 * i + 4) % 256, dtype=np.uint8))
+    writer.release()
+
+
+def test_video_pipeline():
+    """Order, count and batching are preserved through the threaded stages."""
+    print("=" * 60)
+    print("🧪 TESTING VIDEO PIPELINE")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video = str(Path(tmp) / 'clip.avi')
+        write_video(video, frames=24)
+
+        detector, overlay = FakeDetector(delay=0.02), FakeOverlay()
+        pipeline = VideoPipeline(detector, FakeRecognizer(), PoseEvaluator(), overlay=overlay,
+                                 queue_size=2, batch_size=4)
+        results_path = str(Path(tmp) / 'clip.json')
+        summary = pipeline.run(video, str(Path(tmp) / 'out.mp4'), results_path)
+
+        # 1. Đủ frame, đúng thứ tự (độ sáng tăng dần, chỉ số frame 0..n-1)
+        records = json.loads(Path(results_path).read_text(encoding='utf-8'))
+        assert summary['frames'] == len(records) == 24 and summary['detected'] == 24
+        assert [r['frame'] for r in records] == list(range(24))
+        assert all(b > a for a, b in zip(detector.seen, detector.seen[1:]))
+        print("✅ 24 frames in order")
+
+        # 2. Batch tối đa batch_size, và thực sự gộp frame khi detector chậm
+        assert sum(detector.batches) == 24
+        assert max(detector.batches) <= 4 and max(detector.batches) > 1
+        print(f"✅ Batches: {detector.batches}")
+
+        # 3. Canvas letterbox dùng lại không bị decode ghi đè khi frame còn đang xử lý
+        assert np.allclose(overlay.seen, detector.seen)
+        print("✅ Pooled canvases intact until rendered")
+
+    return True
+
+
+def test_video_pipeline_error():
+    """An exception inside a stage is raised from run() without hanging."""
+    print("=" * 60)
+    print("🧪 TESTING VIDEO PIPELINE ERROR PROPAGATION")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video = str(Path(tmp) / 'clip.avi')
+        write_video(video, frames=40)
+
+        pipeline = VideoPipeline(FakeDetector(fail_at=5, delay=0.02), FakeRecognizer(), PoseEvaluator(),
+                                 queue_size=2, batch_size=2)
+        outcome = {}
+
+        def run():
+            try:
+                pipeline.run(video)
+            except Exception as e:
+                outcome['error'] = e
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        thread.join(timeout=10)
+        assert not thread.is_alive(), "run() hung after a stage failed"
+        assert isinstance(outcome.get('error'), RuntimeError)
+        assert str(outcome['error']) == "detector exploded"
+        print("✅ Stage error propagated from run()")
+
+    return True
+
+
+if __name__ == "__main__":
+    success = test_video_pipeline() and test_video_pipeline_error()
+    sys.exit(0 if success else 1)